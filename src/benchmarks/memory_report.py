@@ -0,0 +1,75 @@
+"""Score tree memory usage report.
+
+This script builds a standard score tree with the same shape as the one in the
+advanced track performance example (examples/example_4.py), replicated over a
+configurable number of tracks, and reports the memory allocated by its nodes.
+
+Usage:
+    python memory_report.py [track count (power of two)]
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+import sys
+import tracemalloc
+
+from scoretree import Score, ScoreArea, ScoreTree
+
+
+def build_tree(tracks: int) -> ScoreTree:
+    """Build a standard score tree.
+
+    Args:
+        tracks (int): number of tracks (each one holds 4 areas and 6 scores).
+            It should be a power of two, so that track weights add up to 1.
+
+    Returns:
+        ScoreTree: score tree.
+    """
+    return ScoreTree([
+        ScoreArea(f"Track {index}", 1 / tracks, [
+            ScoreArea("Dynamics", 0.6, [
+                Score("Top speed (m/s)", 0.5, (0, 100), 88.2),
+                Score("Elapsed time (s)", 0.3, (20, 60), 31.2, True),
+                Score("Traveled distance (m)", 0.2, (250, 785), 327.12, True)
+            ]),
+            ScoreArea("Efficiency", 0.4, [
+                Score("Fuel consumption (l)", 0.72, (39.13, 69.32), 58.12,
+                      True),
+                ScoreArea("Energy consumption", 0.28, [
+                    Score("Battery consumption (kWh)", 0.65, (0, 43.74), 6,
+                          True),
+                    Score("Regenerative braking (kWh)", 0.35, (0, 16.1), 8.16)
+                ])
+            ])
+        ])
+        for index in range(tracks)
+    ])
+
+
+def measure(tracks: int) -> tuple[int, int]:
+    """Measure the memory allocated by a standard score tree.
+
+    Args:
+        tracks (int): number of tracks.
+
+    Returns:
+        tuple[int, int]: allocated bytes and node count.
+    """
+    tracemalloc.start()
+    tree = build_tree(tracks)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return allocated, len(tree.items) * 10
+
+
+if __name__ == "__main__":
+    tracks = int(sys.argv[1]) if len(sys.argv) > 1 else 8192
+    allocated, nodes = measure(tracks)
+
+    print(f"Tracks: {tracks}")
+    print(f"Nodes: {nodes}")
+    print(f"Allocated: {allocated / 2 ** 20:.2f} MiB")
+    print(f"Per node: {allocated / nodes:.1f} B")
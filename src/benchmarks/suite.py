@@ -0,0 +1,344 @@
+"""Score tree benchmark suite.
+
+This script builds synthetic score trees of several shapes and sizes and times
+their construction, scoring (with invalid and with cached area scores, and
+from flattened leaf weights), rendering and weight checking, along with the
+memory allocated by their nodes. Results are printed as a table and can be
+stored as a JSON document, which can then be compared with the results of
+another version.
+
+Shapes:
+    wide: single area holding every score.
+    deep: chain of nested areas, each one holding a score and the next area.
+    balanced: complete binary tree of areas.
+    realistic: tracks with the same shape as the one in the advanced track
+        performance example (examples/example_4.py), see memory_report.py.
+
+Usage:
+    python suite.py [--max-leaves N] [--repeat N] [--output FILE]
+        [--compare FILE]
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from memory_report import build_tree as build_realistic
+from scoretree import Score, ScoreArea, ScoreTree
+from scoretree.core.traversal import iter_postorder
+
+# Leaf counts (powers of two, so that equal weights add up to exactly 1):
+SIZES = (2 ** 4, 2 ** 7, 2 ** 10, 2 ** 14, 2 ** 17, 2 ** 20)
+
+METRICS = (
+    "construction", "score", "cached_score", "flat_score", "render",
+    "check_weights"
+)
+
+
+def _score(generator: random.Random, name: str, weight: float) -> Score:
+    """Build a score with a random value and inverse flag.
+
+    Args:
+        generator (random.Random): random number generator.
+        name (str): score name.
+        weight (float): score weight.
+
+    Returns:
+        Score: score.
+    """
+    return Score(
+        name, weight, (0, 100), generator.uniform(-10, 110),
+        generator.random() < 0.5
+    )
+
+
+def build_wide(leaves: int, seed: int = 0) -> ScoreTree:
+    """Build a tree with a single area holding every score.
+
+    Args:
+        leaves (int): number of scores (power of two).
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        ScoreTree: score tree.
+    """
+    generator = random.Random(seed)
+
+    return ScoreTree([
+        ScoreArea("Wide", 1, [
+            _score(generator, f"Score {index}", 1 / leaves)
+            for index in range(leaves)
+        ])
+    ])
+
+
+def build_deep(leaves: int, seed: int = 0) -> ScoreTree:
+    """Build a tree made of a chain of nested areas.
+
+    Every area holds a score and the next area, so the tree depth is equal to
+    the number of scores.
+
+    Args:
+        leaves (int): number of scores.
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        ScoreTree: score tree.
+    """
+    generator = random.Random(seed)
+
+    items: list[Score | ScoreArea] = [_score(generator, "Score 0", 1)]
+    for index in range(1, leaves):
+        items = [
+            _score(generator, f"Score {index}", 0.5),
+            ScoreArea(f"Level {index}", 0.5, items)
+        ]
+
+    return ScoreTree(items)
+
+
+def build_balanced(leaves: int, seed: int = 0) -> ScoreTree:
+    """Build a tree shaped as a complete binary tree of areas.
+
+    Args:
+        leaves (int): number of scores (power of two, at least 2).
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        ScoreTree: score tree.
+    """
+    generator = random.Random(seed)
+
+    level: list[Score | ScoreArea] = [
+        _score(generator, f"Score {index}", 0.5) for index in range(leaves)
+    ]
+    while len(level) > 2:
+        level = [
+            ScoreArea(f"Area {index}", 0.5, level[index:index + 2])
+            for index in range(0, len(level), 2)
+        ]
+
+    return ScoreTree(level)
+
+
+def build_example(leaves: int, seed: int = 0) -> ScoreTree:
+    """Build a tree made of tracks shaped as in the advanced example.
+
+    Every track holds 6 scores, so the actual number of scores is the closest
+    multiple of 6 below the requested one whose track count is a power of
+    two.
+
+    Args:
+        leaves (int): approximate number of scores.
+        seed (int, optional): unused, kept for signature compatibility.
+            Defaults to 0.
+
+    Returns:
+        ScoreTree: score tree.
+    """
+    tracks = 1
+    while tracks * 2 * 6 <= leaves:
+        tracks *= 2
+
+    return build_realistic(tracks)
+
+
+SHAPES: dict[str, Callable[[int, int], ScoreTree]] = {
+    "wide": build_wide,
+    "deep": build_deep,
+    "balanced": build_balanced,
+    "realistic": build_example
+}
+
+# Rendered lines are indented proportionally to their depth, so the rendered
+# output of deep trees grows quadratically with their size and they are only
+# rendered up to a limited number of scores:
+RENDER_LIMITS = {"deep": 2 ** 12}
+
+
+def reset_caches(tree: ScoreTree) -> None:
+    """Invalidate the cached scores of every area of a tree.
+
+    Args:
+        tree (ScoreTree): score tree.
+    """
+    for area, _ in iter_postorder(tree.items, leaves=False):
+        area._cached_score = None  # type: ignore[union-attr]
+
+    tree._cached_score = None
+
+
+def best_of(
+    repeat: int,
+    function: Callable[[], Any],
+    setup: Callable[[], Any] | None = None
+) -> float:
+    """Get the shortest execution time of a function.
+
+    Args:
+        repeat (int): number of executions.
+        function (Callable[[], Any]): function to time.
+        setup (Callable[[], Any] | None, optional): function executed (and
+            not timed) before every execution. Defaults to None.
+
+    Returns:
+        float: shortest execution time, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def run(shape: str, leaves: int, repeat: int) -> dict[str, Any]:
+    """Run every benchmark for a tree shape and size.
+
+    Args:
+        shape (str): tree shape.
+        leaves (int): number of scores.
+        repeat (int): number of executions of every benchmark.
+
+    Returns:
+        dict[str, Any]: benchmark results, with times in seconds (None for
+            skipped benchmarks) and memory in bytes.
+    """
+    build = SHAPES[shape]
+
+    # Memory is measured on its own, since tracing slows down allocations:
+    tracemalloc.start()
+    tree = build(leaves, 0)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = [node for node, _ in iter_postorder(tree.items)]
+    result: dict[str, Any] = {
+        "shape": shape,
+        "leaves": sum(isinstance(node, Score) for node in nodes),
+        "nodes": len(nodes),
+        "memory": memory,
+        "construction": best_of(repeat, lambda: build(leaves, 0)),
+        "score": best_of(
+            repeat, lambda: tree.score, lambda: reset_caches(tree)
+        ),
+        "cached_score": best_of(repeat, lambda: tree.score),
+        "flat_score": best_of(repeat, lambda: tree.flat_score),
+        "render": best_of(repeat, lambda: str(tree))
+        if leaves <= RENDER_LIMITS.get(shape, leaves) else None,
+        "check_weights": best_of(
+            repeat, lambda: ScoreTree.check_weights(tree)
+        )
+    }
+
+    return result
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]]
+) -> None:
+    """Print the time ratios between two sets of results.
+
+    Ratios above 1 mean that the current version is slower than the
+    baseline.
+
+    Args:
+        results (list[dict[str, Any]]): current results.
+        baseline (list[dict[str, Any]]): baseline results.
+    """
+    reference = {(item["shape"], item["leaves"]): item for item in baseline}
+
+    print(f"\n{'shape':<10}{'leaves':>9}" + "".join(
+        f"{metric:>15}" for metric in (*METRICS, "memory")
+    ))
+    for item in results:
+        previous = reference.get((item["shape"], item["leaves"]))
+        if previous is None:
+            continue
+
+        print(f"{item['shape']:<10}{item['leaves']:>9}" + "".join(
+            f"{item[metric] / previous[metric]:>14.2f}x"
+            if item[metric] and previous.get(metric) else f"{'-':>15}"
+            for metric in (*METRICS, "memory")
+        ))
+
+
+def main() -> None:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--max-leaves", type=int, default=2 ** 17,
+        help="largest number of scores to benchmark (up to 2 ** 20)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="number of executions of every benchmark (best one is kept)"
+    )
+    parser.add_argument(
+        "--shapes", nargs="+", choices=tuple(SHAPES), default=tuple(SHAPES),
+        help="tree shapes to benchmark"
+    )
+    parser.add_argument("--output", help="JSON file to store results in")
+    parser.add_argument("--compare", help="JSON file with baseline results")
+    arguments = parser.parse_args()
+
+    try:
+        package_version = version("scoretree")
+    except PackageNotFoundError:
+        package_version = None
+
+    results = []
+    print(f"{'shape':<10}{'leaves':>9}{'nodes':>9}" + "".join(
+        f"{metric:>15}" for metric in METRICS
+    ) + f"{'memory (MiB)':>15}")
+    for shape in arguments.shapes:
+        for leaves in SIZES:
+            if leaves > arguments.max_leaves:
+                break
+
+            result = run(shape, leaves, arguments.repeat)
+            results.append(result)
+            print(
+                f"{shape:<10}{result['leaves']:>9}{result['nodes']:>9}"
+                + "".join(
+                    f"{result[metric] * 1000:>12.3f} ms"
+                    if result[metric] is not None else f"{'-':>15}"
+                    for metric in METRICS
+                )
+                + f"{result['memory'] / 2 ** 20:>15.2f}",
+                flush=True
+            )
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "version": package_version,
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "repeat": arguments.repeat,
+                "results": results
+            }, file, indent=4)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            compare(results, json.load(file)["results"])
+
+
+if __name__ == "__main__":
+    main()
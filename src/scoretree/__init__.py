@@ -9,5 +9,8 @@ Author:
 """
 
 
+from .core.formatter import RenderOptions
+from .core.profiling import ProfileStats, profile
+from .core.schema import ScoreResult, ScoreSchema
 from .core.scores import Score, ScoreArea
 from .core.tree import ScoreTree
@@ -0,0 +1,372 @@
+"""Asynchronous ingestion module.
+
+This module contains the AsyncScoreTree class, which is an asyncio front end
+for a score tree whose leaf values are updated by many concurrent sources, and
+the ScoreSubscription class, which delivers the resulting weighted scores.
+
+Value updates are not applied as they arrive: they are collected for a
+configurable time window (only the last value of every score is kept) and
+applied as a single batch, after which the tree is evaluated once and its
+weighted score is published to every subscriber. Errors raised while applying
+a batch are reported to the next caller of the AsyncScoreTree instance.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import sleep
+from collections.abc import Mapping
+from types import TracebackType
+
+from .scores import Score
+from .tree import ScoreTree
+
+
+class ScoreSubscription:
+    """Asynchronous iterator over the weighted scores of an AsyncScoreTree.
+
+    Subscriptions only hold the latest published score, so slow subscribers
+    skip intermediate scores instead of accumulating them.
+    """
+
+    __slots__ = ("_source", "_score", "_pending", "_done", "_event")
+
+    def __init__(self, source: AsyncScoreTree) -> None:
+        """Initialize a ScoreSubscription instance.
+
+        Args:
+            source (AsyncScoreTree): asynchronous score tree whose scores are
+                received.
+        """
+        self._source = source
+        self._score = 0.0
+        self._pending = False
+        self._done = False
+        self._event = asyncio.Event()
+
+    def _push(self, score: float) -> None:
+        """Publish a new score, replacing any unread one.
+
+        Args:
+            score (float): weighted score.
+        """
+        self._score = score
+        self._pending = True
+        self._event.set()
+
+    def _finish(self) -> None:
+        """End the iteration once any unread score has been read."""
+        self._done = True
+        self._event.set()
+
+    def close(self) -> None:
+        """Stop receiving scores and end the iteration."""
+        self._source._subscriptions.discard(self)
+        self._finish()
+
+    def __aiter__(self) -> ScoreSubscription:
+        """Get the asynchronous iterator.
+
+        Returns:
+            ScoreSubscription: the subscription itself.
+        """
+        return self
+
+    async def __anext__(self) -> float:
+        """Wait for the next weighted score.
+
+        Returns:
+            float: weighted score.
+
+        Raises:
+            StopAsyncIteration: if the subscription or its source is closed.
+        """
+        while not self._pending:
+            if self._done:
+                raise StopAsyncIteration
+
+            self._event.clear()
+            await self._event.wait()
+
+        self._pending = False
+
+        return self._score
+
+
+class AsyncScoreTree:
+    """Asyncio front end for a score tree with coalesced recomputation.
+
+    Updates are accepted by coroutines and applied in batches by a background
+    task, which is started on the first update (or when entering the instance
+    as an asynchronous context manager) and must be stopped via close. The
+    tree must not be modified by other means while the task is running.
+
+    If the task fails, its exception is raised by the next update, score or
+    close call, and the task is started again by the following update.
+
+    Attributes:
+        tree (ScoreTree): score tree whose values are updated.
+        window (float): time, in seconds, during which updates are collected
+            before being applied.
+        score (float): weighted score of the tree.
+    """
+
+    __slots__ = (
+        "_tree", "_window", "_pending", "_wakeup", "_task", "_error",
+        "_closed", "_subscriptions"
+    )
+
+    def __init__(self, tree: ScoreTree, window: int | float = 0.) -> None:
+        """Initialize an AsyncScoreTree instance.
+
+        Args:
+            tree (ScoreTree): score tree whose values are updated.
+            window (int | float, optional): time, in seconds, during which
+                updates are collected before being applied. Defaults to 0
+                (updates issued before the background task runs again are
+                applied together).
+
+        Raises:
+            TypeError: if tree is not a ScoreTree instance.
+            TypeError: if window is not an int or float.
+            ValueError: if window is negative.
+        """
+        if not isinstance(tree, ScoreTree):
+            raise TypeError(
+                "expected type ScoreTree for"
+                + f" {self.__class__.__name__}.tree but got"
+                + f" {type(tree).__name__} instead"
+            )
+
+        if not isinstance(window, (int, float)):
+            raise TypeError(
+                "expected type int | float for"
+                + f" {self.__class__.__name__}.window but got"
+                + f" {type(window).__name__} instead"
+            )
+
+        if window < 0:
+            raise ValueError(
+                "expected a positive value for"
+                + f" {self.__class__.__name__}.window but got {window}"
+            )
+
+        self._tree = tree
+        self._window = float(window)
+        self._pending: dict[Score, int | float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._error: Exception | None = None
+        self._closed = False
+        self._subscriptions: set[ScoreSubscription] = set()
+
+    @property
+    def tree(self) -> ScoreTree:
+        """Get score tree.
+
+        Returns:
+            ScoreTree: score tree whose values are updated.
+        """
+        return self._tree
+
+    @property
+    def window(self) -> float:
+        """Get update collection window.
+
+        Returns:
+            float: time, in seconds, during which updates are collected.
+        """
+        return self._window
+
+    @property
+    def score(self) -> float:
+        """Get weighted score, with every applied update.
+
+        Returns:
+            float: weighted score.
+
+        Raises:
+            Exception: if the background task has failed since the last call.
+        """
+        self._raise_error()
+
+        return self._tree.score
+
+    async def update(self, path: str, value: int | float) -> None:
+        """Submit a score value update.
+
+        Args:
+            path (str): score path.
+            value (int | float): score value.
+
+        Raises:
+            Exception: if the background task has failed since the last call,
+                in which case the update is not submitted.
+            RuntimeError: if the instance is closed.
+            KeyError: if the path does not exist in the tree.
+            TypeError: if the path does not belong to a Score instance.
+            TypeError: if the value is not an int or float.
+        """
+        await self.update_many({path: value})
+
+    async def update_many(self, values: Mapping[str, int | float]) -> None:
+        """Submit a set of score value updates.
+
+        Updates are checked right away, so invalid ones are reported to the
+        caller instead of the background task.
+
+        Args:
+            values (Mapping[str, int | float]): score values, indexed by path.
+
+        Raises:
+            Exception: if the background task has failed since the last call,
+                in which case the updates are not submitted.
+            RuntimeError: if the instance is closed.
+            KeyError: if a path does not exist in the tree.
+            TypeError: if a path does not belong to a Score instance.
+            TypeError: if a value is not an int or float.
+        """
+        self._raise_error()
+
+        if self._closed:
+            raise RuntimeError(f"{self.__class__.__name__} is closed")
+
+        self._pending.update(self._tree._resolve(values))
+        self._wakeup.set()
+        self.start()
+
+    def subscribe(self) -> ScoreSubscription:
+        """Subscribe to the weighted scores computed after every batch.
+
+        Returns:
+            ScoreSubscription: asynchronous iterator over the weighted
+                scores, ending when the instance is closed.
+        """
+        subscription = ScoreSubscription(self)
+        if self._closed:
+            subscription._finish()
+        else:
+            self._subscriptions.add(subscription)
+
+        return subscription
+
+    def start(self) -> None:
+        """Start the background task, if it is not running yet.
+
+        Raises:
+            RuntimeError: if there is no running event loop.
+        """
+        if self._task is None and not self._closed:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Apply pending updates, stop the task and end every subscription.
+
+        Raises:
+            Exception: if the background task has failed since the last call.
+        """
+        self._closed = True
+        self._wakeup.set()
+
+        if self._task is not None:
+            await self._task
+
+        if self._task is None:
+            try:
+                self._apply()
+            finally:
+                self._finish()
+
+        self._raise_error()
+
+    async def _run(self) -> None:
+        """Apply submitted updates in batches until the instance is closed.
+
+        Exceptions are stored, to be raised by the next caller, and stop the
+        task, which is started again by the next update.
+        """
+        try:
+            while not self._closed:
+                await self._wakeup.wait()
+
+                if self._window and not self._closed:
+                    await sleep(self._window)
+
+                self._wakeup.clear()
+                self._apply()
+
+            self._apply()
+            self._finish()
+        except Exception as exc:
+            self._error = exc
+            self._task = None
+
+    def _raise_error(self) -> None:
+        """Raise the exception of the failed background task, if any.
+
+        Raises:
+            Exception: if the background task has failed since the last call.
+        """
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _apply(self) -> None:
+        """Apply pending updates and publish the resulting score."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        for node, value in pending.items():
+            node.value = value
+
+        score = self._tree.score
+        for subscription in self._subscriptions:
+            subscription._push(score)
+
+    def _finish(self) -> None:
+        """End every subscription."""
+        for subscription in self._subscriptions:
+            subscription._finish()
+
+        self._subscriptions.clear()
+
+    async def __aenter__(self) -> AsyncScoreTree:
+        """Start the background task.
+
+        Returns:
+            AsyncScoreTree: the instance itself.
+        """
+        self.start()
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+        """Close the instance.
+
+        Args:
+            exc_type (type[BaseException] | None): exception type, if any.
+            exc_value (BaseException | None): exception, if any.
+            traceback (TracebackType | None): exception traceback, if any.
+        """
+        await self.close()
+
+    def __repr__(self) -> str:
+        """Get short string representation of the asynchronous score tree.
+
+        Returns:
+            str: short string representation of the asynchronous score tree.
+        """
+        return (
+            f"<AsyncScoreTree with {len(self._pending)} pending updates and"
+            + f" {len(self._subscriptions)} subscriptions>"
+        )
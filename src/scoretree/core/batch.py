@@ -0,0 +1,202 @@
+"""Batch evaluation module.
+
+This module contains the functions used to evaluate many score trees (or many
+sets of leaf values sharing a score schema) in parallel, across a pool of
+worker processes.
+
+Work is shipped to the workers as compact payloads instead of pickled object
+graphs: score trees are sent in the binary serialization format and value rows
+are packed into float64 buffers, while the schema itself is only sent once per
+worker.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import cpu_count
+
+from .schema import ScoreSchema
+from .serialization import dumps, loads
+from .tree import ScoreTree
+
+# Schema of the current worker process, set by the pool initializer:
+_schema: ScoreSchema | None = None
+
+
+def _chunksize(count: int, max_workers: int | None) -> int:
+    """Compute the number of tasks sent to a worker at once.
+
+    Args:
+        count (int): number of tasks.
+        max_workers (int | None): number of worker processes.
+
+    Returns:
+        int: number of tasks per chunk.
+    """
+    workers = max_workers or cpu_count() or 1
+
+    return max(1, count // (workers * 4))
+
+
+def _evaluate_tree(
+    payload: bytes,
+    render: bool
+) -> float | tuple[float, str]:
+    """Evaluate a serialized score tree.
+
+    Args:
+        payload (bytes): serialized score tree.
+        render (bool): whether to also render the tree.
+
+    Returns:
+        float | tuple[float, str]: score, optionally along with the rendered
+            tree.
+    """
+    tree = loads(payload)
+
+    return (tree.score, str(tree)) if render else tree.score
+
+
+def _initialize(schema: ScoreSchema) -> None:
+    """Store the score schema in the current worker process.
+
+    Args:
+        schema (ScoreSchema): score schema.
+    """
+    global _schema
+    _schema = schema
+
+
+def _evaluate_rows(
+    payload: tuple[int, bytes],
+    render: bool,
+    colorized: bool
+) -> list[float] | list[tuple[float, str]]:
+    """Evaluate a chunk of packed value rows against the worker schema.
+
+    Args:
+        payload (tuple[int, bytes]): number of rows and packed float64 values.
+        render (bool): whether to also render the trees.
+        colorized (bool): whether rendered trees are colorized or not.
+
+    Returns:
+        list[float] | list[tuple[float, str]]: scores, optionally along with
+            the rendered trees.
+    """
+    schema: ScoreSchema = _schema  # type: ignore[assignment]
+    count, data = payload
+    values = array("d")
+    values.frombytes(data)
+
+    size = len(values) // count if count else 0
+    rows = [values[index * size:(index + 1) * size] for index in range(count)]
+
+    if render:
+        return [
+            (schema.bind(row).score, str(schema.build(row, colorized)))
+            for row in rows
+        ]
+
+    return [schema.bind(row).score for row in rows]
+
+
+def evaluate_trees(
+    trees: Iterable[ScoreTree],
+    render: bool = False,
+    max_workers: int | None = None,
+    chunksize: int | None = None
+) -> list[float] | list[tuple[float, str]]:
+    """Evaluate a set of score trees in parallel.
+
+    Args:
+        trees (Iterable[ScoreTree]): score trees to evaluate.
+        render (bool, optional): whether to also render every tree. Defaults
+            to False.
+        max_workers (int | None, optional): number of worker processes.
+            Defaults to None (number of processors).
+        chunksize (int | None, optional): number of trees sent to a worker at
+            once. Defaults to None (computed from the number of trees).
+
+    Returns:
+        list[float] | list[tuple[float, str]]: score of every tree, optionally
+            along with its rendered representation, in input order.
+    """
+    payloads = [dumps(tree) for tree in trees]
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        results: list = list(executor.map(
+            partial(_evaluate_tree, render=render),
+            payloads,
+            chunksize=chunksize or _chunksize(len(payloads), max_workers)
+        ))
+
+        return results
+
+
+def evaluate_rows(
+    schema: ScoreSchema | ScoreTree,
+    rows: Iterable[Mapping[str, int | float] | Sequence[int | float]],
+    render: bool = False,
+    colorized: bool = True,
+    max_workers: int | None = None,
+    chunksize: int | None = None
+) -> list[float] | list[tuple[float, str]]:
+    """Evaluate a set of leaf value rows sharing a score schema in parallel.
+
+    Args:
+        schema (ScoreSchema | ScoreTree): score schema (or score tree whose
+            schema is used) the rows are bound to.
+        rows (Iterable[Mapping[str, int | float] | Sequence[int | float]]):
+            leaf values of every candidate, either indexed by leaf path or
+            ordered like the schema leaves.
+        render (bool, optional): whether to also render the tree of every
+            row. Defaults to False.
+        colorized (bool, optional): whether rendered trees are colorized or
+            not. Defaults to True.
+        max_workers (int | None, optional): number of worker processes.
+            Defaults to None (number of processors).
+        chunksize (int | None, optional): number of rows sent to a worker at
+            once. Defaults to None (computed from the number of rows).
+
+    Returns:
+        list[float] | list[tuple[float, str]]: score of every row, optionally
+            along with its rendered representation, in input order.
+
+    Raises:
+        KeyError: if a leaf path is missing from or unknown to the schema.
+        ValueError: if the number of values does not match the leaves.
+        TypeError: if a value is not an int or float.
+    """
+    if not isinstance(schema, ScoreSchema):
+        schema = ScoreSchema(schema)
+
+    # Rows are checked upfront, so that errors are raised in this process:
+    checked = [schema._leaf_values(row) for row in rows]
+    size = chunksize or _chunksize(len(checked), max_workers)
+    payloads = [
+        (
+            len(checked[start:start + size]),
+            array("d", [
+                value for row in checked[start:start + size] for value in row
+            ]).tobytes()
+        ) for start in range(0, len(checked), size)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers, initializer=_initialize, initargs=(schema,)
+    ) as executor:
+        results: list = []
+        for chunk in executor.map(
+            partial(_evaluate_rows, render=render, colorized=colorized),
+            payloads
+        ):
+            results.extend(chunk)
+
+        return results
@@ -0,0 +1,392 @@
+"""Result cache module.
+
+This module contains the ResultCache class, which stores the results of score
+tree evaluations so that repeated evaluations of identical trees (same
+structure and same leaf values) are served without scoring them again, and the
+CachedResult class, which holds one of those results.
+
+Results are keyed by the score schema of the tree (see schema.ScoreSchema,
+which is hashed by structure) and the tuple of its leaf values, so callers
+that keep a schema can look results up without building any tree. Results are
+evicted when they are the least recently used ones of a full cache or when
+they get older than the cache time to live.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping, Sequence
+from threading import Lock
+from time import monotonic
+
+from .schema import ScoreSchema
+from .tree import ScoreTree
+
+
+class CachedResult:
+    """Result of a cached score tree evaluation.
+
+    Attributes:
+        score (float): weighted score of the tree.
+        subtotals (dict[str, float]): score of every area, indexed by path.
+        text (str | None): rendered tree, if the cache stores renders.
+    """
+
+    __slots__ = ("_score", "_subtotals", "_text")
+
+    def __init__(
+        self,
+        score: float,
+        subtotals: dict[str, float],
+        text: str | None = None
+    ) -> None:
+        """Initialize a CachedResult instance.
+
+        Args:
+            score (float): weighted score of the tree.
+            subtotals (dict[str, float]): score of every area, indexed by
+                path.
+            text (str | None, optional): rendered tree. Defaults to None.
+        """
+        self._score = score
+        self._subtotals = subtotals
+        self._text = text
+
+    @property
+    def score(self) -> float:
+        """Get weighted score.
+
+        Returns:
+            float: weighted score of the tree.
+        """
+        return self._score
+
+    @property
+    def subtotals(self) -> dict[str, float]:
+        """Get area scores.
+
+        Returns:
+            dict[str, float]: score of every area, indexed by path.
+        """
+        return dict(self._subtotals)
+
+    @property
+    def text(self) -> str | None:
+        """Get rendered tree.
+
+        Returns:
+            str | None: rendered tree, if the cache stores renders.
+        """
+        return self._text
+
+    def __repr__(self) -> str:
+        """Get short string representation of the cached result.
+
+        Returns:
+            str: short string representation of the cached result.
+        """
+        return (
+            f"<CachedResult with score {self._score * 100:.2f}%"
+            + f" ({len(self._subtotals)} areas)>"
+        )
+
+
+class ResultCache:
+    """Bounded cache of score tree evaluation results.
+
+    Results are keyed by score schema and leaf values, plus the colorization
+    flag if renders are stored. Caches can be shared by several threads.
+    Concurrent evaluations of the same uncached tree may score it more than
+    once, but only one result is stored.
+
+    Attributes:
+        maxsize (int): maximum number of stored results.
+        ttl (float | None): time, in seconds, during which results are valid.
+        render (bool): whether rendered trees are stored or not.
+        hits (int): number of evaluations served from the cache.
+        misses (int): number of evaluations that required scoring the tree.
+    """
+
+    __slots__ = (
+        "_maxsize", "_ttl", "_render", "_entries", "_hits", "_misses",
+        "_lock"
+    )
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: int | float | None = None,
+        render: bool = False
+    ) -> None:
+        """Initialize a ResultCache instance.
+
+        Args:
+            maxsize (int, optional): maximum number of stored results.
+                Defaults to 128.
+            ttl (int | float | None, optional): time, in seconds, during
+                which results are valid. Defaults to None (no expiration).
+            render (bool, optional): whether rendered trees are stored or
+                not. Defaults to False.
+
+        Raises:
+            TypeError: if maxsize is not an int.
+            ValueError: if maxsize is not positive.
+            TypeError: if ttl is not an int, float or None.
+            ValueError: if ttl is not positive.
+            TypeError: if render is not a bool.
+        """
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError(
+                "expected type int for"
+                + f" {self.__class__.__name__}.maxsize but got"
+                + f" {type(maxsize).__name__} instead"
+            )
+
+        if maxsize < 1:
+            raise ValueError(
+                "expected a positive value for"
+                + f" {self.__class__.__name__}.maxsize but got {maxsize}"
+            )
+
+        if ttl is not None:
+            if not isinstance(ttl, (int, float)):
+                raise TypeError(
+                    "expected type int | float | None for"
+                    + f" {self.__class__.__name__}.ttl but got"
+                    + f" {type(ttl).__name__} instead"
+                )
+
+            if ttl <= 0:
+                raise ValueError(
+                    "expected a positive value for"
+                    + f" {self.__class__.__name__}.ttl but got {ttl}"
+                )
+
+        if not isinstance(render, bool):
+            raise TypeError(
+                "expected type bool for"
+                + f" {self.__class__.__name__}.render but got"
+                + f" {type(render).__name__} instead"
+            )
+
+        self._maxsize = maxsize
+        self._ttl = None if ttl is None else float(ttl)
+        self._render = render
+        self._entries: OrderedDict[
+            Hashable, tuple[float, CachedResult]
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def maxsize(self) -> int:
+        """Get maximum number of stored results.
+
+        Returns:
+            int: maximum number of stored results.
+        """
+        return self._maxsize
+
+    @property
+    def ttl(self) -> float | None:
+        """Get result time to live.
+
+        Returns:
+            float | None: time, in seconds, during which results are valid.
+        """
+        return self._ttl
+
+    @property
+    def render(self) -> bool:
+        """Get render flag.
+
+        Returns:
+            bool: whether rendered trees are stored or not.
+        """
+        return self._render
+
+    @property
+    def hits(self) -> int:
+        """Get number of cache hits.
+
+        Returns:
+            int: number of evaluations served from the cache.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Get number of cache misses.
+
+        Returns:
+            int: number of evaluations that required scoring the tree.
+        """
+        return self._misses
+
+    def evaluate(self, tree: ScoreTree) -> CachedResult:
+        """Get the result of a score tree, scoring it if it is not cached.
+
+        The schema of the tree is kept by the tree until its structure
+        changes, so looking a tree up only takes its leaf values.
+
+        Args:
+            tree (ScoreTree): score tree to evaluate.
+
+        Returns:
+            CachedResult: result of the tree.
+
+        Raises:
+            TypeError: if tree is not a ScoreTree instance.
+            ValueError: if the tree weights do not add up to 1.
+        """
+        if not isinstance(tree, ScoreTree):
+            raise TypeError(
+                "expected type ScoreTree for"
+                + f" {self.__class__.__name__}.evaluate tree but got"
+                + f" {type(tree).__name__} instead"
+            )
+
+        # Leaf values are already checked, and ordered like schema leaves:
+        return self._get(
+            tree._compile_schema(),
+            tuple([leaf._value for leaf in tree._flatten()[0]]),
+            tree._colorized
+        )
+
+    def bind(
+        self,
+        schema: ScoreSchema,
+        values: Mapping[str, int | float] | Sequence[int | float],
+        colorized: bool = True
+    ) -> CachedResult:
+        """Get the result of a set of leaf values bound to a score schema.
+
+        Values are only bound to the schema (and the tree only built and
+        rendered) if the result is not cached.
+
+        Args:
+            schema (ScoreSchema): score schema.
+            values (Mapping[str, int | float] | Sequence[int | float]): leaf
+                values, either indexed by leaf path or ordered like the schema
+                leaves.
+            colorized (bool, optional): whether the stored render is
+                colorized or not. Ignored unless the cache stores renders.
+                Defaults to True.
+
+        Returns:
+            CachedResult: result of the values.
+
+        Raises:
+            TypeError: if schema is not a ScoreSchema instance.
+            KeyError: if a leaf path is missing from or unknown to the schema.
+            ValueError: if the number of values does not match the leaves.
+            TypeError: if a value is not an int or float.
+            TypeError: if colorized is not a bool.
+        """
+        if not isinstance(schema, ScoreSchema):
+            raise TypeError(
+                "expected type ScoreSchema for"
+                + f" {self.__class__.__name__}.bind schema but got"
+                + f" {type(schema).__name__} instead"
+            )
+
+        if not isinstance(colorized, bool):
+            raise TypeError(
+                "expected type bool for"
+                + f" {self.__class__.__name__}.bind colorized but got"
+                + f" {type(colorized).__name__} instead"
+            )
+
+        return self._get(
+            schema, tuple(schema._leaf_values(values)), colorized
+        )
+
+    def _get(
+        self,
+        schema: ScoreSchema,
+        leaf_values: tuple[int | float, ...],
+        colorized: bool
+    ) -> CachedResult:
+        """Get the cached result of a set of checked leaf values or score it.
+
+        Args:
+            schema (ScoreSchema): score schema.
+            leaf_values (tuple[int | float, ...]): leaf values, ordered like
+                the schema leaves.
+            colorized (bool): whether the stored render is colorized or not.
+
+        Returns:
+            CachedResult: result of the values.
+        """
+        key: Hashable = (
+            (schema, leaf_values, colorized) if self._render
+            else (schema, leaf_values)
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+
+                    return entry[1]
+
+                del self._entries[key]
+
+            self._misses += 1
+
+        scores = schema.bind(leaf_values)
+        result = CachedResult(
+            scores.score,
+            {
+                schema._paths[index]: scores._scores[index]
+                for index in schema._areas
+            },
+            str(schema.build(leaf_values, colorized)) if self._render
+            else None
+        )
+        expires = (
+            float("inf") if self._ttl is None else monotonic() + self._ttl
+        )
+
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        return result
+
+    def clear(self) -> None:
+        """Remove every stored result and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of stored results.
+
+        Expired results are counted until they are evicted.
+
+        Returns:
+            int: number of stored results.
+        """
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """Get short string representation of the result cache.
+
+        Returns:
+            str: short string representation of the result cache.
+        """
+        return (
+            f"<ResultCache with {len(self._entries)} results"
+            + f" ({self._hits} hits, {self._misses} misses)>"
+        )
@@ -1,16 +1,55 @@
 """Formatting module.
 
 This module contains several text formatting utilities for indentation and
-colorization.
+colorization, along with the RenderOptions class, which holds the settings of
+a single rendering process.
+
+Colorization codes are plain ANSI escape codes, so importing the package and
+rendering uncolored text never touches colorama. Colorama is only imported
+(and initialized, which wraps the standard output and error streams so that
+Windows consoles interpret the codes) when the first colorized text is
+generated.
 
 Author:
     Paulo Sanchez (@erlete)
 """
 
 
-from colorama import Fore, init
+from __future__ import annotations
+
+from threading import Lock
+
+_lock = Lock()
+_initialized = False
+
+
+def enable_colors() -> None:
+    """Import and initialize colorama, if it has not been initialized yet."""
+    global _initialized
+
+    with _lock:
+        if not _initialized:
+            from colorama import init
+            init()
+
+            _initialized = True
 
-init()
+
+class Ansi:
+    """ANSI escape codes used for colorization.
+
+    The codes are the same as the ones defined by colorama.Fore and
+    colorama.Style, which are not used directly to avoid importing colorama.
+    """
+
+    __slots__ = ()
+
+    RED = "\x1b[31m"
+    YELLOW = "\x1b[33m"
+    GREEN = "\x1b[32m"
+    NORMAL = "\x1b[22m"
+    DIM = "\x1b[2m"
+    RESET_ALL = "\x1b[0m"
 
 
 class Formatter:
@@ -22,9 +61,13 @@ class Formatter:
     Attributes:
         START_CHAR (str): character used to indicate start of a new line.
         MIDDLE_CHAR (str): character used to indicate continuation of a line.
-        COLOR_ENABLED (bool): whether colorization is enabled or not.
+        COLOR_ENABLED (bool): whether colorization is enabled or not when no
+            rendering options are given. Score trees carry their own options
+            and never modify it.
     """
 
+    __slots__ = ()
+
     START_CHAR = "└"
     MIDDLE_CHAR = "─"
     COLOR_ENABLED = True
@@ -33,6 +76,134 @@ class Formatter:
     def indent(cls, count: int = 1) -> str:
         """Generate an indentation string.
 
+        Args:
+            count (int, optional): number of indents. Defaults to 1.
+
+        Returns:
+            str: indented string.
+
+        Raises:
+            TypeError: if count is not an integer.
+        """
+        return cls.options().indent(count)
+
+    @classmethod
+    def colorize(cls, text: str, value: int | float) -> str:
+        """Colorize text based on a value.
+
+        Args:
+            text (str): text to colorize.
+            value (int | float): value to base colorization from 0 to 1 (both
+                included).
+
+        Returns:
+            str: colorized text.
+
+        Raises:
+            TypeError: if text is not a string.
+            TypeError: if value is not an integer or float.
+        """
+        return cls.options().colorize(text, value)
+
+    @classmethod
+    def options(cls) -> RenderOptions:
+        """Get the rendering options defined by the class attributes.
+
+        Returns:
+            RenderOptions: rendering options.
+        """
+        return RenderOptions(
+            cls.COLOR_ENABLED, cls.START_CHAR, cls.MIDDLE_CHAR
+        )
+
+
+class RenderOptions:
+    """Rendering options class.
+
+    This class holds the settings used while rendering a score tree. Instances
+    are immutable, so a single instance can be shared by any number of
+    concurrent rendering processes.
+
+    Attributes:
+        colorized (bool): whether colorization is enabled or not.
+        start_char (str): character used to indicate start of a new line.
+        middle_char (str): character used to indicate continuation of a line.
+    """
+
+    __slots__ = ("_colorized", "_start_char", "_middle_char", "_branch")
+
+    def __init__(
+        self,
+        colorized: bool = True,
+        start_char: str = Formatter.START_CHAR,
+        middle_char: str = Formatter.MIDDLE_CHAR
+    ) -> None:
+        """Initialize a RenderOptions instance.
+
+        Args:
+            colorized (bool, optional): whether colorization is enabled or not.
+                Defaults to True.
+            start_char (str, optional): character used to indicate start of a
+                new line. Defaults to Formatter.START_CHAR.
+            middle_char (str, optional): character used to indicate
+                continuation of a line. Defaults to Formatter.MIDDLE_CHAR.
+
+        Raises:
+            TypeError: if colorized is not a bool.
+            TypeError: if start_char or middle_char are not strings.
+        """
+        if not isinstance(colorized, bool):
+            raise TypeError(
+                "expected type bool for"
+                + f" {self.__class__.__name__}.colorized but got"
+                + f" {type(colorized).__name__} instead"
+            )
+
+        for attribute, value in (
+            ("start_char", start_char), ("middle_char", middle_char)
+        ):
+            if not isinstance(value, str):
+                raise TypeError(
+                    "expected type str for"
+                    + f" {self.__class__.__name__}.{attribute} but got"
+                    + f" {type(value).__name__} instead"
+                )
+
+        self._colorized = colorized
+        self._start_char = start_char
+        self._middle_char = middle_char
+        self._branch = f"{start_char}{middle_char * 2} "
+
+    @property
+    def colorized(self) -> bool:
+        """Get colorization flag.
+
+        Returns:
+            bool: colorization flag.
+        """
+        return self._colorized
+
+    @property
+    def start_char(self) -> str:
+        """Get start character.
+
+        Returns:
+            str: character used to indicate start of a new line.
+        """
+        return self._start_char
+
+    @property
+    def middle_char(self) -> str:
+        """Get middle character.
+
+        Returns:
+            str: character used to indicate continuation of a line.
+        """
+        return self._middle_char
+
+    def indent(self, count: int = 1) -> str:
+        """Generate an indentation string.
+
         Args:
             count (int, optional): number of indents. Defaults to 1.
 
@@ -51,17 +222,11 @@ class Formatter:
             return ""
 
         if count == 1:
-            return (
-                f"{cls.START_CHAR}{cls.MIDDLE_CHAR * 2} "
-            )
+            return self._branch
 
-        return (
-            " " * 4 * (count - 1)
-            + f"{cls.START_CHAR}{cls.MIDDLE_CHAR * 2} "
-        )
+        return " " * 4 * (count - 1) + self._branch
 
-    @classmethod
-    def colorize(cls, text: str, value: int | float) -> str:
+    def colorize(self, text: str, value: int | float) -> str:
         """Colorize text based on a value.
 
         Args:
@@ -84,8 +249,38 @@ class Formatter:
 
         value = min(1, max(0, value))  # Value normalization.
 
-        return text if not cls.COLOR_ENABLED else {
-            value < .5: Fore.RED,
-            .5 <= value <= .75: Fore.YELLOW,
-            .75 < value: Fore.GREEN
-        }[True] + text
+        return text if not self._colorized else self.color(value) + text
+
+    def color(self, value: int | float) -> str:
+        """Get the color code of a value.
+
+        Args:
+            value (int | float): value to base colorization from 0 to 1 (both
+                included).
+
+        Returns:
+            str: color code, or an empty string if colorization is disabled.
+        """
+        if not self._colorized:
+            return ""
+
+        if not _initialized:
+            enable_colors()
+
+        return (
+            Ansi.RED if value < .5
+            else Ansi.YELLOW if value <= .75
+            else Ansi.GREEN
+        )
+
+    def __repr__(self) -> str:
+        """Get short representation of the rendering options.
+
+        Returns:
+            str: short representation of the rendering options.
+        """
+        return (
+            f"RenderOptions(colorized={self._colorized},"
+            + f" start_char={self._start_char!r},"
+            + f" middle_char={self._middle_char!r})"
+        )
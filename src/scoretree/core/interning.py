@@ -0,0 +1,301 @@
+"""Shape interning module.
+
+This module contains the functions and classes used to store score trees
+whose top-level items repeat the same structure (for instance, one score area
+per track, all of them with the same areas and scores) compactly.
+
+The structure of every top-level item (its shape) is stored once, as a
+ScoreSchema, and shared by every item with the same shape, which only keeps
+its name, its weight and a vector with its leaf values. Since schemas are
+validated and flattened when built, weight checks and effective leaf weights
+are computed once per shape instead of once per item.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable
+
+from .schema import ScoreResult, ScoreSchema
+from .scores import Score, ScoreArea
+from .traversal import iter_postorder, iter_preorder
+from .tree import ScoreTree
+
+
+def structural_key(node: Score | ScoreArea) -> tuple[Hashable, ...]:
+    """Get a hashable key describing the structure of a node.
+
+    Keys contain the names, weights, score ranges and inverse flags of the
+    node and its descendants, but not their values, so nodes with the same
+    structure have equal keys (and hashes).
+
+    Args:
+        node (Score | ScoreArea): node to describe.
+
+    Returns:
+        tuple[Hashable, ...]: structural key.
+    """
+    # Keys of the items of every area are on top of the stack after them:
+    stack: list[tuple[Hashable, ...]] = []
+    for item, _ in iter_postorder((node,)):
+        if isinstance(item, ScoreArea):
+            count = len(item._items)
+            keys = tuple(stack[len(stack) - count:])
+            del stack[len(stack) - count:]
+            stack.append((item._name, item._weight, keys))
+        else:
+            stack.append((
+                item._name, item._weight, item._lower, item._upper,
+                item._inverse
+            ))
+
+    return stack[0]
+
+
+class ShapeRegistry:
+    """Registry of distinct score item shapes.
+
+    Registries can be shared by several interned trees, so that each shape
+    is stored once across all of them.
+
+    Attributes:
+        shapes (tuple[ScoreSchema, ...]): registered shapes.
+    """
+
+    __slots__ = ("_shapes",)
+
+    def __init__(self) -> None:
+        """Initialize a ShapeRegistry instance."""
+        self._shapes: dict[Hashable, ScoreSchema] = {}
+
+    @property
+    def shapes(self) -> tuple[ScoreSchema, ...]:
+        """Get registered shapes.
+
+        Returns:
+            tuple[ScoreSchema, ...]: registered shapes, in registration
+                order.
+        """
+        return tuple(self._shapes.values())
+
+    def intern(self, item: Score | ScoreArea) -> ScoreSchema:
+        """Get the shape of a score item, registering it if it is new.
+
+        The shape of a score area is the structure of its items, so areas
+        with different names or weights can share it. The shape of a score is
+        its score range and inverse flag.
+
+        Args:
+            item (Score | ScoreArea): score item.
+
+        Returns:
+            ScoreSchema: shape of the item.
+
+        Raises:
+            ValueError: if the weights of a new shape do not add up to 1.
+        """
+        if isinstance(item, ScoreArea):
+            key: Hashable = tuple(
+                structural_key(child) for child in item._items
+            )
+        else:
+            key = (item._lower, item._upper, item._inverse)
+
+        shape = self._shapes.get(key)
+        if shape is None:
+            if isinstance(item, Score):
+                # Scores are stored as an unnamed area holding them:
+                item = ScoreArea.from_trusted("", 1., [Score.from_trusted(
+                    "", 1., (item._lower, item._upper), 0., item._inverse
+                )])
+
+            shape = self._shapes[key] = ScoreSchema(item)
+
+        return shape
+
+    def __len__(self) -> int:
+        """Get the number of registered shapes.
+
+        Returns:
+            int: number of registered shapes.
+        """
+        return len(self._shapes)
+
+
+class InternedTree:
+    """Compact score tree with shared item shapes.
+
+    Every top-level item of the tree is stored as its name, its weight, its
+    shape (see ShapeRegistry) and a vector with its leaf values, in pre-order.
+
+    Attributes:
+        registry (ShapeRegistry): registry of the item shapes.
+        score (float): weighted score.
+        colorized (bool): whether colorization is enabled or not.
+    """
+
+    __slots__ = (
+        "_registry", "_names", "_weights", "_scores", "_shapes", "_values",
+        "_colorized"
+    )
+
+    def __init__(
+        self,
+        tree: ScoreTree,
+        registry: ShapeRegistry | None = None
+    ) -> None:
+        """Initialize an InternedTree instance.
+
+        Args:
+            tree (ScoreTree): score tree to store.
+            registry (ShapeRegistry | None, optional): registry to store item
+                shapes in. Defaults to None (new registry).
+
+        Raises:
+            TypeError: if tree is not a ScoreTree instance.
+            TypeError: if registry is not a ShapeRegistry instance.
+        """
+        if not isinstance(tree, ScoreTree):
+            raise TypeError(
+                "expected type ScoreTree for"
+                + f" {self.__class__.__name__}.tree but got"
+                + f" {type(tree).__name__} instead"
+            )
+
+        if registry is None:
+            registry = ShapeRegistry()
+
+        elif not isinstance(registry, ShapeRegistry):
+            raise TypeError(
+                "expected type ShapeRegistry for"
+                + f" {self.__class__.__name__}.registry but got"
+                + f" {type(registry).__name__} instead"
+            )
+
+        self._registry = registry
+        self._names: list[str] = []
+        self._weights = array("d")
+        self._scores: list[bool] = []
+        self._shapes: list[ScoreSchema] = []
+        self._values: list[array[float]] = []
+        self._colorized = tree.colorized
+
+        for item in tree.items:
+            self._names.append(item._name)
+            self._weights.append(item._weight)
+            self._scores.append(isinstance(item, Score))
+            self._shapes.append(registry.intern(item))
+            self._values.append(array("d", [
+                node._value for node, _ in iter_preorder((item,))
+                if isinstance(node, Score)
+            ]))
+
+    @property
+    def registry(self) -> ShapeRegistry:
+        """Get shape registry.
+
+        Returns:
+            ShapeRegistry: registry of the item shapes.
+        """
+        return self._registry
+
+    @property
+    def colorized(self) -> bool:
+        """Get colorization flag.
+
+        Returns:
+            bool: colorization flag.
+        """
+        return self._colorized
+
+    @property
+    def score(self) -> float:
+        """Get weighted score.
+
+        Returns:
+            float: weighted score.
+        """
+        return sum(
+            shape.bind(values).score * weight
+            for shape, values, weight in zip(
+                self._shapes, self._values, self._weights
+            )
+        )
+
+    def values(self, index: int) -> array[float]:
+        """Get the leaf values of a top-level item.
+
+        The returned vector is the one stored by the tree, so modifying it
+        modifies the tree.
+
+        Args:
+            index (int): item position.
+
+        Returns:
+            array[float]: leaf values of the item, in pre-order.
+
+        Raises:
+            IndexError: if the item does not exist.
+        """
+        return self._values[index]
+
+    def result(self, index: int) -> ScoreResult:
+        """Get the scores of a top-level item.
+
+        Args:
+            index (int): item position.
+
+        Returns:
+            ScoreResult: scores of the item nodes, indexed by path relative
+                to the item.
+
+        Raises:
+            IndexError: if the item does not exist.
+        """
+        return self._shapes[index].bind(self._values[index])
+
+    def to_tree(self) -> ScoreTree:
+        """Build a regular score tree with the stored items.
+
+        Returns:
+            ScoreTree: score tree.
+        """
+        items: list[Score | ScoreArea] = []
+        for name, weight, score, shape, values in zip(
+            self._names, self._weights, self._scores, self._shapes,
+            self._values
+        ):
+            if score:
+                items.append(Score.from_trusted(
+                    name, weight, shape._ranges[0],  # type: ignore[arg-type]
+                    values[0], shape._inverse[0]
+                ))
+            else:
+                items.append(ScoreArea.from_trusted(
+                    name, weight, shape.build(values).items
+                ))
+
+        return ScoreTree.from_trusted(items, self._colorized)
+
+    def __len__(self) -> int:
+        """Get the number of top-level items.
+
+        Returns:
+            int: number of top-level items.
+        """
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        """Get short string representation of the interned tree.
+
+        Returns:
+            str: short string representation of the interned tree.
+        """
+        return (
+            f"<InternedTree with {len(self._names)} items and"
+            + f" {len(set(map(id, self._shapes)))} shapes>"
+        )
@@ -0,0 +1,302 @@
+"""Profiling module.
+
+This module contains the ProfileStats class, which holds call counters and
+timings of score evaluations, colorizations, validations and renders, and the
+profile context manager, which collects them.
+
+Instrumentation is installed by replacing the profiled methods of the Score,
+ScoreArea, ScoreTree and RenderOptions classes with timed wrappers when the
+first profile context is entered, and by restoring the original methods when
+the last one is exited. Hence, profiling has no cost at all while disabled.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from threading import RLock
+from time import perf_counter
+from typing import Any
+
+from .formatter import RenderOptions
+from .scores import Score, ScoreArea
+from .tree import ScoreTree
+
+# Profiled methods, as (class, attribute, event name):
+HOOKS: tuple[tuple[type, str, str], ...] = (
+    (Score, "score", "Score.score"),
+    (ScoreArea, "score", "ScoreArea.score"),
+    (ScoreTree, "score", "ScoreTree.score"),
+    (RenderOptions, "color", "colorize"),
+    (Score, "validate", "Score.validate"),
+    (ScoreArea, "_validate_attributes", "ScoreArea.validate"),
+    (ScoreTree, "validate", "ScoreTree.validate"),
+    (ScoreTree, "check_weights", "ScoreTree.check_weights"),
+    (ScoreTree, "iter_lines", "ScoreTree.render")
+)
+
+_lock = RLock()
+_active: list[ProfileStats] = []
+_originals: dict[tuple[type, str], Any] = {}
+
+
+class ProfileStats:
+    """Call counters and timings collected while profiling.
+
+    Times are measured per call and include the time spent in nested
+    profiled calls (for instance, a cold ScoreArea.score includes the
+    Score.score calls of its leaves). Validations are recorded once per
+    validated node, nested ones included, so ScoreArea.validate times only
+    include the checks of the area attributes. Render times only include the
+    time spent generating lines, not the time spent by the caller consuming
+    them.
+
+    Events are counted for the whole process. Events of score trees (score
+    evaluations, validations, weight checks and renders) are also counted for
+    every tree.
+
+    Attributes:
+        counts (dict[str, int]): number of calls of every event.
+        times (dict[str, float]): total time of every event, in seconds.
+        tree_counts (dict[ScoreTree, dict[str, int]]): number of calls of
+            every score tree event, for every tree.
+        renders (dict[ScoreTree, int]): number of renders of every tree.
+    """
+
+    __slots__ = ("_counts", "_times", "_trees")
+
+    def __init__(self) -> None:
+        """Initialize a ProfileStats instance."""
+        self._counts: dict[str, int] = {}
+        self._times: dict[str, float] = {}
+        self._trees: dict[ScoreTree, dict[str, int]] = {}
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Get call counters.
+
+        Returns:
+            dict[str, int]: number of calls of every event.
+        """
+        return dict(self._counts)
+
+    @property
+    def times(self) -> dict[str, float]:
+        """Get call timings.
+
+        Returns:
+            dict[str, float]: total time of every event, in seconds.
+        """
+        return dict(self._times)
+
+    @property
+    def renders(self) -> dict[ScoreTree, int]:
+        """Get render counters.
+
+        Returns:
+            dict[ScoreTree, int]: number of renders of every tree.
+        """
+        return {
+            tree: counts["ScoreTree.render"]
+            for tree, counts in self._trees.items()
+            if "ScoreTree.render" in counts
+        }
+
+    @property
+    def tree_counts(self) -> dict[ScoreTree, dict[str, int]]:
+        """Get call counters of every tree.
+
+        Returns:
+            dict[ScoreTree, dict[str, int]]: number of calls of every score
+                tree event, for every tree.
+        """
+        return {tree: dict(counts) for tree, counts in self._trees.items()}
+
+    def _record(
+        self,
+        event: str,
+        elapsed: float,
+        tree: ScoreTree | None = None
+    ) -> None:
+        """Record a call.
+
+        Args:
+            event (str): event name.
+            elapsed (float): call time, in seconds.
+            tree (ScoreTree | None, optional): score tree the call belongs
+                to, if any. Defaults to None.
+        """
+        self._counts[event] = self._counts.get(event, 0) + 1
+        self._times[event] = self._times.get(event, 0.0) + elapsed
+
+        if tree is not None:
+            counts = self._trees.setdefault(tree, {})
+            counts[event] = counts.get(event, 0) + 1
+
+    def report(self) -> str:
+        """Get a summary of the collected statistics.
+
+        Returns:
+            str: one line per event, sorted by total time.
+        """
+        return "\n".join(
+            f"{event}: {self._counts[event]} calls,"
+            + f" {self._times[event] * 1000:.3f} ms"
+            for event in sorted(
+                self._times, key=self._times.__getitem__, reverse=True
+            )
+        )
+
+    def __repr__(self) -> str:
+        """Get short string representation of the profile statistics.
+
+        Returns:
+            str: short string representation of the profile statistics.
+        """
+        return (
+            f"<ProfileStats with {sum(self._counts.values())} calls of"
+            + f" {len(self._counts)} events>"
+        )
+
+
+def _record(
+    event: str,
+    elapsed: float,
+    tree: ScoreTree | None = None
+) -> None:
+    """Record a call in every active profile.
+
+    Args:
+        event (str): event name.
+        elapsed (float): call time, in seconds.
+        tree (ScoreTree | None, optional): score tree the call belongs to, if
+            any. Defaults to None.
+    """
+    with _lock:
+        for stats in _active:
+            stats._record(event, elapsed, tree)
+
+
+def _timed(event: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a function so that its calls are recorded.
+
+    Calls whose instance (or, for class methods, whose first argument) is a
+    score tree are recorded for that tree too.
+
+    Args:
+        event (str): event name.
+        function (Callable[..., Any]): function to wrap.
+
+    Returns:
+        Callable[..., Any]: wrapped function.
+    """
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tree = next(
+            (arg for arg in args[:2] if isinstance(arg, ScoreTree)), None
+        )
+
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(event, perf_counter() - start, tree)
+
+    return wrapper
+
+
+def _timed_lines(
+    event: str,
+    function: Callable[..., Iterator[str]]
+) -> Callable[..., Iterator[str]]:
+    """Wrap a line generator so that its renders are recorded per tree.
+
+    Args:
+        event (str): event name.
+        function (Callable[..., Iterator[str]]): line generator to wrap.
+
+    Returns:
+        Callable[..., Iterator[str]]: wrapped line generator.
+    """
+    @wraps(function)
+    def wrapper(tree: ScoreTree, *args: Any, **kwargs: Any) -> Iterator[str]:
+        # Only the time spent generating lines is measured:
+        elapsed = 0.0
+        lines = function(tree, *args, **kwargs)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    line = next(lines)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += perf_counter() - start
+
+                yield line
+        finally:
+            _record(event, elapsed, tree)
+
+    return wrapper
+
+
+def _install() -> None:
+    """Replace the profiled methods with timed wrappers."""
+    for cls, attribute, event in HOOKS:
+        original = cls.__dict__[attribute]
+        _originals[(cls, attribute)] = original
+
+        replacement: Any
+        if isinstance(original, property):
+            replacement = property(
+                _timed(event, original.fget),  # type: ignore[arg-type]
+                original.fset, original.fdel, original.__doc__
+            )
+        elif isinstance(original, classmethod):
+            replacement = classmethod(_timed(event, original.__func__))
+        elif attribute == "iter_lines":
+            replacement = _timed_lines(event, original)
+        else:
+            replacement = _timed(event, original)
+
+        setattr(cls, attribute, replacement)
+
+
+def _uninstall() -> None:
+    """Restore the original profiled methods."""
+    for (cls, attribute), original in _originals.items():
+        setattr(cls, attribute, original)
+
+    _originals.clear()
+
+
+@contextmanager
+def profile() -> Iterator[ProfileStats]:
+    """Collect call counters and timings while the context is active.
+
+    Profiling applies to every tree of the process, including trees used by
+    other threads while the context is active. Contexts can be nested, in
+    which case calls are recorded by all of them.
+
+    Yields:
+        ProfileStats: statistics collected by the context.
+    """
+    stats = ProfileStats()
+
+    with _lock:
+        if not _active:
+            _install()
+        _active.append(stats)
+
+    try:
+        yield stats
+    finally:
+        with _lock:
+            _active.remove(stats)
+            if not _active:
+                _uninstall()
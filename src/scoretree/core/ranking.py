@@ -0,0 +1,126 @@
+"""Ranking module.
+
+This module contains the functions used to rank large populations of
+candidates (sets of leaf values) sharing a score schema.
+
+Since the total score is a weighted sum of leaf scores (from 0 to 1), every
+leaf contributes at most its effective weight (the product of the weights
+along its path) to the total, or nothing if that weight is negative. Leaves
+are therefore evaluated from the heaviest to the lightest (in absolute
+value), and a candidate is discarded as soon as its partial score plus the
+positive weight of the remaining leaves can no longer beat the current k-th
+best score.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from heapq import heappush, heapreplace
+from itertools import accumulate
+
+from .schema import ScoreResult, ScoreSchema
+from .scores import compute_score
+from .tree import ScoreTree
+
+# Absolute tolerance of score bounds, which are accumulated in a different
+# order than actual scores and might differ from them in the last bits:
+_EPSILON = 1e-9
+
+
+def top_k(
+    schema: ScoreSchema | ScoreTree,
+    rows: Iterable[Mapping[str, int | float] | Sequence[int | float]],
+    k: int
+) -> list[tuple[int, ScoreResult]]:
+    """Get the k candidates with the highest score.
+
+    Args:
+        schema (ScoreSchema | ScoreTree): score schema (or score tree whose
+            schema is used) the candidates are bound to.
+        rows (Iterable[Mapping[str, int | float] | Sequence[int | float]]):
+            leaf values of every candidate, either indexed by leaf path or
+            ordered like the schema leaves.
+        k (int): number of candidates to return.
+
+    Returns:
+        list[tuple[int, ScoreResult]]: position of every selected candidate
+            in the input rows and its scores, from the highest score to the
+            lowest. Candidates with the same score keep their input order.
+
+    Raises:
+        TypeError: if k is not an integer.
+        ValueError: if k is negative.
+        KeyError: if a leaf path is missing from or unknown to the schema.
+        ValueError: if the number of values does not match the leaves.
+        TypeError: if a value is not an int or float.
+    """
+    if not isinstance(k, int) or isinstance(k, bool):
+        raise TypeError(
+            "expected type int for top_k k but got"
+            + f" {type(k).__name__} instead"
+        )
+
+    if k < 0:
+        raise ValueError(f"expected a positive k for top_k but got {k}")
+
+    if not isinstance(schema, ScoreSchema):
+        schema = ScoreSchema(schema)
+
+    # Leaves, from the heaviest to the lightest, and the maximum score that
+    # the leaves after each of them can add up to (leaves with negative
+    # weights can only lower it):
+    leaf_weights = schema.leaf_weights
+    order = sorted(
+        range(len(leaf_weights)),
+        key=lambda position: abs(leaf_weights[position]), reverse=True
+    )
+    leaves = [
+        (
+            position,
+            leaf_weights[position],
+            *schema._ranges[schema._leaves[position]],  # type: ignore[misc]
+            schema._inverse[schema._leaves[position]]
+        ) for position in order
+    ]
+    remaining = list(accumulate(
+        (max(leaf_weights[position], 0.0) for position in reversed(order[1:])),
+        initial=0.0
+    ))[::-1]
+
+    # Min-heap whose root is the k-th best candidate so far:
+    heap: list[tuple[float, int, ScoreResult]] = []
+    for index, row in enumerate(rows):
+        values = schema._leaf_values(row)
+
+        if len(heap) < k:
+            result = schema.bind(values)
+            heappush(heap, (result.score, -index, result))
+            continue
+
+        if not k:
+            continue
+
+        threshold = heap[0][0] - _EPSILON
+        partial = 0.0
+        for (position, weight, lower, upper, inverse), bound in zip(
+            leaves, remaining
+        ):
+            partial += weight * compute_score(
+                values[position], lower, upper, inverse
+            )
+            if partial + bound <= threshold:
+                break
+        else:
+            # Exact scores are only computed for candidates that might win:
+            result = schema.bind(values)
+            if result.score > heap[0][0]:
+                heapreplace(heap, (result.score, -index, result))
+
+    return [
+        (-index, result)
+        for _, index, result in sorted(heap, reverse=True)
+    ]
@@ -0,0 +1,239 @@
+"""Scenario evaluation module.
+
+This module contains the ScenarioResult class, which holds the scores of a
+what-if scenario, and the function used to evaluate many scenarios against a
+base score tree.
+
+A scenario is a sparse set of attribute overrides indexed by node path (see
+ScoreSchema), such as {"Area/Test": {"value": 5, "inverse": True}}. Scenarios
+never modify nor copy the base tree: its scores are computed once, and every
+scenario only recomputes the areas that contain an overridden node.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .schema import ScoreResult, ScoreSchema
+from .scores import Score
+from .traversal import iter_preorder
+from .tree import ScoreTree
+
+# Attributes that can be overridden for leaves and for areas:
+LEAF_ATTRIBUTES = frozenset(("weight", "score_range", "value", "inverse"))
+AREA_ATTRIBUTES = frozenset(("weight",))
+
+
+class ScenarioResult:
+    """Scores of a what-if scenario.
+
+    Only the scores of the overridden nodes and their ancestors are stored,
+    any other score is read from the base result.
+
+    Attributes:
+        base (ScoreResult): scores of the base tree.
+        score (float): weighted score of the scenario.
+        changes (dict[str, float]): score of every recomputed node, indexed by
+            path.
+        scores (dict[str, float]): score of every node, indexed by path.
+    """
+
+    __slots__ = ("_base", "_changes", "_score")
+
+    def __init__(
+        self,
+        base: ScoreResult,
+        changes: dict[int, float],
+        score: float
+    ) -> None:
+        """Initialize a ScenarioResult instance.
+
+        Args:
+            base (ScoreResult): scores of the base tree.
+            changes (dict[int, float]): score of every recomputed node,
+                indexed by schema pre-order position.
+            score (float): weighted score of the scenario.
+        """
+        self._base = base
+        self._changes = changes
+        self._score = score
+
+    @property
+    def base(self) -> ScoreResult:
+        """Get base scores.
+
+        Returns:
+            ScoreResult: scores of the base tree.
+        """
+        return self._base
+
+    @property
+    def score(self) -> float:
+        """Get weighted score.
+
+        Returns:
+            float: weighted score of the scenario.
+        """
+        return self._score
+
+    @property
+    def changes(self) -> dict[str, float]:
+        """Get recomputed node scores.
+
+        Returns:
+            dict[str, float]: score of every recomputed node, indexed by path.
+        """
+        paths = self._base._schema._paths
+
+        return {paths[index]: score for index, score in self._changes.items()}
+
+    @property
+    def scores(self) -> dict[str, float]:
+        """Get node scores.
+
+        Returns:
+            dict[str, float]: score of every node, indexed by path.
+        """
+        return {**self._base.scores, **self.changes}
+
+    def __getitem__(self, path: str) -> float:
+        """Get the score of a node.
+
+        Args:
+            path (str): node path.
+
+        Returns:
+            float: node score.
+
+        Raises:
+            KeyError: if the path does not exist in the schema.
+        """
+        index = self._base._schema._index[path]
+
+        return self._changes.get(index, self._base._scores[index])
+
+    def __repr__(self) -> str:
+        """Get short string representation of the scenario result.
+
+        Returns:
+            str: short string representation of the scenario result.
+        """
+        return (
+            f"<ScenarioResult with score {self._score * 100:.2f}%"
+            + f" ({len(self._changes)} recomputed nodes)>"
+        )
+
+
+def evaluate_scenarios(
+    tree: ScoreTree,
+    scenarios: Iterable[Mapping[str, Mapping[str, Any]]]
+) -> list[ScenarioResult]:
+    """Evaluate a set of what-if scenarios against a base score tree.
+
+    Leaves accept value, weight, score_range and inverse overrides, while
+    areas accept weight overrides. Overridden values are validated like their
+    Score and ScoreArea counterparts, but weights are not required to add up
+    to 1, so that single weights can be explored.
+
+    Args:
+        tree (ScoreTree): base score tree, which is not modified.
+        scenarios (Iterable[Mapping[str, Mapping[str, Any]]]): attribute
+            overrides of every scenario, indexed by node path.
+
+    Returns:
+        list[ScenarioResult]: scores of every scenario, in input order.
+
+    Raises:
+        KeyError: if a path does not exist in the tree.
+        ValueError: if an overridden attribute does not exist or cannot be
+            overridden.
+        TypeError: if an overridden attribute has an invalid type.
+        ValueError: if an overridden attribute has an invalid value.
+    """
+    schema = ScoreSchema(tree)
+    values = [
+        node._value for node, _ in iter_preorder(tree.items)
+        if isinstance(node, Score)
+    ]
+    base = schema.bind(values)
+    leaf_values = dict(zip(schema._leaves, values))
+
+    names = schema._names
+    weights = schema._weights
+    parents = schema._parents
+    children = schema._children
+    ranges = schema._ranges
+    inverse = schema._inverse
+    index_of = schema._index
+    base_scores = base._scores
+
+    results = []
+    for scenario in scenarios:
+        changes: dict[int, float] = {}
+        changed_weights: dict[int, float] = {}
+        dirty: set[int] = set()
+        roots = False
+
+        for path, overrides in scenario.items():
+            index = index_of[path]
+            range_ = ranges[index]
+            allowed = AREA_ATTRIBUTES if range_ is None else LEAF_ATTRIBUTES
+
+            unknown = set(overrides) - allowed
+            if unknown:
+                raise ValueError(
+                    f"cannot override {', '.join(sorted(unknown))} for"
+                    + f" \"{path}\""
+                )
+
+            if range_ is None:
+                weight = overrides.get("weight", weights[index])
+                if not isinstance(weight, (int, float)):
+                    raise TypeError(
+                        "expected type int | float for"
+                        + f" \"{path}\" weight but got"
+                        + f" {type(weight).__name__} instead"
+                    )
+                changed_weights[index] = float(weight)
+            else:
+                # Leaf overrides are checked by the Score setters:
+                leaf = Score.from_trusted(
+                    names[index],
+                    overrides.get("weight", weights[index]),
+                    overrides.get("score_range", range_),
+                    overrides.get("value", leaf_values[index]),
+                    overrides.get("inverse", inverse[index])
+                )
+                leaf.validate()
+                changes[index] = leaf.score
+                changed_weights[index] = leaf.weight
+
+            # Every ancestor of an overridden node is recomputed:
+            parent = parents[index]
+            while parent >= 0 and parent not in dirty:
+                dirty.add(parent)
+                parent = parents[parent]
+            roots = roots or parent < 0
+
+        # Items have greater pre-order positions than their parent areas:
+        for index in sorted(dirty, reverse=True):
+            changes[index] = sum(
+                changes.get(item, base_scores[item])
+                * changed_weights.get(item, weights[item])
+                for item in children[index]
+            )
+
+        score = sum(
+            changes.get(item, base_scores[item])
+            * changed_weights.get(item, weights[item])
+            for item in schema._roots
+        ) if roots else base.score
+
+        results.append(ScenarioResult(base, changes, score))
+
+    return results
@@ -0,0 +1,464 @@
+"""Score schema module.
+
+This module contains the ScoreSchema class, which is an immutable
+representation of the structure of a score tree (names, weights, score ranges
+and inverse flags), and the ScoreResult class, which holds the scores obtained
+from binding a set of leaf values to a schema.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+
+from .scores import Score, ScoreArea, compute_score
+from .tree import ScoreTree
+
+
+class ScoreSchema:
+    """Immutable score tree structure.
+
+    The schema is built (and validated) once from a score tree and stores its
+    nodes in pre-order as flat tuples. Leaf values are not part of the schema:
+    they are bound to it on every evaluation run, which avoids rebuilding and
+    revalidating Score and ScoreArea instances for each set of values.
+
+    Nodes are addressed by path, which is the sequence of node names from the
+    tree to the node, joined by the SEPARATOR character.
+
+    Schemas are compared and hashed by structure, so two schemas built from
+    trees with the same names, weights, score ranges and inverse flags are
+    equal, regardless of their leaf values.
+
+    Attributes:
+        paths (tuple[str, ...]): node paths, in pre-order.
+        leaves (tuple[str, ...]): leaf paths, in pre-order.
+        leaf_weights (tuple[float, ...]): effective weight of every leaf, in
+            pre-order.
+    """
+
+    SEPARATOR = ScoreTree.SEPARATOR
+
+    __slots__ = (
+        "_paths", "_names", "_weights", "_parents", "_children", "_ranges",
+        "_inverse", "_leaves", "_areas", "_roots", "_index", "_leaf_weights",
+        "_hash"
+    )
+
+    def __init__(self, tree: ScoreTree | ScoreArea) -> None:
+        """Initialize a ScoreSchema instance.
+
+        Args:
+            tree (ScoreTree | ScoreArea): score tree (or score area, whose
+                items are then considered the top-level ones) whose structure
+                is used. Leaf values are ignored.
+
+        Raises:
+            ValueError: if the tree weights do not add up to 1.
+            ValueError: if several nodes share the same path (siblings with
+                the same name, or names containing the separator).
+        """
+        ScoreTree.check_weights(tree)
+
+        paths: list[str] = []
+        names: list[str] = []
+        weights: list[float] = []
+        parents: list[int] = []
+        children: list[list[int]] = []
+        ranges: list[tuple[float, float] | None] = []
+        inverse: list[bool] = []
+
+        stack: list[tuple[Score | ScoreArea, int]] = [
+            (item, -1) for item in reversed(tree.items)
+        ]
+        while stack:
+            node, parent = stack.pop()
+            index = len(paths)
+
+            paths.append(
+                node.name if parent < 0
+                else f"{paths[parent]}{self.SEPARATOR}{node.name}"
+            )
+            names.append(node.name)
+            weights.append(node.weight)
+            parents.append(parent)
+            children.append([])
+
+            if parent >= 0:
+                children[parent].append(index)
+
+            if isinstance(node, ScoreArea):
+                ranges.append(None)
+                inverse.append(False)
+                stack.extend((item, index) for item in reversed(node.items))
+            else:
+                ranges.append(node.score_range)
+                inverse.append(node.inverse)
+
+        self._paths = tuple(paths)
+        self._names = tuple(names)
+        self._weights = tuple(weights)
+        self._parents = tuple(parents)
+        self._children = tuple(tuple(items) for items in children)
+        self._ranges = tuple(ranges)
+        self._inverse = tuple(inverse)
+        self._leaves = tuple(
+            index for index, range_ in enumerate(ranges)
+            if range_ is not None
+        )
+        self._areas = tuple(
+            index for index, range_ in enumerate(ranges) if range_ is None
+        )
+        self._roots = tuple(
+            index for index, parent in enumerate(parents) if parent < 0
+        )
+        self._index = {path: index for index, path in enumerate(paths)}
+        if len(self._index) != len(paths):
+            duplicate = next(
+                path for index, path in enumerate(paths)
+                if self._index[path] != index
+            )
+            raise ValueError(
+                f"several nodes of {self.__class__.__name__} share the path"
+                + f" \"{duplicate}\", so it cannot be addressed"
+            )
+
+        # Effective weights are the products of the weights along each path:
+        effective = weights.copy()
+        for index, parent in enumerate(parents):
+            if parent >= 0:
+                effective[index] *= effective[parent]
+
+        self._leaf_weights = tuple(effective[index] for index in self._leaves)
+        self._hash = hash((
+            self._names, self._weights, self._parents, self._ranges,
+            self._inverse
+        ))
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        """Get node paths.
+
+        Returns:
+            tuple[str, ...]: node paths, in pre-order.
+        """
+        return self._paths
+
+    @property
+    def leaves(self) -> tuple[str, ...]:
+        """Get leaf paths.
+
+        Returns:
+            tuple[str, ...]: leaf paths, in pre-order.
+        """
+        return tuple(self._paths[index] for index in self._leaves)
+
+    @property
+    def leaf_weights(self) -> tuple[float, ...]:
+        """Get effective leaf weights.
+
+        The effective weight of a leaf is the product of the weights along
+        its path, that is, the maximum score it can add to the total.
+
+        Returns:
+            tuple[float, ...]: effective weight of every leaf, in pre-order.
+        """
+        return self._leaf_weights
+
+    def _leaf_values(
+        self,
+        values: Mapping[str, int | float] | Sequence[int | float]
+    ) -> list[int | float]:
+        """Normalize and check a set of leaf values.
+
+        Args:
+            values (Mapping[str, int | float] | Sequence[int | float]): leaf
+                values, either indexed by leaf path or ordered like the leaves
+                attribute.
+
+        Returns:
+            list[int | float]: leaf values, ordered like the leaves attribute.
+
+        Raises:
+            KeyError: if a leaf path is missing from or unknown to the schema.
+            ValueError: if the number of values does not match the leaves.
+            TypeError: if a value is not an int or float.
+        """
+        if isinstance(values, Mapping):
+            unknown = [
+                path for path in values
+                if path not in self._index
+                or self._ranges[self._index[path]] is None
+            ]
+            if unknown:
+                raise KeyError(
+                    f"unknown leaf paths for {self.__class__.__name__}:"
+                    + f" {', '.join(unknown)}"
+                )
+
+            values = [values[self._paths[index]] for index in self._leaves]
+
+        elif len(values) != len(self._leaves):
+            raise ValueError(
+                f"expected {len(self._leaves)} values for"
+                + f" {self.__class__.__name__} but got"
+                + f" {len(values)} instead"
+            )
+
+        for value in values:
+            if not isinstance(value, (int, float)):
+                raise TypeError(
+                    "expected type int | float for"
+                    + f" {self.__class__.__name__} values but got"
+                    + f" {type(value).__name__} instead"
+                )
+
+        return list(values)
+
+    def bind(
+        self,
+        values: Mapping[str, int | float] | Sequence[int | float]
+    ) -> ScoreResult:
+        """Bind a set of leaf values to the schema and compute its scores.
+
+        Args:
+            values (Mapping[str, int | float] | Sequence[int | float]): leaf
+                values, either indexed by leaf path or ordered like the leaves
+                attribute.
+
+        Returns:
+            ScoreResult: computed scores.
+
+        Raises:
+            KeyError: if a leaf path is missing from or unknown to the schema.
+            ValueError: if the number of values does not match the leaves.
+            TypeError: if a value is not an int or float.
+        """
+        scores = [0.0] * len(self._paths)
+        for index, value in zip(self._leaves, self._leaf_values(values)):
+            lower, upper = self._ranges[index]  # type: ignore[misc]
+            scores[index] = compute_score(
+                value, lower, upper, self._inverse[index]
+            )
+
+        # Reverse pre-order evaluates every item before its parent area:
+        weights = self._weights
+        for index in reversed(self._areas):
+            scores[index] = sum(
+                scores[item] * weights[item]
+                for item in self._children[index]
+            )
+
+        return ScoreResult(self, scores, sum(
+            scores[item] * weights[item] for item in self._roots
+        ))
+
+    def top_k(
+        self,
+        rows: Iterable[Mapping[str, int | float] | Sequence[int | float]],
+        k: int
+    ) -> list[tuple[int, ScoreResult]]:
+        """Get the k sets of leaf values with the highest score.
+
+        Candidates are selected with a heap, and evaluation of a candidate is
+        stopped as soon as it can no longer beat the k-th best score, so most
+        candidates of large populations are never fully evaluated.
+
+        Args:
+            rows (Iterable[Mapping[str, int | float] | Sequence[int | float]]):
+                leaf values of every candidate, either indexed by leaf path or
+                ordered like the leaves attribute.
+            k (int): number of candidates to return.
+
+        Returns:
+            list[tuple[int, ScoreResult]]: position of every selected
+                candidate in the input rows and its scores, from the highest
+                score to the lowest.
+
+        Raises:
+            TypeError: if k is not an integer.
+            ValueError: if k is negative.
+            KeyError: if a leaf path is missing from or unknown to the schema.
+            ValueError: if the number of values does not match the leaves.
+            TypeError: if a value is not an int or float.
+        """
+        from .ranking import top_k
+
+        return top_k(self, rows, k)
+
+    def build(
+        self,
+        values: Mapping[str, int | float] | Sequence[int | float],
+        colorized: bool = True
+    ) -> ScoreTree:
+        """Build a score tree with the schema structure and a set of values.
+
+        Since the schema is already validated, the tree is built through the
+        trusted constructors.
+
+        Args:
+            values (Mapping[str, int | float] | Sequence[int | float]): leaf
+                values, either indexed by leaf path or ordered like the leaves
+                attribute.
+            colorized (bool, optional): whether colorization is enabled or
+                not. Defaults to True.
+
+        Returns:
+            ScoreTree: score tree.
+
+        Raises:
+            KeyError: if a leaf path is missing from or unknown to the schema.
+            ValueError: if the number of values does not match the leaves.
+            TypeError: if a value is not an int or float.
+        """
+        leaf_values = self._leaf_values(values)
+
+        # Reverse pre-order leaves the first item of every area on top:
+        stack: list[Score | ScoreArea] = []
+        leaf = len(leaf_values)
+        for index in range(len(self._paths) - 1, -1, -1):
+            range_ = self._ranges[index]
+            if range_ is None:
+                stack.append(ScoreArea.from_trusted(
+                    self._names[index], self._weights[index],
+                    [stack.pop() for _ in self._children[index]]
+                ))
+            else:
+                leaf -= 1
+                stack.append(Score.from_trusted(
+                    self._names[index], self._weights[index], range_,
+                    float(leaf_values[leaf]), self._inverse[index]
+                ))
+
+        stack.reverse()
+
+        return ScoreTree.from_trusted(stack, colorized)
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether two schemas have the same structure.
+
+        Args:
+            other (object): object to compare.
+
+        Returns:
+            bool: whether both schemas have the same structure or not.
+        """
+        if not isinstance(other, ScoreSchema):
+            return NotImplemented
+
+        return self is other or (
+            self._hash == other._hash
+            and self._names == other._names
+            and self._weights == other._weights
+            and self._parents == other._parents
+            and self._ranges == other._ranges
+            and self._inverse == other._inverse
+        )
+
+    def __hash__(self) -> int:
+        """Get the structural hash of the schema.
+
+        Returns:
+            int: structural hash.
+        """
+        return self._hash
+
+    def __len__(self) -> int:
+        """Get the number of nodes of the schema.
+
+        Returns:
+            int: number of nodes.
+        """
+        return len(self._paths)
+
+    def __repr__(self) -> str:
+        """Get short string representation of the score schema.
+
+        Returns:
+            str: short string representation of the score schema.
+        """
+        return (
+            f"<ScoreSchema with {len(self._paths)} nodes and"
+            + f" {len(self._leaves)} leaves>"
+        )
+
+
+class ScoreResult:
+    """Scores of a set of leaf values bound to a score schema.
+
+    Attributes:
+        schema (ScoreSchema): score schema the values were bound to.
+        score (float): weighted score of the whole tree.
+        scores (dict[str, float]): score of every node, indexed by path.
+    """
+
+    __slots__ = ("_schema", "_scores", "_score")
+
+    def __init__(
+        self,
+        schema: ScoreSchema,
+        scores: list[float],
+        score: float
+    ) -> None:
+        """Initialize a ScoreResult instance.
+
+        Args:
+            schema (ScoreSchema): score schema the values were bound to.
+            scores (list[float]): score of every node, in schema pre-order.
+            score (float): weighted score of the whole tree.
+        """
+        self._schema = schema
+        self._scores = scores
+        self._score = score
+
+    @property
+    def schema(self) -> ScoreSchema:
+        """Get score schema.
+
+        Returns:
+            ScoreSchema: score schema the values were bound to.
+        """
+        return self._schema
+
+    @property
+    def score(self) -> float:
+        """Get weighted score.
+
+        Returns:
+            float: weighted score of the whole tree.
+        """
+        return self._score
+
+    @property
+    def scores(self) -> dict[str, float]:
+        """Get node scores.
+
+        Returns:
+            dict[str, float]: score of every node, indexed by path.
+        """
+        return dict(zip(self._schema._paths, self._scores))
+
+    def __getitem__(self, path: str) -> float:
+        """Get the score of a node.
+
+        Args:
+            path (str): node path.
+
+        Returns:
+            float: node score.
+
+        Raises:
+            KeyError: if the path does not exist in the schema.
+        """
+        return self._scores[self._schema._index[path]]
+
+    def __repr__(self) -> str:
+        """Get short string representation of the score result.
+
+        Returns:
+            str: short string representation of the score result.
+        """
+        return f"<ScoreResult with score {self._score * 100:.2f}%>"
@@ -14,9 +14,93 @@ Author:
 
 from __future__ import annotations
 
-from colorama import Style
+from typing import TYPE_CHECKING
 
-from .formatter import Formatter
+from .formatter import Ansi, Formatter
+from .traversal import iter_postorder, iter_preorder
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .formatter import RenderOptions
+    from .tree import ScoreTree
+
+
+def _restructure(node: Score | ScoreArea | ScoreTree) -> None:
+    """Mark the structure of the score tree a node belongs to as modified.
+
+    Path indexes, flattened leaf weights, render templates and score schemas
+    store the generation of their tree they were built at, so they are
+    rebuilt on their first use after a structural change. Nodes that do not
+    belong to any tree have nothing to mark.
+
+    Args:
+        node (Score | ScoreArea | ScoreTree): renamed or reweighted node,
+            score whose range or inverse flag changed, or area or tree whose
+            items list was replaced.
+    """
+    root: Score | ScoreArea | ScoreTree = node
+    while root._parent is not None:
+        root = root._parent
+
+    if not isinstance(root, (Score, ScoreArea)):
+        root._generation += 1
+
+
+def _adopt(
+    parent: ScoreArea | ScoreTree,
+    items: list[Score | ScoreArea]
+) -> None:
+    """Make an area or tree the parent of a new list of items.
+
+    Nodes can only belong to a single area or tree, since cached scores are
+    invalidated through their parent links. Replaced items are detached from
+    the parent, so that they do not invalidate it anymore.
+
+    Args:
+        parent (ScoreArea | ScoreTree): new parent of the items.
+        items (list[Score | ScoreArea]): new items of the parent.
+
+    Raises:
+        ValueError: if any item already belongs to another area or tree.
+    """
+    for item in items:
+        if item._parent is not None and item._parent is not parent:
+            raise ValueError(
+                f"{item!r} already belongs to {item._parent!r}, so it must"
+                + " be removed from it before being added elsewhere"
+            )
+
+    kept = {id(item) for item in items}
+    for item in getattr(parent, "_items", ()):
+        if id(item) not in kept:
+            item._parent = None
+
+    for item in items:
+        item._parent = parent
+
+
+def compute_score(
+    value: float,
+    lower: float,
+    upper: float,
+    inverse: bool
+) -> float:
+    """Compute the score of a value within a score range.
+
+    Args:
+        value (float): current value.
+        lower (float): score range minimum.
+        upper (float): score range maximum.
+        inverse (bool): whether to invert the score calculation process.
+
+    Returns:
+        float: score, from 0 to 1 (both included).
+    """
+    # Compute score, invert it (if specified) and normalize it:
+    return min(1, max(abs(
+        inverse - (min(value - lower, upper - lower) / (upper - lower))
+    ), 0))
 
 
 class Score(Formatter):
@@ -29,6 +113,10 @@ class Score(Formatter):
     be 1. This is useful for scores that are better when lower, like distance
     to end.
 
+    Each score keeps a reference to the area or tree that contains it, so
+    that modifying any of its attributes invalidates the cached scores of its
+    ancestors. A score is therefore expected to belong to a single parent.
+
     Attributes:
         name (str): score name.
         weight (float): score weight.
@@ -40,6 +128,11 @@ class Score(Formatter):
         score (float): score.
     """
 
+    __slots__ = (
+        "_name", "_weight", "_lower", "_upper", "_value", "_inverse",
+        "_parent"
+    )
+
     def __init__(
         self,
         name: str,
@@ -59,12 +152,51 @@ class Score(Formatter):
             inverse (bool, optional): whether to invert the score calculation
                 process. Defaults to False.
         """
+        self._parent: ScoreArea | ScoreTree | None = None
+
         self.name = name
         self.weight = weight
         self.score_range = score_range
         self.value = value
         self.inverse = inverse
 
+    @classmethod
+    def from_trusted(
+        cls,
+        name: str,
+        weight: float,
+        score_range: tuple[float, float],
+        value: float = 0.,
+        inverse: bool = False
+    ) -> Score:
+        """Create a Score instance without validating its attributes.
+
+        This constructor is meant for data coming from an already validated
+        source, since it skips all property setter checks and conversions.
+        Call validate on the resulting instance to check it afterwards.
+
+        Args:
+            name (str): score name.
+            weight (float): score weight.
+            score_range (tuple[float, float]): score range from minimum to
+                maximum.
+            value (float, optional): current value. Defaults to 0.
+            inverse (bool, optional): whether to invert the score calculation
+                process. Defaults to False.
+
+        Returns:
+            Score: score instance.
+        """
+        score = cls.__new__(cls)
+        score._parent = None
+        score._name = name
+        score._weight = weight
+        score._lower, score._upper = score_range
+        score._value = value
+        score._inverse = inverse
+
+        return score
+
     @property
     def name(self) -> str:
         """Get score name.
@@ -91,7 +223,11 @@ class Score(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._name = value
+        # Validation assigns every attribute again, which is not a change:
+        if self._parent is not None and value != self._name:
+            _restructure(self)
+
+        self._name: str = value
 
     @property
     def weight(self) -> float:
@@ -119,7 +255,13 @@ class Score(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._weight = float(value)
+        if self._parent is not None and value != self._weight:
+            _restructure(self)
+
+        self._weight: float = float(value)
+
+        if self._parent is not None:
+            self._parent._invalidate()
 
     @property
     def score_range(self) -> tuple[float, float]:
@@ -128,7 +270,7 @@ class Score(Formatter):
         Returns:
             tuple[float, float]: score range.
         """
-        return self._score_range
+        return (self._lower, self._upper)
 
     @score_range.setter
     def score_range(self, value: tuple[int | float, int | float]) -> None:
@@ -170,7 +312,13 @@ class Score(Formatter):
                 + f" {value[0]} >= {value[1]} instead"
             )
 
-        self._score_range = (float(value[0]), float(value[1]))
+        if self._parent is not None and value != (self._lower, self._upper):
+            _restructure(self)
+
+        # Bounds are stored separately to avoid keeping a tuple per score:
+        self._lower: float = float(value[0])
+        self._upper: float = float(value[1])
+        self._invalidate()
 
     @property
     def value(self) -> float:
@@ -199,6 +347,7 @@ class Score(Formatter):
             )
 
         self._value = float(value)
+        self._invalidate()
 
     @property
     def inverse(self) -> bool:
@@ -226,7 +375,11 @@ class Score(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._inverse = value
+        if self._parent is not None and value != self._inverse:
+            _restructure(self)
+
+        self._inverse: bool = value
+        self._invalidate()
 
     @property
     def score(self) -> float:
@@ -235,19 +388,45 @@ class Score(Formatter):
         Returns:
             float: score.
         """
-        # Compute score, invert it (if specified) and normalize it:
-        return min(1, max(abs(
-            self._inverse - (min(
-                self._value - self._score_range[0],
-                self._score_range[1] - self._score_range[0]
-            ) / (self._score_range[1] - self._score_range[0]))
-        ), 0))
+        return compute_score(
+            self._value,
+            self._lower,
+            self._upper,
+            self._inverse
+        )
+
+    def validate(self) -> None:
+        """Validate all score attributes.
 
-    def _render(self, indent: int = 1) -> str:
+        Raises:
+            TypeError: if any attribute has an invalid type.
+            ValueError: if any attribute has an invalid value.
+        """
+        self.name = self._name
+        self.weight = self._weight
+        self.score_range = (self._lower, self._upper)
+        self.value = self._value
+        self.inverse = self._inverse
+
+    def _invalidate(self) -> None:
+        """Invalidate the cached scores of the ancestors of the score."""
+        if self._parent is not None:
+            self._parent._invalidate()
+
+    def _render(
+        self,
+        indent: int = 1,
+        options: RenderOptions | None = None,
+        score: float | None = None
+    ) -> str:
         """Render formatted score.
 
         Args:
             indent (int, optional): indentation level. Defaults to 1.
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (options defined by the Formatter class).
+            score (float | None, optional): already computed score, if any.
+                Defaults to None (computed).
 
         Returns:
             str: formatted score.
@@ -260,12 +439,53 @@ class Score(Formatter):
 
         indent = max(0, indent)  # Value normalization.
 
-        return self.colorize(
-            f"{Style.DIM}{self.indent(indent)}{self!s}"
-            if Formatter.COLOR_ENABLED else f"{self.indent(indent)}{self!s}",
-            self.score
+        if options is None:
+            options = self.options()
+
+        if score is None:
+            score = self.score
+        text = f"{options.indent(indent)}{self._describe(score)}"
+
+        return options.colorize(
+            f"{Ansi.DIM}{text}" if options.colorized else text,
+            score
         )
 
+    def _iter_lines(
+        self,
+        indent: int = 1,
+        options: RenderOptions | None = None,
+        scores: dict[int, float] | None = None
+    ) -> Iterator[str]:
+        """Iterate over the formatted lines of the score.
+
+        Args:
+            indent (int, optional): indentation level. Defaults to 1.
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (options defined by the Formatter class).
+            scores (dict[int, float] | None, optional): already computed
+                leaf scores, indexed by leaf id, which are consumed once
+                rendered. Defaults to None.
+
+        Yields:
+            str: formatted line.
+        """
+        yield self._render(
+            indent, options,
+            None if scores is None else scores.pop(id(self), None)
+        )
+
+    def _describe(self, score: float) -> str:
+        """Get long representation of the score for a given score value.
+
+        Args:
+            score (float): score value.
+
+        Returns:
+            str: long representation of the score.
+        """
+        return f"{self.name} ({self.weight * 100:.2f}%): {score * 100:.2f}%"
+
     def __repr__(self) -> str:
         """Get short representation of the score.
 
@@ -280,9 +500,7 @@ class Score(Formatter):
         Returns:
             str: long representation of the score.
         """
-        return (
-            f"{self.name} ({self.weight * 100:.2f}%): {self.score * 100:.2f}%"
-        )
+        return self._describe(self.score)
 
 
 class ScoreArea(Formatter):
@@ -292,6 +510,10 @@ class ScoreArea(Formatter):
     used to group scores by level or category. It contains a name, a weight for
     ponderation and a list of scores or score areas.
 
+    The weighted score is cached and only recomputed after any of the items it
+    depends on is modified. Note that in-place modifications of the items list
+    are not tracked: the items attribute must be reassigned instead.
+
     Attributes:
         name (str): score area name.
         weight (float): score area weight.
@@ -300,6 +522,8 @@ class ScoreArea(Formatter):
         score (float): weighted score.
     """
 
+    __slots__ = ("_name", "_weight", "_items", "_parent", "_cached_score")
+
     def __init__(
         self,
         name: str,
@@ -314,10 +538,47 @@ class ScoreArea(Formatter):
             items (list[Score | ScoreArea]): score area items (can either be
                 Score or ScoreArea instances).
         """
+        self._parent: ScoreArea | ScoreTree | None = None
+        self._cached_score: float | None = None
+
         self.name = name
         self.weight = weight
         self.items = items
 
+    @classmethod
+    def from_trusted(
+        cls,
+        name: str,
+        weight: float,
+        items: list[Score | ScoreArea]
+    ) -> ScoreArea:
+        """Create a ScoreArea instance without validating its attributes.
+
+        This constructor is meant for data coming from an already validated
+        source, since it skips all property setter checks and conversions.
+        Call validate on the resulting instance to check it afterwards.
+
+        Args:
+            name (str): score area name.
+            weight (float): score area weight.
+            items (list[Score | ScoreArea]): score area items (can either be
+                Score or ScoreArea instances).
+
+        Returns:
+            ScoreArea: score area instance.
+        """
+        score_area = cls.__new__(cls)
+        score_area._parent = None
+        score_area._cached_score = None
+        score_area._name = name
+        score_area._weight = weight
+        score_area._items = items
+
+        for item in items:
+            item._parent = score_area
+
+        return score_area
+
     @property
     def name(self) -> str:
         """Get score area name.
@@ -344,7 +605,11 @@ class ScoreArea(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._name = value
+        # Validation assigns every attribute again, which is not a change:
+        if self._parent is not None and value != self._name:
+            _restructure(self)
+
+        self._name: str = value
 
     @property
     def weight(self) -> float:
@@ -372,7 +637,13 @@ class ScoreArea(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._weight = float(value)
+        if self._parent is not None and value != self._weight:
+            _restructure(self)
+
+        self._weight: float = float(value)
+
+        if self._parent is not None:
+            self._parent._invalidate()
 
     @property
     def items(self) -> list[Score | ScoreArea]:
@@ -387,6 +658,25 @@ class ScoreArea(Formatter):
     def items(self, value: list[Score | ScoreArea]) -> None:
         """Set score area items.
 
+        Args:
+            value (list[Score | ScoreArea]): score area items.
+
+        Raises:
+            TypeError: if value is not a list.
+            TypeError: if value elements are not Score or ScoreArea instances.
+            ValueError: if any element already belongs to another score area
+                or tree.
+        """
+        self._check_items(value)
+        _adopt(self, value)
+        self._items = value
+
+        self._invalidate()
+        _restructure(self)
+
+    def _check_items(self, value: list[Score | ScoreArea]) -> None:
+        """Check the type of a score area items list.
+
         Args:
             value (list[Score | ScoreArea]): score area items.
 
@@ -408,8 +698,6 @@ class ScoreArea(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._items = value
-
     @property
     def score(self) -> float:
         """Get weighted score.
@@ -417,13 +705,86 @@ class ScoreArea(Formatter):
         Returns:
             float: weighted score.
         """
-        return sum(item.score * item._weight for item in self.items)
+        if self._cached_score is None:
+            self._refresh()
+
+        return self._cached_score  # type: ignore[return-value]
+
+    def _refresh(self, scores: dict[int, float] | None = None) -> None:
+        """Recompute the invalid cached scores of the area and its items.
+
+        Args:
+            scores (dict[int, float] | None, optional): dictionary to store
+                the score of every evaluated leaf in, indexed by leaf id, so
+                that renders do not evaluate them again. Defaults to None.
+        """
+        # Only areas with an invalid cache need to be visited, and their
+        # items are always up to date by the time they are summed:
+        for area, _ in iter_postorder((self,), leaves=False, prune=_is_cached):
+            if not isinstance(area, ScoreArea):
+                continue
+
+            if scores is None:
+                area._cached_score = sum(
+                    item.score * item._weight for item in area._items
+                )
+                continue
+
+            total = 0.
+            for item in area._items:
+                score = item.score
+                if isinstance(item, Score):
+                    scores[id(item)] = score
+                total += score * item._weight
+
+            area._cached_score = total
+
+    def validate(self) -> None:
+        """Validate all score area attributes and items, recursively.
+
+        Raises:
+            TypeError: if any attribute has an invalid type.
+            ValueError: if any attribute has an invalid value.
+        """
+        # Items are type-checked by their parent before being visited:
+        for node, _ in iter_preorder((self,)):
+            if isinstance(node, ScoreArea):
+                node._validate_attributes()
+            else:
+                node.validate()
+
+    def _validate_attributes(self) -> None:
+        """Validate the score area attributes, without visiting its items.
+
+        Raises:
+            TypeError: if any attribute has an invalid type.
+        """
+        self.name = self._name
+        self.weight = self._weight
+        self._check_items(self._items)
+
+    def _invalidate(self) -> None:
+        """Invalidate the cached score of the area and its ancestors.
+
+        Propagation stops at the first node whose cache is already invalid,
+        since all of its ancestors are guaranteed to be invalid as well.
+        """
+        node: ScoreArea | ScoreTree | None = self
+        while node is not None and node._cached_score is not None:
+            node._cached_score = None
+            node = node._parent
 
-    def _render(self, indent: int = 1) -> str:
+    def _render(
+        self,
+        indent: int = 1,
+        options: RenderOptions | None = None
+    ) -> str:
         """Render formatted score area.
 
         Args:
             indent (int, optional): indentation level. Defaults to 1.
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (options defined by the Formatter class).
 
         Returns:
             str: formatted score area.
@@ -434,26 +795,70 @@ class ScoreArea(Formatter):
         if not isinstance(indent, int):
             raise TypeError("indent must be an integer")
 
+        return "\n".join(self._iter_lines(indent, options))
+
+    def _iter_lines(
+        self,
+        indent: int = 1,
+        options: RenderOptions | None = None,
+        scores: dict[int, float] | None = None
+    ) -> Iterator[str]:
+        """Iterate over the formatted lines of the score area.
+
+        Lines are generated while traversing the area, so memory usage does
+        not depend on the size of the rendered output. Area scores are read
+        from their caches, which are refreshed (once) by the first of them,
+        and the leaf scores computed while refreshing them are kept until
+        their lines are rendered, so every leaf is only evaluated once.
+
+        Args:
+            indent (int, optional): indentation level. Defaults to 1.
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (options defined by the Formatter class).
+            scores (dict[int, float] | None, optional): already computed
+                leaf scores, indexed by leaf id, which are consumed once
+                rendered. Defaults to None.
+
+        Yields:
+            str: formatted line.
+        """
         indent = max(0, indent)  # Value normalization.
 
-        return self.colorize(
-            (
-                Style.NORMAL
-                + f"{self.indent(indent)}{self.name}"
-                + f" ({self.weight * 100:.2f}%): {self.score * 100:.2f}%\n"
-                + "\n".join(
-                    item._render(indent + 1)
-                    for item in self.items
-                )
-            ) if Formatter.COLOR_ENABLED else (
-                f"{self.indent(indent)}{self.name}"
-                + f" ({self.weight * 100:.2f}%): {self.score * 100:.2f}%\n"
-                + "\n".join(
-                    item._render(indent + 1)
-                    for item in self.items
-                )
-            ), self.score
-        )
+        if options is None:
+            options = self.options()
+
+        if scores is None:
+            scores = {}
+
+        for node, depth in iter_preorder((self,), indent):
+            if not isinstance(node, ScoreArea):
+                yield node._render(depth, options, scores.pop(id(node), None))
+                continue
+
+            if node._cached_score is None:
+                node._refresh(scores)
+
+            score = node.score
+            text = f"{options.indent(depth)}{node._describe(score)}"
+            yield options.colorize(
+                Ansi.NORMAL + text if options.colorized else text,
+                score
+            )
+
+            # Empty areas are followed by an empty line:
+            if not node._items:
+                yield ""
+
+    def _describe(self, score: float) -> str:
+        """Get long representation of the area header for a given score.
+
+        Args:
+            score (float): score value.
+
+        Returns:
+            str: long representation of the area header.
+        """
+        return f"{self.name} ({self.weight * 100:.2f}%): {score * 100:.2f}%"
 
     def __repr__(self) -> str:
         """Get short representation of the score area.
@@ -469,8 +874,27 @@ class ScoreArea(Formatter):
         Returns:
             str: long representation of the score area.
         """
-        return (
-            f"{self.name} ({self.weight * 100:.2f}%):"
-            + f" {self.score * 100:.2f}%\n"
-            + "\n".join(f"{' ' * 4}{item!s}" for item in self.items)
-        )
+        # Only the first line of every item is indented:
+        lines = [self._describe(self.score)]
+        for node, _ in iter_preorder(self._items):
+            lines.append(f"{' ' * 4}{node._describe(node.score)}")
+
+            if isinstance(node, ScoreArea) and not node._items:
+                lines.append("")
+
+        if not self._items:
+            lines.append("")
+
+        return "\n".join(lines)
+
+
+def _is_cached(area: ScoreArea) -> bool:
+    """Check whether the score of an area is cached.
+
+    Args:
+        area (ScoreArea): score area to check.
+
+    Returns:
+        bool: whether the score of the area is cached.
+    """
+    return area._cached_score is not None
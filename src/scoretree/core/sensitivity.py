@@ -0,0 +1,201 @@
+"""Sensitivity analysis module.
+
+This module contains the LeafSensitivity class, which holds the effective
+weight, the contribution and the derivative of a leaf with respect to the
+total score of a score tree, and the function used to compute them for all
+leaves in a single traversal.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .schema import ScoreSchema
+from .scores import Score
+from .traversal import iter_preorder
+
+if TYPE_CHECKING:
+    from .tree import ScoreTree
+
+
+class LeafSensitivity:
+    """Sensitivity of the total score of a tree to one of its leaves.
+
+    Attributes:
+        path (str): leaf path, as defined by ScoreSchema.
+        score (float): leaf score.
+        weight (float): effective weight of the leaf, that is, the product of
+            the weights along its path.
+        contribution (float): weighted score added by the leaf to the total.
+        derivative (float): partial derivative of the total score with
+            respect to the leaf value.
+    """
+
+    __slots__ = ("_path", "_score", "_weight", "_derivative")
+
+    def __init__(
+        self,
+        path: str,
+        score: float,
+        weight: float,
+        derivative: float
+    ) -> None:
+        """Initialize a LeafSensitivity instance.
+
+        Args:
+            path (str): leaf path, as defined by ScoreSchema.
+            score (float): leaf score.
+            weight (float): effective weight of the leaf.
+            derivative (float): partial derivative of the total score with
+                respect to the leaf value.
+        """
+        self._path = path
+        self._score = score
+        self._weight = weight
+        self._derivative = derivative
+
+    @property
+    def path(self) -> str:
+        """Get leaf path.
+
+        Returns:
+            str: leaf path.
+        """
+        return self._path
+
+    @property
+    def score(self) -> float:
+        """Get leaf score.
+
+        Returns:
+            float: leaf score.
+        """
+        return self._score
+
+    @property
+    def weight(self) -> float:
+        """Get effective leaf weight.
+
+        Returns:
+            float: product of the weights along the leaf path.
+        """
+        return self._weight
+
+    @property
+    def contribution(self) -> float:
+        """Get leaf contribution.
+
+        Returns:
+            float: weighted score added by the leaf to the total.
+        """
+        return self._score * self._weight
+
+    @property
+    def derivative(self) -> float:
+        """Get partial derivative of the total score.
+
+        Returns:
+            float: partial derivative of the total score with respect to the
+                leaf value.
+        """
+        return self._derivative
+
+    def __repr__(self) -> str:
+        """Get short representation of the leaf sensitivity.
+
+        Returns:
+            str: short representation of the leaf sensitivity.
+        """
+        return (
+            f"LeafSensitivity({self._path}, weight={self._weight},"
+            + f" contribution={self.contribution},"
+            + f" derivative={self._derivative})"
+        )
+
+
+def score_derivative(
+    value: float,
+    lower: float,
+    upper: float,
+    inverse: bool
+) -> float:
+    """Compute the derivative of a score with respect to its value.
+
+    Scores are piecewise-linear functions of their values (see
+    compute_score), so the derivative is constant between the breakpoints
+    given by the score range, the inverse flag and clamping. At breakpoints,
+    the right-hand derivative (rate of change when the value increases) is
+    used.
+
+    Args:
+        value (float): current value.
+        lower (float): score range minimum.
+        upper (float): score range maximum.
+        inverse (bool): whether the score calculation process is inverted.
+
+    Returns:
+        float: derivative of the score with respect to the value.
+    """
+    span = upper - lower
+
+    # Values above the upper bound are capped, so they do not change scores:
+    if value >= upper:
+        return 0.0
+
+    ratio = (value - lower) / span
+    slope = 1 / span
+
+    # The absolute value mirrors the slope on its negative side:
+    base = 1 - ratio if inverse else ratio
+    if inverse:
+        slope = -slope
+    if base < 0 or (base == 0 and slope < 0):
+        base, slope = -base, -slope
+
+    # Scores are clamped to 1:
+    if base > 1 or (base == 1 and slope > 0):
+        return 0.0
+
+    return slope
+
+
+def sensitivity(tree: ScoreTree) -> list[LeafSensitivity]:
+    """Compute the sensitivity of the total score of a tree to every leaf.
+
+    All leaves are analyzed in a single pre-order traversal, so the cost is
+    linear in the number of nodes.
+
+    Args:
+        tree (ScoreTree): score tree to analyze.
+
+    Returns:
+        list[LeafSensitivity]: sensitivity of every leaf, in pre-order.
+    """
+    separator = ScoreSchema.SEPARATOR
+
+    # Effective weight and path of the last visited node of every depth:
+    weights: list[float] = []
+    paths: list[str] = []
+
+    leaves = []
+    for node, depth in iter_preorder(tree.items):
+        del weights[depth:], paths[depth:]
+
+        weight = node.weight * weights[-1] if depth else node.weight
+        path = f"{paths[-1]}{separator}{node.name}" if depth else node.name
+
+        if isinstance(node, Score):
+            leaves.append(LeafSensitivity(
+                path, node.score, weight, weight * score_derivative(
+                    node._value, node._lower, node._upper, node._inverse
+                )
+            ))
+        else:
+            weights.append(weight)
+            paths.append(path)
+
+    return leaves
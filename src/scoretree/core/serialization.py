@@ -0,0 +1,781 @@
+"""Serialization module.
+
+This module contains the functions used to convert score trees from and to
+dictionaries and JSON documents, and to store them in a compact binary format.
+
+JSON documents are written and read incrementally, node by node, so neither
+the whole document nor its parsed representation are ever held in memory
+along with the score tree. Nodes use the same fields as the Score and
+ScoreArea constructors:
+
+    {"colorized": true, "items": [
+        {"name": "Area", "weight": 1, "items": [
+            {"name": "Score", "weight": 1, "score_range": [0, 10],
+             "value": 5, "inverse": false}
+        ]}
+    ]}
+
+In the binary format, all sections are 8-byte aligned and little-endian, so
+every numeric array is converted to a list of Python numbers in a single step,
+by casting its slice of the serialized buffer, instead of being unpacked
+element by element.
+
+Binary format layout:
+    - Header: magic, version, flags, node count, leaf count and name bytes.
+    - Node item counts (int64, -1 for scores), in pre-order.
+    - Node weights (float64), in pre-order.
+    - Node name lengths (int64, UTF-8 bytes), in pre-order.
+    - Leaf score range minimums (float64), in pre-order.
+    - Leaf score range maximums (float64), in pre-order.
+    - Leaf values (float64), in pre-order.
+    - Leaf inverse operation flags (uint8), in pre-order.
+    - Node names (UTF-8), in pre-order.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from math import isfinite
+from os import PathLike
+from typing import IO, Any
+
+from .scores import Score, ScoreArea
+from .traversal import iter_preorder
+from .tree import ScoreTree
+
+MAGIC = b"SCTR"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQQ")
+_COLORIZED = 1
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = "0123456789+-.eE"
+_DECODER = json.JSONDecoder()
+
+
+def _pad(size: int) -> int:
+    """Round a section size up to the format alignment.
+
+    Args:
+        size (int): section size, in bytes.
+
+    Returns:
+        int: aligned section size, in bytes.
+    """
+    return (size + 7) & ~7
+
+
+def _to_bytes(values: array) -> bytes:
+    """Convert an array to aligned little-endian bytes.
+
+    Args:
+        values (array): array to convert.
+
+    Returns:
+        bytes: aligned little-endian bytes.
+    """
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+
+    data = values.tobytes()
+
+    return data + b"\x00" * (_pad(len(data)) - len(data))
+
+
+def dumps(tree: ScoreTree) -> bytes:
+    """Serialize a score tree to bytes.
+
+    Args:
+        tree (ScoreTree): score tree to serialize.
+
+    Returns:
+        bytes: serialized score tree.
+    """
+    counts = array("q")
+    weights = array("d")
+    lengths = array("q")
+    lower = array("d")
+    upper = array("d")
+    values = array("d")
+    inverse = array("B")
+    names = []
+
+    for node, _ in iter_preorder(tree.items):
+        name = node.name.encode("utf-8")
+        names.append(name)
+        lengths.append(len(name))
+        weights.append(node.weight)
+
+        if isinstance(node, ScoreArea):
+            counts.append(len(node.items))
+        else:
+            counts.append(-1)
+            lower.append(node.score_range[0])
+            upper.append(node.score_range[1])
+            values.append(node.value)
+            inverse.append(node.inverse)
+
+    blob = b"".join(names)
+
+    return b"".join((
+        _HEADER.pack(
+            MAGIC, VERSION, _COLORIZED if tree.colorized else 0,
+            len(counts), len(values), len(blob)
+        ),
+        _to_bytes(counts),
+        _to_bytes(weights),
+        _to_bytes(lengths),
+        _to_bytes(lower),
+        _to_bytes(upper),
+        _to_bytes(values),
+        _to_bytes(inverse),
+        blob
+    ))
+
+
+def loads(data: bytes | bytearray | memoryview) -> ScoreTree:
+    """Deserialize a score tree from bytes.
+
+    Nodes are built through the trusted constructors, since their attributes
+    were validated before being serialized, but the tree structure (item and
+    leaf counts, name lengths), its weights and the score ranges and values
+    of its leaves are checked, so that corrupt data is rejected.
+
+    Args:
+        data (bytes | bytearray | memoryview): serialized score tree. Any
+            other object supporting the buffer protocol is accepted too.
+
+    Returns:
+        ScoreTree: deserialized score tree.
+
+    Raises:
+        ValueError: if data is not a valid serialized score tree.
+    """
+    with memoryview(data) as view:
+        if len(view) < _HEADER.size:
+            raise ValueError("invalid score tree data: truncated header")
+
+        magic, version, flags, nodes, leaves, size = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("invalid score tree data: wrong magic number")
+
+        if version != VERSION:
+            raise ValueError(
+                f"unsupported score tree data version {version}"
+                + f" (expected {VERSION})"
+            )
+
+        offset = _HEADER.size
+        expected = (
+            offset + 24 * nodes + 24 * leaves + _pad(leaves) + size
+        )
+        if len(view) < expected:
+            raise ValueError("invalid score tree data: truncated sections")
+
+        def read(fmt: str, count: int) -> list:
+            """Read an array section.
+
+            Args:
+                fmt (str): array type code.
+                count (int): number of elements.
+
+            Returns:
+                list: section elements.
+            """
+            nonlocal offset
+
+            stop = offset + count * struct.calcsize(fmt)
+            if sys.byteorder == "big":  # pragma: no cover
+                values = array(fmt, view[offset:stop])
+                values.byteswap()
+                result = values.tolist()
+            else:
+                with view[offset:stop] as section:
+                    with section.cast(fmt) as cast:  # type: ignore
+                        result = cast.tolist()
+
+            offset = _pad(stop)
+
+            return result
+
+        counts = read("q", nodes)
+        weights = read("d", nodes)
+        lengths = read("q", nodes)
+        lower = read("d", leaves)
+        upper = read("d", leaves)
+        values = read("d", leaves)
+        inverse = read("B", leaves)
+        blob = view[offset:offset + size].tobytes()
+
+    if min(lengths, default=0) < 0 or sum(lengths) != size:
+        raise ValueError("invalid score tree data: wrong name lengths")
+
+    if sum(count < 0 for count in counts) != leaves:
+        raise ValueError("invalid score tree data: wrong leaf count")
+
+    for leaf, (minimum, maximum, value) in enumerate(
+        zip(lower, upper, values)
+    ):
+        if not (isfinite(minimum) and isfinite(maximum) and minimum < maximum):
+            raise ValueError(
+                f"invalid score tree data: leaf {leaf} has an invalid score"
+                + f" range ({minimum}, {maximum})"
+            )
+
+        if not isfinite(value):
+            raise ValueError(
+                f"invalid score tree data: leaf {leaf} has a non-finite"
+                + f" value ({value})"
+            )
+
+    names = []
+    start = 0
+    for length in lengths:
+        names.append(blob[start:start + length].decode("utf-8"))
+        start += length
+
+    # Reverse pre-order leaves the first item of every area on top:
+    stack: list[Score | ScoreArea] = []
+    leaf = leaves
+    for index in range(nodes - 1, -1, -1):
+        count = counts[index]
+        if count < 0:
+            leaf -= 1
+            stack.append(Score.from_trusted(
+                names[index], weights[index], (lower[leaf], upper[leaf]),
+                values[leaf], bool(inverse[leaf])
+            ))
+        elif count > len(stack):
+            raise ValueError(
+                f"invalid score tree data: node {index} has {count} items"
+                + f" but only {len(stack)} nodes follow it"
+            )
+        else:
+            stack.append(ScoreArea.from_trusted(
+                names[index], weights[index],
+                [stack.pop() for _ in range(count)]
+            ))
+
+    stack.reverse()
+    tree = ScoreTree.from_trusted(stack, bool(flags & _COLORIZED))
+
+    try:
+        ScoreTree.check_weights(tree)
+    except ValueError as exc:
+        raise ValueError(f"invalid score tree data: {exc}") from exc
+
+    return tree
+
+
+def dump(tree: ScoreTree, path: str | PathLike[str]) -> None:
+    """Serialize a score tree to a file.
+
+    Args:
+        tree (ScoreTree): score tree to serialize.
+        path (str | PathLike[str]): destination file path.
+    """
+    with open(path, "wb") as file:
+        file.write(dumps(tree))
+
+
+def load(path: str | PathLike[str]) -> ScoreTree:
+    """Deserialize a score tree from a file.
+
+    Args:
+        path (str | PathLike[str]): source file path.
+
+    Returns:
+        ScoreTree: deserialized score tree.
+
+    Raises:
+        ValueError: if the file is not a valid serialized score tree.
+    """
+    with open(path, "rb") as file:
+        return loads(file.read())
+
+
+def _node_to_dict(node: Score | ScoreArea) -> dict[str, Any]:
+    """Convert a node to a dictionary, excluding area items.
+
+    Args:
+        node (Score | ScoreArea): node to convert.
+
+    Returns:
+        dict[str, Any]: node fields.
+    """
+    if isinstance(node, ScoreArea):
+        return {"name": node.name, "weight": node.weight, "items": []}
+
+    return {
+        "name": node.name,
+        "weight": node.weight,
+        "score_range": list(node.score_range),
+        "value": node.value,
+        "inverse": node.inverse
+    }
+
+
+def _item_path(parent: str, index: int) -> str:
+    """Get the path of a node within a score tree document.
+
+    Args:
+        parent (str): path of the parent node (empty for the document).
+        index (int): position of the node within the parent items.
+
+    Returns:
+        str: node path, such as "items[0].items[2]".
+    """
+    return f"{parent}.items[{index}]" if parent else f"items[{index}]"
+
+
+def _invalid_node(path: str, expected: str, value: Any) -> ValueError:
+    """Build the error raised for a malformed score tree document node.
+
+    Args:
+        path (str): node path.
+        expected (str): expected kind of value.
+        value (Any): actual value.
+
+    Returns:
+        ValueError: error describing the malformed node.
+    """
+    return ValueError(
+        f"invalid score tree node at {path}: expected {expected} but got"
+        + f" {type(value).__name__} instead"
+    )
+
+
+def _node_from_dict(
+    data: Mapping[str, Any],
+    items: list[Score | ScoreArea] | None,
+    path: str = ""
+) -> Score | ScoreArea:
+    """Build a node from its fields.
+
+    Args:
+        data (Mapping[str, Any]): node fields.
+        items (list[Score | ScoreArea] | None): already built area items, or
+            None if the node is a score.
+        path (str, optional): node path, used in error messages. Defaults
+            to "" (unknown).
+
+    Returns:
+        Score | ScoreArea: node.
+
+    Raises:
+        ValueError: if a required field is missing.
+        TypeError: if a field has an invalid type.
+        ValueError: if a field has an invalid value.
+    """
+    try:
+        if items is not None:
+            return ScoreArea(data["name"], data["weight"], items)
+
+        score_range = data["score_range"]
+        return Score(
+            data["name"],
+            data["weight"],
+            tuple(score_range) if isinstance(score_range, list)
+            else score_range,
+            data.get("value", 0),
+            data.get("inverse", False)
+        )
+
+    except KeyError as exc:
+        raise ValueError(
+            f"missing field {exc} in score tree node"
+            + (f" at {path}" if path else "") + f" {dict(data)}"
+        ) from None
+
+
+def to_dict(tree: ScoreTree) -> dict[str, Any]:
+    """Convert a score tree to a dictionary.
+
+    Args:
+        tree (ScoreTree): score tree to convert.
+
+    Returns:
+        dict[str, Any]: score tree dictionary.
+    """
+    result: dict[str, Any] = {"colorized": tree.colorized, "items": []}
+
+    # Each node is appended to the items of its parent, tracked by depth:
+    parents = [result["items"]]
+    for node, depth in iter_preorder(tree.items):
+        del parents[depth + 1:]
+        data = _node_to_dict(node)
+        parents[depth].append(data)
+
+        if isinstance(node, ScoreArea):
+            parents.append(data["items"])
+
+    return result
+
+
+def from_dict(data: Mapping[str, Any]) -> ScoreTree:
+    """Build a score tree from a dictionary.
+
+    Args:
+        data (Mapping[str, Any]): score tree dictionary.
+
+    Returns:
+        ScoreTree: score tree.
+
+    Raises:
+        ValueError: if the dictionary or any node is malformed (not a
+            mapping, or with items that are not a list).
+        ValueError: if a required field is missing.
+        TypeError: if a field has an invalid type.
+        ValueError: if a field has an invalid value.
+    """
+    if not isinstance(data, Mapping):
+        raise ValueError(
+            "invalid score tree: expected a mapping but got"
+            + f" {type(data).__name__} instead"
+        )
+
+    items = data.get("items", [])
+    if not isinstance(items, list):
+        raise _invalid_node("items", "a list", items)
+
+    # Post-order construction, so that area items are built first:
+    built: list[Score | ScoreArea] = []
+    stack: list[tuple[Any, str, bool]] = [
+        (item, _item_path("", index), False)
+        for index, item in reversed(list(enumerate(items)))
+    ]
+    while stack:
+        node, path, expanded = stack.pop()
+        if not isinstance(node, Mapping):
+            raise _invalid_node(path, "a mapping", node)
+
+        items = node.get("items")
+        if items is None:
+            built.append(_node_from_dict(node, None, path))
+        elif expanded:
+            start = len(built) - len(items)
+            built[start:] = [_node_from_dict(node, built[start:], path)]
+        elif not isinstance(items, list):
+            raise _invalid_node(f"{path}.items", "a list", items)
+        else:
+            stack.append((node, path, True))
+            stack.extend(
+                (item, _item_path(path, index), False)
+                for index, item in reversed(list(enumerate(items)))
+            )
+
+    return ScoreTree(built, data.get("colorized", True))
+
+
+def dump_json(tree: ScoreTree, fp: IO[str]) -> None:
+    """Write a score tree to a text stream as a JSON document.
+
+    The document is written node by node while traversing the tree.
+
+    Args:
+        tree (ScoreTree): score tree to write.
+        fp (IO[str]): writable text stream.
+    """
+    write = fp.write
+    write(f'{{"colorized": {json.dumps(tree.colorized)}, "items": [')
+
+    depth_open = 0
+    separate = False
+    for node, depth in iter_preorder(tree.items):
+        # Close the areas whose items have all been written:
+        while depth_open > depth:
+            write("]}")
+            depth_open -= 1
+            separate = True
+
+        if separate:
+            write(", ")
+
+        if isinstance(node, ScoreArea):
+            write(json.dumps(_node_to_dict(node))[:-2])
+            depth_open += 1
+            separate = False
+        else:
+            write(json.dumps(_node_to_dict(node)))
+            separate = True
+
+    write("]}" * depth_open + "]}")
+
+
+class _JSONReader:
+    """Incremental JSON reader.
+
+    This class reads a text stream in chunks and provides the primitives
+    required to parse a JSON document token by token, decoding scalar values
+    via the standard JSON decoder.
+    """
+
+    def __init__(self, fp: IO[str], chunk_size: int) -> None:
+        """Initialize a _JSONReader instance.
+
+        Args:
+            fp (IO[str]): readable text stream.
+            chunk_size (int): number of characters read at once.
+        """
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk of the stream into the buffer.
+
+        Returns:
+            bool: whether any characters were read.
+        """
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it.
+
+        Returns:
+            str: next character, or an empty string at the end of the stream.
+        """
+        while True:
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+
+            self._position = position
+            if position < len(buffer):
+                return buffer[position]
+
+            if not self._fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-whitespace character.
+
+        Args:
+            characters (str): allowed characters.
+
+        Returns:
+            str: consumed character.
+
+        Raises:
+            ValueError: if the next character is not allowed.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(
+                "invalid score tree document: expected one of"
+                + f" {characters!r} but got {character or 'end of data'!r}"
+            )
+
+        self._position += 1
+
+        return character
+
+    def value(self) -> Any:
+        """Decode the next JSON value.
+
+        Returns:
+            Any: decoded value.
+
+        Raises:
+            ValueError: if the value is not valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+
+                raise ValueError(
+                    f"invalid score tree document: {exc}"
+                ) from exc
+
+            # Numbers reaching the end of the buffer might be incomplete:
+            if (
+                not self._eof
+                and not self._buffer[end:].lstrip(_NUMBER)
+                and self._fill()
+            ):
+                continue
+
+            self._position = end
+
+            return value
+
+    def node(self) -> Score | ScoreArea | None:
+        """Decode the next node if it is already fully buffered.
+
+        Returns:
+            Score | ScoreArea | None: decoded node, or None if the node
+                exceeds the buffer, is too deeply nested for the standard
+                decoder or is invalid, and must be parsed token by token.
+        """
+        self.peek()
+        try:
+            node, end = _NODE_DECODER.raw_decode(self._buffer, self._position)
+        except (ValueError, TypeError, RecursionError):
+            # Invalid nodes are parsed again token by token, which reports
+            # errors along with the path of the offending node:
+            return None
+
+        if not isinstance(node, (Score, ScoreArea)):
+            return None
+
+        self._position = end
+
+        return node
+
+
+def _node_hook(data: dict[str, Any]) -> Score | ScoreArea:
+    """Build a node from its decoded JSON object.
+
+    Args:
+        data (dict[str, Any]): node fields, with already built area items.
+
+    Returns:
+        Score | ScoreArea: node.
+
+    Raises:
+        ValueError: if the items of the node are not a list of nodes.
+    """
+    items = data.get("items")
+    if items is not None and not (
+        isinstance(items, list)
+        and all(isinstance(item, (Score, ScoreArea)) for item in items)
+    ):
+        raise ValueError("invalid score tree node items")
+
+    return _node_from_dict(data, items)
+
+
+_NODE_DECODER = json.JSONDecoder(object_hook=_node_hook)
+
+
+def load_json(fp: IO[str], chunk_size: int = 65536) -> ScoreTree:
+    """Read a score tree from a text stream containing a JSON document.
+
+    The document is parsed incrementally and every node is built as soon as
+    its JSON object ends, so only the fields of the nodes being parsed (and
+    the read buffer) are kept in memory besides the score tree. Nodes that
+    fit in the read buffer are decoded at once.
+
+    Args:
+        fp (IO[str]): readable text stream.
+        chunk_size (int, optional): number of characters read at once.
+            Defaults to 65536.
+
+    Returns:
+        ScoreTree: score tree.
+
+    Raises:
+        ValueError: if the document is not a valid score tree document.
+        ValueError: if any node is malformed (not an object, or with items
+            that are not an array).
+        TypeError: if a field has an invalid type.
+    """
+    reader = _JSONReader(fp, chunk_size)
+
+    # Every frame holds the fields and items of an open object (the first
+    # one being the document itself) and whether its items array is open:
+    frames: list[tuple[dict[str, Any], list[Score | ScoreArea] | None]] = []
+    in_items: list[bool] = []
+    paths: list[str] = []
+
+    # Position within the current object or array: right after its opening
+    # character ("open"), after a comma ("comma") or after a member ("member"):
+    reader.expect("{")
+    frames.append(({}, None))
+    in_items.append(False)
+    paths.append("")
+    state = "open"
+
+    while True:
+        fields, items = frames[-1]
+        closing = "]" if in_items[-1] else "}"
+
+        if state != "comma" and reader.peek() == closing:
+            reader.expect(closing)
+            state = "member"
+
+            if in_items[-1]:
+                in_items[-1] = False
+                continue
+
+            frames.pop()
+            in_items.pop()
+            path = paths.pop()
+            if not frames:
+                if reader.peek():
+                    raise ValueError("invalid score tree document: extra data")
+
+                return ScoreTree(items or [], fields.get("colorized", True))
+
+            frames[-1][1].append(  # type: ignore[union-attr]
+                _node_from_dict(fields, items, path)
+            )
+            continue
+
+        if state == "member":
+            reader.expect(",")
+            state = "comma"
+            continue
+
+        state = "open"
+        if in_items[-1]:
+            # Small nodes are decoded at once, and large ones incrementally:
+            node = reader.node()
+            if node is not None:
+                items.append(node)  # type: ignore[union-attr]
+                state = "member"
+                continue
+
+            path = _item_path(paths[-1], len(items))  # type: ignore[arg-type]
+            if reader.peek() != "{":
+                raise _invalid_node(path, "an object", reader.value())
+
+            reader.expect("{")
+            frames.append(({}, None))
+            in_items.append(False)
+            paths.append(path)
+            continue
+
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(
+                f"invalid score tree document: invalid key {key!r}"
+            )
+
+        reader.expect(":")
+        if key == "items":
+            if reader.peek() != "[":
+                raise _invalid_node(
+                    f"{paths[-1]}.items" if paths[-1] else "items",
+                    "an array", reader.value()
+                )
+
+            reader.expect("[")
+            frames[-1] = (fields, [])
+            in_items[-1] = True
+        else:
+            fields[key] = reader.value()
+            state = "member"
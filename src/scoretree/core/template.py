@@ -0,0 +1,280 @@
+"""Score template module.
+
+This module contains the ScoreTemplate class, which compiles the structure of
+a score tree into a flat, array-backed representation that allows evaluating
+the scores of many candidates sharing the same tree shape in a single
+vectorized operation.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "ScoreTemplate requires NumPy, which can be installed via"
+        + " \"python -m pip install scoretree[numpy]\""
+    ) from exc
+
+from .schema import ScoreSchema
+from .scores import Score
+from .traversal import iter_preorder
+
+if TYPE_CHECKING:
+    from .tree import ScoreTree
+
+
+class ScoreTemplate:
+    """Array-backed score tree template.
+
+    This class flattens the structure of a score tree into NumPy arrays: leaf
+    score ranges, inverse flags and effective weights (the product of the
+    weights along the path from the tree to each leaf). Leaves are stored in
+    pre-order, so the leaves of any score area are contiguous, which allows
+    computing per-area subtotals with a single dot product per area.
+
+    Values are never stored in the template, so a single instance can be used
+    to evaluate any number of candidates sharing the same tree shape.
+
+    Attributes:
+        schema (ScoreSchema): compiled score schema.
+        leaves (tuple[str, ...]): leaf paths, in evaluation order.
+        areas (tuple[str, ...]): score area paths, in pre-order.
+        lower (np.ndarray): leaf score range lower bounds.
+        upper (np.ndarray): leaf score range upper bounds.
+        inverse (np.ndarray): leaf inverse operation flags.
+        weights (np.ndarray): leaf effective weights.
+    """
+
+    __slots__ = (
+        "_schema", "_leaves", "_lower", "_upper", "_inverse", "_weights",
+        "_areas", "_spans"
+    )
+
+    def __init__(self, schema: ScoreSchema | ScoreTree) -> None:
+        """Initialize a ScoreTemplate instance.
+
+        Args:
+            schema (ScoreSchema | ScoreTree): score schema to compile. If a
+                score tree is provided, its schema is built first. Leaf values
+                are ignored.
+        """
+        if not isinstance(schema, ScoreSchema):
+            schema = ScoreSchema(schema)
+
+        weights = schema._weights
+        parents = schema._parents
+
+        # Leaf offset of every area (leaves of an area are contiguous):
+        starts: dict[int, int] = {}
+        count = 0
+        for index, range_ in enumerate(schema._ranges):
+            if range_ is None:
+                starts[index] = count
+            else:
+                count += 1
+
+        # Weight of every leaf relative to the tree and to each ancestor:
+        effective: list[float] = []
+        relatives: dict[int, list[float]] = {
+            index: [] for index in schema._areas
+        }
+        for leaf in schema._leaves:
+            relative = weights[leaf]
+            parent = parents[leaf]
+            while parent >= 0:
+                relatives[parent].append(relative)
+                relative *= weights[parent]
+                parent = parents[parent]
+
+            effective.append(relative)
+
+        ranges = [schema._ranges[leaf] for leaf in schema._leaves]
+
+        self._schema = schema
+        self._leaves = schema.leaves
+        self._lower = np.array(
+            [range_[0] for range_ in ranges],  # type: ignore[index]
+            dtype=np.float64
+        )
+        self._upper = np.array(
+            [range_[1] for range_ in ranges],  # type: ignore[index]
+            dtype=np.float64
+        )
+        self._inverse = np.array(
+            [schema._inverse[leaf] for leaf in schema._leaves], dtype=bool
+        )
+        self._weights = np.array(effective, dtype=np.float64)
+        self._areas = tuple(schema._paths[index] for index in schema._areas)
+        self._spans = tuple(
+            (
+                starts[index],
+                starts[index] + len(relatives[index]),
+                np.array(relatives[index], dtype=np.float64)
+            ) for index in schema._areas
+        )
+
+    @property
+    def schema(self) -> ScoreSchema:
+        """Get compiled score schema.
+
+        Returns:
+            ScoreSchema: compiled score schema.
+        """
+        return self._schema
+
+    @property
+    def leaves(self) -> tuple[str, ...]:
+        """Get leaf paths.
+
+        Returns:
+            tuple[str, ...]: leaf paths, in evaluation order.
+        """
+        return self._leaves
+
+    @property
+    def areas(self) -> tuple[str, ...]:
+        """Get score area paths.
+
+        Returns:
+            tuple[str, ...]: score area paths, in pre-order.
+        """
+        return self._areas
+
+    @property
+    def lower(self) -> np.ndarray:
+        """Get leaf score range lower bounds.
+
+        Returns:
+            np.ndarray: leaf score range lower bounds.
+        """
+        return self._lower
+
+    @property
+    def upper(self) -> np.ndarray:
+        """Get leaf score range upper bounds.
+
+        Returns:
+            np.ndarray: leaf score range upper bounds.
+        """
+        return self._upper
+
+    @property
+    def inverse(self) -> np.ndarray:
+        """Get leaf inverse operation flags.
+
+        Returns:
+            np.ndarray: leaf inverse operation flags.
+        """
+        return self._inverse
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Get leaf effective weights.
+
+        Returns:
+            np.ndarray: leaf effective weights.
+        """
+        return self._weights
+
+    def values(self, tree: ScoreTree) -> np.ndarray:
+        """Extract the leaf values of a score tree with the template shape.
+
+        Args:
+            tree (ScoreTree): score tree to extract the values from.
+
+        Returns:
+            np.ndarray: leaf values, in evaluation order.
+
+        Raises:
+            ValueError: if the tree leaf count does not match the template.
+        """
+        values = [
+            node.value for node, _ in iter_preorder(tree.items)
+            if isinstance(node, Score)
+        ]
+
+        if len(values) != len(self._leaves):
+            raise ValueError(
+                f"expected {len(self._leaves)} leaves for"
+                + f" {self.__class__.__name__}.values but got"
+                + f" {len(values)} instead"
+            )
+
+        return np.array(values, dtype=np.float64)
+
+    def leaf_scores(self, values: np.ndarray) -> np.ndarray:
+        """Compute the leaf scores of a set of candidates.
+
+        Args:
+            values (np.ndarray): leaf values, with shape (M,) for a single
+                candidate or (N, M) for N candidates.
+
+        Returns:
+            np.ndarray: leaf scores, with the same shape as values.
+
+        Raises:
+            ValueError: if the last dimension of values does not match the
+                template leaf count.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim not in (1, 2) or values.shape[-1] != len(self._leaves):
+            raise ValueError(
+                f"expected shape (N, {len(self._leaves)}) for"
+                + f" {self.__class__.__name__} values but got"
+                + f" {values.shape} instead"
+            )
+
+        # Same computation as Score.score, applied element-wise:
+        span = self._upper - self._lower
+        return np.clip(np.abs(
+            self._inverse - np.minimum(values - self._lower, span) / span
+        ), 0, 1)
+
+    def evaluate(
+        self,
+        values: np.ndarray,
+        subtotals: bool = False
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Compute the total scores of a set of candidates.
+
+        Args:
+            values (np.ndarray): leaf values, with shape (M,) for a single
+                candidate or (N, M) for N candidates.
+            subtotals (bool, optional): whether to also return the score of
+                every score area (see the areas attribute for their order).
+                Defaults to False.
+
+        Returns:
+            np.ndarray | tuple[np.ndarray, np.ndarray]: total scores, with
+                shape () or (N,), optionally followed by area scores, with
+                shape (A,) or (N, A).
+        """
+        scores = self.leaf_scores(values)
+        totals = scores @ self._weights
+
+        if not subtotals:
+            return totals
+
+        areas = np.empty(scores.shape[:-1] + (len(self._areas),))
+        for index, (start, stop, relative) in enumerate(self._spans):
+            areas[..., index] = scores[..., start:stop] @ relative
+
+        return totals, areas
+
+    def __repr__(self) -> str:
+        """Get short string representation of the score template.
+
+        Returns:
+            str: short string representation of the score template.
+        """
+        return (
+            f"<ScoreTemplate with {len(self._leaves)} leaves and"
+            + f" {len(self._areas)} areas>"
+        )
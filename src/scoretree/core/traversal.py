@@ -0,0 +1,93 @@
+"""Traversal module.
+
+This module contains the explicit-stack traversal engine shared by score
+evaluation, rendering and validation. Since no recursion is involved, trees of
+any depth can be traversed without reaching the interpreter recursion limit.
+
+Nodes with an items list (score areas) are considered branches, and any other
+node (scores) is considered a leaf.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from .scores import Score, ScoreArea
+
+    Node = Union[Score, ScoreArea]
+
+
+def iter_preorder(
+    items: Iterable[Node],
+    depth: int = 0
+) -> Iterator[tuple[Node, int]]:
+    """Iterate over a set of nodes and their descendants in pre-order.
+
+    Items of a node are only expanded once the node has been consumed, so
+    they can be safely checked or modified before being visited.
+
+    Args:
+        items (Iterable[Score | ScoreArea]): nodes to traverse.
+        depth (int, optional): depth of the given nodes. Defaults to 0.
+
+    Yields:
+        tuple[Score | ScoreArea, int]: node and its depth.
+    """
+    stack = [(item, depth) for item in reversed(list(items))]
+    while stack:
+        node, level = stack.pop()
+        yield node, level
+
+        children = getattr(node, "_items", None)
+        if children:
+            level += 1
+            stack.extend((item, level) for item in reversed(children))
+
+
+def iter_postorder(
+    items: Iterable[Node],
+    leaves: bool = True,
+    prune: Callable[[ScoreArea], bool] | None = None
+) -> Iterator[tuple[Node, int]]:
+    """Iterate over a set of nodes and their descendants in post-order.
+
+    Every node is yielded after all of its items, which allows computing
+    bottom-up values (such as weighted scores) in a single pass.
+
+    Args:
+        items (Iterable[Score | ScoreArea]): nodes to traverse.
+        leaves (bool, optional): whether to yield leaf nodes or only
+            branches. Defaults to True.
+        prune (Callable[[ScoreArea], bool] | None, optional): predicate
+            that, if true for a branch, skips it along with all of its
+            descendants. Defaults to None.
+
+    Yields:
+        tuple[Score | ScoreArea, int]: node and its depth.
+    """
+    stack = [(item, 0, False) for item in reversed(list(items))]
+    while stack:
+        node, depth, expanded = stack.pop()
+        if expanded:
+            yield node, depth
+            continue
+
+        children = getattr(node, "_items", None)
+        if children is None:
+            if leaves:
+                yield node, depth
+            continue
+
+        if prune is not None and prune(node):  # type: ignore[arg-type]
+            continue
+
+        stack.append((node, depth, True))
+        stack.extend(
+            (item, depth + 1, False) for item in reversed(children)
+        )
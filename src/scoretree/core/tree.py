@@ -10,10 +10,27 @@ Author:
 
 from __future__ import annotations
 
-from colorama import Style
+from array import array
+from math import fsum
+from operator import mul
+from typing import IO, TYPE_CHECKING, Any
 
-from .formatter import Formatter
-from .scores import Score, ScoreArea
+from .formatter import Ansi, Formatter, RenderOptions
+from .scores import Score, ScoreArea, _adopt, _restructure
+from .traversal import iter_preorder
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from os import PathLike
+
+    from .scenarios import ScenarioResult
+    from .schema import ScoreSchema
+    from .sensitivity import LeafSensitivity
+    from .template import ScoreTemplate
+
+    # Render template lines and their settings (see _compile_layout):
+    _Line = tuple[Score | ScoreArea | None, str, str, bool]
+    _Layout = tuple[tuple[int, bool, str], list[_Line]]
 
 
 class ScoreTree(Formatter):
@@ -24,12 +41,40 @@ class ScoreTree(Formatter):
     being nestable), all dependent scores will be computed and displayed with
     ease.
 
+    The weighted score is cached and only recomputed when any of the items it
+    depends on is modified, in which case only the path from the modified
+    item up to the tree gets recomputed.
+
+    Rendering settings are carried by the tree (colorized attribute) or by a
+    RenderOptions instance given to a single rendering call, and never by
+    global state. As a result, a tree that is not being modified can be
+    scored, rendered and serialized from several threads at once, and trees
+    with different settings can be rendered concurrently. Cached scores might
+    then be computed more than once, but always to the same value. Modifying
+    a tree while other threads use it is not supported.
+
+    Nodes can be addressed by path, which is the sequence of node names from
+    the tree to the node, joined by the SEPARATOR character (for instance,
+    tree["Area/Nested/Score"]). Paths are resolved through an index that is
+    built on the first lookup and rebuilt after any node is renamed or any
+    items list is replaced. As with cached scores, items lists must be
+    replaced instead of being modified in place for changes to be noticed.
+
     Attributes:
         items (list[Score | ScoreArea]): list of Score or ScoreArea items.
         score (float): weighted score.
         colorized (bool): whether colorization is enabled or not.
     """
 
+    SEPARATOR = "/"
+    WEIGHT_TOLERANCE = 1e-9
+
+    __slots__ = (
+        "_items", "_colorized", "_parent", "_cached_score", "_generation",
+        "_index", "_indexed", "_flat_leaves", "_flat_weights", "_flattened",
+        "_layout", "_schema"
+    )
+
     def __init__(
         self,
         items: list[Score | ScoreArea],
@@ -41,9 +86,60 @@ class ScoreTree(Formatter):
             items (list[Score | ScoreArea]): list of Score or ScoreArea items.
             colorized (bool, optional): whether colorization is enabled or not.
         """
+        self._parent: None = None  # Score trees are always root nodes.
+        self._cached_score: float | None = None
+        self._generation = 0
+        self._index: dict[str, Score | ScoreArea] = {}
+        self._indexed = -1
+        self._flat_leaves: list[Score] = []
+        self._flat_weights = array("d")
+        self._flattened = -1
+        self._layout: _Layout | None = None
+        self._schema: tuple[int, ScoreSchema] | None = None
+
         self.items = items
         self.colorized = colorized
 
+    @classmethod
+    def from_trusted(
+        cls,
+        items: list[Score | ScoreArea],
+        colorized: bool = True
+    ) -> ScoreTree:
+        """Create a ScoreTree instance without validating its items.
+
+        This constructor is meant for data coming from an already validated
+        source (for instance, items built via Score.from_trusted and
+        ScoreArea.from_trusted), since it skips item type checks and weight
+        completeness checks. Call validate on the resulting instance to check
+        the whole tree afterwards.
+
+        Args:
+            items (list[Score | ScoreArea]): list of Score or ScoreArea items.
+            colorized (bool, optional): whether colorization is enabled or not.
+
+        Returns:
+            ScoreTree: score tree instance.
+        """
+        score_tree = cls.__new__(cls)
+        score_tree._parent = None
+        score_tree._cached_score = None
+        score_tree._generation = 0
+        score_tree._index = {}
+        score_tree._indexed = -1
+        score_tree._flat_leaves = []
+        score_tree._flat_weights = array("d")
+        score_tree._flattened = -1
+        score_tree._layout = None
+        score_tree._schema = None
+        score_tree._items = items
+        score_tree.colorized = colorized
+
+        for item in items:
+            item._parent = score_tree
+
+        return score_tree
+
     @property
     def items(self) -> list[Score | ScoreArea]:
         """Get score items.
@@ -57,6 +153,57 @@ class ScoreTree(Formatter):
     def items(self, value: list[Score | ScoreArea]) -> None:
         """Set score items.
 
+        Args:
+            value (list[Score | ScoreArea]): score items.
+
+        Raises:
+            TypeError: if value is not a list.
+            TypeError: if value contains elements that are not Score or
+                ScoreArea instances.
+            ValueError: if weights do not add up to 1.
+        """
+        self.set_items(value)
+
+    def set_items(
+        self,
+        value: list[Score | ScoreArea],
+        check: bool = True
+    ) -> None:
+        """Set score items, optionally skipping weight checks.
+
+        Weight checks traverse the whole tree, so they can be skipped when
+        replacing items that are known to be valid (for instance, the same
+        items in a different order). Call check_weights or validate
+        afterwards to check the tree.
+
+        Args:
+            value (list[Score | ScoreArea]): score items.
+            check (bool, optional): whether to check that weights add up to 1
+                or not. Defaults to True.
+
+        Raises:
+            TypeError: if value is not a list.
+            TypeError: if value contains elements that are not Score or
+                ScoreArea instances.
+            ValueError: if any element already belongs to another score area
+                or tree.
+            ValueError: if weights do not add up to 1.
+        """
+        # Items are only adopted once they are known to be valid, so that
+        # rejected ones can be used elsewhere:
+        self._check_items(value)
+        if check:
+            self._check_item_weights(value, self.WEIGHT_TOLERANCE)
+
+        _adopt(self, value)
+        self._items = value
+
+        self._invalidate()
+        _restructure(self)
+
+    def _check_items(self, value: list[Score | ScoreArea]) -> None:
+        """Check the type of a score items list.
+
         Args:
             value (list[Score | ScoreArea]): score items.
 
@@ -79,11 +226,6 @@ class ScoreTree(Formatter):
                 + f" {type(value).__name__} instead"
             )
 
-        self._items = value
-
-        # Weight completeness self-checking:
-        self.check_weights(self)
-
     @property
     def colorized(self) -> bool:
         """Get colorization flag.
@@ -111,7 +253,6 @@ class ScoreTree(Formatter):
             )
 
         self._colorized = value
-        Formatter.COLOR_ENABLED = value
 
     @property
     def score(self) -> float:
@@ -120,41 +261,696 @@ class ScoreTree(Formatter):
         Returns:
             float: weighted score.
         """
-        return sum(level.score * level.weight for level in self.items)
+        if self._cached_score is None:
+            self._cached_score = sum(
+                level.score * level.weight for level in self._items
+            )
+
+        return self._cached_score
+
+    @property
+    def flat_score(self) -> float:
+        """Get weighted score, computed from the flattened leaf weights.
+
+        The score is computed as the dot product of the leaf scores and their
+        effective weights, without visiting any area. Effective weights are
+        cached until any node is renamed or reweighted or any items list is
+        replaced, so this is the fastest way to score a tree whose leaf values
+        change between evaluations. Since sums are performed in a different
+        order, the result might differ from the score attribute in the last
+        bits.
+
+        Returns:
+            float: weighted score.
+        """
+        leaves, weights = self._flatten()
+
+        return sum(map(mul, [leaf.score for leaf in leaves], weights))
+
+    @property
+    def leaf_weights(self) -> tuple[float, ...]:
+        """Get effective leaf weights.
+
+        The effective weight of a leaf is the product of the weights along
+        its path, that is, the maximum score it can add to the total.
+
+        Returns:
+            tuple[float, ...]: effective weight of every leaf, in pre-order.
+        """
+        return tuple(self._flatten()[1])
+
+    def validate(self) -> None:
+        """Validate the tree items and weights, recursively.
+
+        Raises:
+            TypeError: if any attribute has an invalid type.
+            ValueError: if any attribute has an invalid value or if weights
+                do not add up to 1.
+        """
+        for item in self._items:
+            if isinstance(item, (Score, ScoreArea)):
+                item.validate()
+
+        # Item types and weights are checked once all items are valid:
+        self._check_items(self._items)
+        self.check_weights(self)
+
+    def _invalidate(self) -> None:
+        """Invalidate the cached score of the score tree."""
+        self._cached_score = None
+
+    def _flatten(self) -> tuple[list[Score], array[float]]:
+        """Get the leaves of the tree and their effective weights.
+
+        Both are rebuilt, in a single traversal, if the tree structure or any
+        weight has changed since they were last built.
+
+        Returns:
+            tuple[list[Score], array[float]]: leaves, in pre-order, and their
+                effective weights.
+        """
+        generation = self._generation
+        if self._flattened == generation:
+            return self._flat_leaves, self._flat_weights
+
+        # Effective weight of the last visited area of every depth:
+        factors: list[float] = []
+
+        leaves: list[Score] = []
+        weights = array("d")
+        for node, depth in iter_preorder(self._items):
+            del factors[depth:]
+            weight = node._weight * factors[-1] if depth else node._weight
+
+            if isinstance(node, Score):
+                leaves.append(node)
+                weights.append(weight)
+            else:
+                factors.append(weight)
+
+        self._flat_leaves = leaves
+        self._flat_weights = weights
+        self._flattened = generation
+
+        return leaves, weights
+
+    def _compile_layout(self, options: RenderOptions) -> list[_Line]:
+        """Get the render template of the tree, rebuilding it if outdated.
+
+        The template holds the static part of every rendered line (style
+        code, indentation, name and weight) along with the node whose score
+        completes it, so rendering only formats scores and picks colors. It is
+        rebuilt if the tree structure, any name or weight, or the settings of
+        the given options have changed since it was last built.
+
+        Args:
+            options (RenderOptions): rendering options.
+
+        Returns:
+            list[tuple[Score | ScoreArea | None, str, str, bool]]: node (None
+                for empty lines), text before the score, text after the score
+                and whether the line starts a top-level item, for every line.
+        """
+        key = (self._generation, options._colorized, options._branch)
+        layout = self._layout
+        if layout is not None and layout[0] == key:
+            return layout[1]
+
+        lines: list[_Line] = []
+        for item in self._items:
+            for node, depth in iter_preorder((item,)):
+                style = (
+                    "" if not options._colorized
+                    else Ansi.DIM if isinstance(node, Score) else Ansi.NORMAL
+                )
+                lines.append((
+                    node,
+                    f"{style}{options.indent(depth)}{node._name}"
+                    + f" ({node._weight * 100:.2f}%): ",
+                    "%",
+                    node is item
+                ))
+
+                # Empty areas are followed by an empty line:
+                if isinstance(node, ScoreArea) and not node._items:
+                    lines.append((None, "", "", False))
+
+            # Every item is reset as a whole:
+            last, head, tail, first = lines[-1]
+            lines[-1] = (last, head, f"{tail}{Ansi.RESET_ALL}", first)
+
+        self._layout = (key, lines)
+
+        return lines
+
+    def _compile_schema(self) -> ScoreSchema:
+        """Get the score schema of the tree, rebuilding it if outdated.
+
+        Returns:
+            ScoreSchema: score schema of the tree.
+
+        Raises:
+            ValueError: if the tree weights do not add up to 1.
+        """
+        from .schema import ScoreSchema
+
+        schema = self._schema
+        if schema is None or schema[0] != self._generation:
+            schema = self._schema = (self._generation, ScoreSchema(self))
+
+        return schema[1]
+
+    def _lookup(self) -> dict[str, Score | ScoreArea]:
+        """Get the path index of the tree, rebuilding it if outdated.
+
+        Returns:
+            dict[str, Score | ScoreArea]: tree nodes, indexed by path.
+
+        Raises:
+            ValueError: if several nodes share the same path (siblings with
+                the same name, or names containing the separator).
+        """
+        generation = self._generation
+        if self._indexed == generation:
+            return self._index
+
+        index: dict[str, Score | ScoreArea] = {}
+        paths: list[str] = []
+        for node, depth in iter_preorder(self._items):
+            del paths[depth:]
+            path = (
+                f"{paths[-1]}{self.SEPARATOR}{node._name}" if depth
+                else node._name
+            )
+            if path in index:
+                raise ValueError(
+                    f"several nodes of {self.__class__.__name__} share the"
+                    + f" path \"{path}\", so it cannot be addressed"
+                )
+
+            index[path] = node
+            paths.append(path)
+
+        self._index = index
+        self._indexed = generation
+
+        return index
+
+    def _resolve(
+        self,
+        values: Mapping[str, int | float]
+    ) -> list[tuple[Score, int | float]]:
+        """Resolve and check a set of score values indexed by path.
+
+        Args:
+            values (Mapping[str, int | float]): score values, indexed by path.
+
+        Returns:
+            list[tuple[Score, int | float]]: scores and their values.
+
+        Raises:
+            ValueError: if several nodes of the tree share the same path.
+            KeyError: if a path does not exist in the tree.
+            TypeError: if a path does not belong to a Score instance.
+            TypeError: if a value is not an int or float.
+        """
+        index = self._lookup()
+        scores = []
+        for path, value in values.items():
+            node = index[path]
+            if not isinstance(node, Score):
+                raise TypeError(
+                    f"expected type Score for \"{path}\" but got"
+                    + f" {type(node).__name__} instead"
+                )
+
+            if not isinstance(value, (int, float)):
+                raise TypeError(
+                    "expected type int | float for"
+                    + f" {node.__class__.__name__}.value but got"
+                    + f" {type(value).__name__} instead"
+                )
+
+            scores.append((node, value))
+
+        return scores
+
+    def set_values(self, values: Mapping[str, int | float]) -> None:
+        """Set the values of a set of scores.
+
+        All paths and values are checked before any score is modified.
+
+        Args:
+            values (Mapping[str, int | float]): score values, indexed by path.
+
+        Raises:
+            ValueError: if several nodes of the tree share the same path.
+            KeyError: if a path does not exist in the tree.
+            TypeError: if a path does not belong to a Score instance.
+            TypeError: if a value is not an int or float.
+        """
+        for node, value in self._resolve(values):
+            node.value = value
+
+    def iter_lines(
+        self,
+        options: RenderOptions | None = None
+    ) -> Iterator[str]:
+        """Iterate over the lines of the long representation of the tree.
+
+        Lines are generated while traversing the tree, so memory usage does
+        not depend on the size of the rendered output, unless a render
+        template has been compiled via compile_layout, in which case lines
+        are generated from it.
+
+        Args:
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (class characters, colorized as defined by
+                the colorized attribute).
+
+        Yields:
+            str: formatted line.
+
+        Raises:
+            TypeError: if options is not a RenderOptions instance.
+        """
+        if options is None:
+            options = RenderOptions(
+                self._colorized, self.START_CHAR, self.MIDDLE_CHAR
+            )
+
+        elif not isinstance(options, RenderOptions):
+            raise TypeError(
+                "expected type RenderOptions for"
+                + f" {self.__class__.__name__} rendering options but got"
+                + f" {type(options).__name__} instead"
+            )
+
+        if self._layout is not None:
+            yield from self._iter_layout(options)
+            return
+
+        # Leaf scores computed while refreshing area caches are reused:
+        scores: dict[int, float] = {}
+        for item in self._items:
+            if isinstance(item, ScoreArea):
+                if item._cached_score is None:
+                    item._refresh(scores)
+                score = item.score
+            else:
+                score = scores[id(item)] = item.score
+
+            lines = item._iter_lines(0, options, scores)
+
+            # Every item is colorized and reset as a whole:
+            line = options.colorize(next(lines), score)
+            for next_line in lines:
+                yield line
+                line = next_line
+
+            yield f"{line}{Ansi.RESET_ALL}"
+
+    def _iter_layout(self, options: RenderOptions) -> Iterator[str]:
+        """Iterate over the rendered lines of the tree, using its template.
+
+        Args:
+            options (RenderOptions): rendering options.
+
+        Yields:
+            str: formatted line.
+        """
+        colorized = options._colorized
+        color = options.color
+        for node, head, tail, first in self._compile_layout(options):
+            if node is None:
+                yield tail
+                continue
+
+            score = node.score
+            line = f"{head}{score * 100:.2f}{tail}"
+            if colorized:
+                # Every item is colorized as a whole, then line by line:
+                code = color(score)
+                line = f"{code}{code}{line}" if first else f"{code}{line}"
+
+            yield line
+
+    def compile_layout(self, options: RenderOptions | None = None) -> None:
+        """Compile a render template, used by every later render of the tree.
+
+        The template holds the static part of every rendered line (style
+        code, indentation, name and weight), so re-rendering the tree only
+        formats scores and picks colors. It is meant for trees that are
+        rendered often, such as live dashboards, since it takes more memory
+        than the tree nodes themselves. Templates are rebuilt when the tree
+        structure, any name or weight, or the rendering settings change, and
+        are kept until discard_layout is called.
+
+        Args:
+            options (RenderOptions | None, optional): rendering options to
+                compile the template for. Defaults to None (class characters,
+                colorized as defined by the colorized attribute).
+
+        Raises:
+            TypeError: if options is not a RenderOptions instance.
+        """
+        if options is None:
+            options = RenderOptions(
+                self._colorized, self.START_CHAR, self.MIDDLE_CHAR
+            )
+
+        elif not isinstance(options, RenderOptions):
+            raise TypeError(
+                "expected type RenderOptions for"
+                + f" {self.__class__.__name__} rendering options but got"
+                + f" {type(options).__name__} instead"
+            )
+
+        self._compile_layout(options)
+
+    def discard_layout(self) -> None:
+        """Discard the render template of the tree, if any.
+
+        Later renders traverse the tree again, without keeping any template.
+        """
+        self._layout = None
+
+    def render(self, options: RenderOptions | None = None) -> str:
+        """Get the long representation of the tree with the given options.
+
+        Args:
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (class characters, colorized as defined by
+                the colorized attribute).
+
+        Returns:
+            str: long representation of the score tree.
+
+        Raises:
+            TypeError: if options is not a RenderOptions instance.
+        """
+        return "\n".join(self.iter_lines(options))
+
+    def render_to(
+        self,
+        stream: IO[str],
+        options: RenderOptions | None = None
+    ) -> None:
+        """Write the long representation of the tree to a text stream.
+
+        Lines are written as they are generated, each one followed by a line
+        break, so huge trees can be written to files, standard output or
+        sockets (via socket.makefile) without building the whole output.
+
+        Args:
+            stream (IO[str]): writable text stream.
+            options (RenderOptions | None, optional): rendering options.
+                Defaults to None (class characters, colorized as defined by
+                the colorized attribute).
+
+        Raises:
+            TypeError: if options is not a RenderOptions instance.
+        """
+        write = stream.write
+        for line in self.iter_lines(options):
+            write(line)
+            write("\n")
+
+    def dump(self, path: str | PathLike[str]) -> None:
+        """Store the tree in a file, using a compact binary format.
+
+        Args:
+            path (str | PathLike[str]): destination file path.
+        """
+        from .serialization import dump
+
+        dump(self, path)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> ScoreTree:
+        """Load a tree stored via the dump method.
+
+        Args:
+            path (str | PathLike[str]): source file path.
+
+        Returns:
+            ScoreTree: loaded score tree.
+
+        Raises:
+            ValueError: if the file is not a valid serialized score tree.
+        """
+        from .serialization import load
+
+        return load(path)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the tree to a dictionary.
+
+        Returns:
+            dict[str, Any]: score tree dictionary, with the same fields as
+                the Score, ScoreArea and ScoreTree constructors.
+        """
+        from .serialization import to_dict
+
+        return to_dict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ScoreTree:
+        """Build a tree from a dictionary created via the to_dict method.
+
+        Args:
+            data (Mapping[str, Any]): score tree dictionary.
+
+        Returns:
+            ScoreTree: score tree.
+
+        Raises:
+            ValueError: if a required field is missing.
+            TypeError: if a field has an invalid type.
+            ValueError: if a field has an invalid value.
+        """
+        from .serialization import from_dict
+
+        return from_dict(data)
+
+    def to_json(self, fp: IO[str]) -> None:
+        """Write the tree to a text stream as a JSON document.
+
+        The document is written node by node, without building the whole
+        tree dictionary first.
+
+        Args:
+            fp (IO[str]): writable text stream.
+        """
+        from .serialization import dump_json
+
+        dump_json(self, fp)
 
     @classmethod
-    def check_weights(cls, score_collection: ScoreArea | ScoreTree) -> None:
+    def from_json(cls, fp: IO[str]) -> ScoreTree:
+        """Read a tree from a text stream containing a JSON document.
+
+        The document is parsed incrementally, building every node as soon as
+        it has been read, so the parsed document is never held in memory
+        along with the tree.
+
+        Args:
+            fp (IO[str]): readable text stream.
+
+        Returns:
+            ScoreTree: score tree.
+
+        Raises:
+            ValueError: if the document is not a valid score tree document.
+            TypeError: if a field has an invalid type.
+        """
+        from .serialization import load_json
+
+        return load_json(fp)
+
+    def sensitivity(self) -> list[LeafSensitivity]:
+        """Compute the sensitivity of the weighted score to every leaf.
+
+        For every leaf, its effective weight (the product of the weights
+        along its path), its contribution to the weighted score and the
+        partial derivative of the weighted score with respect to its value
+        are computed in a single traversal.
+
+        Returns:
+            list[LeafSensitivity]: sensitivity of every leaf, in pre-order.
+        """
+        from .sensitivity import sensitivity
+
+        return sensitivity(self)
+
+    def evaluate_scenarios(
+        self,
+        scenarios: Iterable[Mapping[str, Mapping[str, Any]]]
+    ) -> list[ScenarioResult]:
+        """Evaluate a set of what-if scenarios against the tree.
+
+        Every scenario is a sparse set of attribute overrides indexed by node
+        path, such as {"Area/Test": {"value": 5}}. The tree is neither
+        modified nor copied, and only the areas containing overridden nodes
+        are recomputed for each scenario.
+
+        Args:
+            scenarios (Iterable[Mapping[str, Mapping[str, Any]]]): attribute
+                overrides of every scenario, indexed by node path.
+
+        Returns:
+            list[ScenarioResult]: scores of every scenario, in input order.
+
+        Raises:
+            KeyError: if a path does not exist in the tree.
+            ValueError: if an overridden attribute does not exist or cannot
+                be overridden.
+            TypeError: if an overridden attribute has an invalid type.
+            ValueError: if an overridden attribute has an invalid value.
+        """
+        from .scenarios import evaluate_scenarios
+
+        return evaluate_scenarios(self, scenarios)
+
+    def compile(self) -> ScoreTemplate:
+        """Compile the tree structure into an array-backed template.
+
+        The template allows evaluating many sets of leaf values sharing this
+        tree shape in a single vectorized call. NumPy is required.
+
+        Returns:
+            ScoreTemplate: compiled score template.
+        """
+        from .template import ScoreTemplate
+
+        return ScoreTemplate(self)
+
+    @classmethod
+    def check_weights(
+        cls,
+        score_collection: ScoreArea | ScoreTree,
+        tolerance: int | float | None = None
+    ) -> None:
         """Check if weights of a ScoreArea or ScoreTree add up to 1.
 
+        Every nested area is checked in a single traversal, and all of the
+        offending areas are reported at once. Weights are added up with
+        math.fsum, so their sum is exact before being compared to 1. Sums
+        that are not a number (any NaN weight) never add up to 1.
+
         Args:
             score_collection (ScoreArea | ScoreTree): score area or score tree
                 to check.
+            tolerance (int | float | None, optional): maximum absolute
+                difference between the sum of the weights and 1. Defaults to
+                None (WEIGHT_TOLERANCE).
 
         Raises:
-            ValueError: if weights do not add up to 1.
+            TypeError: if tolerance is not an int or float.
+            ValueError: if tolerance is negative or NaN.
+            ValueError: if weights do not add up to 1, listing every score
+                area (by path) whose weights do not.
         """
-        # Accumulation:
-        total = 0.0
-        for item in score_collection.items:
-            total += item.weight
-
-            # Recursive checking:
-            if isinstance(item, ScoreArea):
-                cls.check_weights(item)
+        if tolerance is None:
+            tolerance = cls.WEIGHT_TOLERANCE
 
-        # Score area checking:
-        if total != 1 and isinstance(score_collection, ScoreArea):
-            raise ValueError(
-                f"\"{score_collection.name}\""
-                + f" score weights do not add up to 1 ({total})"
+        elif not isinstance(tolerance, (int, float)):
+            raise TypeError(
+                "expected type int | float for"
+                + f" {cls.__name__}.check_weights tolerance but got"
+                + f" {type(tolerance).__name__} instead"
             )
 
-        # Score tree checking:
-        elif total != 1 and isinstance(score_collection, ScoreTree):
+        if not tolerance >= 0:
             raise ValueError(
-                f"score tree weights do not add up to 1 ({total})"
+                f"expected a non-negative tolerance for {cls.__name__}"
+                + f".check_weights but got {tolerance}"
             )
 
+        if isinstance(score_collection, ScoreArea):
+            cls._check_item_weights([score_collection], tolerance, False)
+        else:
+            cls._check_item_weights(score_collection._items, tolerance)
+
+    @classmethod
+    def _check_item_weights(
+        cls,
+        items: list[Score | ScoreArea],
+        tolerance: int | float,
+        total: bool = True
+    ) -> None:
+        """Check if weights of a list of score tree items add up to 1.
+
+        Args:
+            items (list[Score | ScoreArea]): items to check.
+            tolerance (int | float): maximum absolute difference between the
+                sum of the weights and 1.
+            total (bool, optional): whether the weights of the items
+                themselves must add up to 1 (as top-level items of a tree)
+                or only the weights of the items of every area. Defaults to
+                True.
+
+        Raises:
+            ValueError: if weights do not add up to 1, listing every score
+                area (by path) whose weights do not.
+        """
+        errors: list[str] = []
+        if total:
+            weights = fsum(item._weight for item in items)
+            if not abs(weights - 1) <= tolerance:
+                errors.append(
+                    f"score tree weights do not add up to 1 ({weights})"
+                )
+
+        # Last visited area of every depth, so that paths are only built for
+        # offending areas:
+        ancestors: list[ScoreArea] = []
+        for node, depth in iter_preorder(items):
+            if not isinstance(node, ScoreArea):
+                continue
+
+            del ancestors[depth:]
+            ancestors.append(node)
+
+            weights = fsum(item._weight for item in node._items)
+            if not abs(weights - 1) <= tolerance:
+                path = cls.SEPARATOR.join(area._name for area in ancestors)
+                errors.append(
+                    f"\"{path}\" score weights do not add up to 1 ({weights})"
+                )
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+    def __getitem__(self, path: str) -> Score | ScoreArea:
+        """Get a node by path.
+
+        Args:
+            path (str): node path.
+
+        Returns:
+            Score | ScoreArea: node.
+
+        Raises:
+            ValueError: if several nodes of the tree share the same path.
+            KeyError: if the path does not exist in the tree.
+        """
+        return self._lookup()[path]
+
+    def __contains__(self, path: object) -> bool:
+        """Check whether a path exists in the tree.
+
+        Args:
+            path (object): node path.
+
+        Returns:
+            bool: whether the path exists or not.
+
+        Raises:
+            ValueError: if several nodes of the tree share the same path.
+        """
+        return path in self._lookup()
+
     def __repr__(self) -> str:
         """Get short string representation of the score tree.
 
@@ -169,9 +965,4 @@ class ScoreTree(Formatter):
         Returns:
             str: long representation of the score tree.
         """
-        return "\n".join(
-            self.colorize(
-                f"{item._render(0)}{Style.RESET_ALL}",
-                item.score
-            ) for item in self.items
-        )
+        return "\n".join(self.iter_lines())
@@ -0,0 +1,25 @@
+import pytest
+
+from ..core.scores import Score, ScoreArea
+from ..core.tree import ScoreTree
+
+
+@pytest.fixture
+def build_tree():
+    """Factory of a small score tree with a nested area.
+
+    The tree has three leaves ("Area/Test", "Area/Nested/Test" and "Other"),
+    whose values are given in pre-order, and the nested one can be inverted.
+    """
+    def build(values=(5, 1, 0.5), inverse=False, colorized=True):
+        return ScoreTree([
+            ScoreArea("Area", 0.5, [
+                Score("Test", 0.5, (0, 10), values[0]),
+                ScoreArea("Nested", 0.5, [
+                    Score("Test", 1, (0, 1), values[1], inverse)
+                ])
+            ]),
+            Score("Other", 0.5, (0, 1), values[2])
+        ], colorized)
+
+    return build
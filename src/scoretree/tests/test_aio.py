@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from ..core import aio as aio_module
+from ..core.aio import AsyncScoreTree
+
+
+class TestAsyncScoreTree:
+
+    def test_init(self, build_tree):
+        with pytest.raises(TypeError):
+            AsyncScoreTree(None)
+
+        with pytest.raises(TypeError):
+            AsyncScoreTree(build_tree(), "0")
+
+        with pytest.raises(ValueError):
+            AsyncScoreTree(build_tree(), -1)
+
+        live = AsyncScoreTree(build_tree((0, 0, 0)), 0.5)
+        assert live.window == 0.5
+        assert live.score == 0
+        assert repr(live) == (
+            "<AsyncScoreTree with 0 pending updates and 0 subscriptions>"
+        )
+
+    def test_coalescing(self, build_tree):
+        tree = build_tree((0, 0, 0))
+        evaluations = []
+
+        async def main():
+            async with AsyncScoreTree(tree) as live:
+                subscription = live.subscribe()
+
+                # Bursts are applied as a single batch:
+                for value in range(11):
+                    await live.update("Area/Test", value)
+                await live.update_many({"Area/Nested/Test": 1, "Other": 0.5})
+                evaluations.append(await subscription.__anext__())
+
+                await live.update("Other", 1)
+                evaluations.append(await subscription.__anext__())
+
+                with pytest.raises(KeyError):
+                    await live.update("Missing", 1)
+
+                with pytest.raises(TypeError):
+                    await live.update("Area", 1)
+
+                with pytest.raises(TypeError):
+                    await live.update("Other", "1")
+
+                # Pending updates are applied on close:
+                await live.update("Other", 0)
+
+            evaluations.extend([score async for score in subscription])
+            assert [score async for score in live.subscribe()] == []
+
+            with pytest.raises(RuntimeError):
+                await live.update("Other", 1)
+
+        asyncio.run(main())
+
+        assert evaluations == [0.75, 1, 0.5]
+        assert tree.score == 0.5
+
+    def test_window(self, build_tree, monkeypatch):
+        tree = build_tree((0, 0, 0))
+        windows = []
+
+        async def produce(live, path, count):
+            for index in range(count):
+                await live.update(path, index / count)
+                await asyncio.sleep(0)
+
+        async def main():
+            # Windows last until every source is done:
+            done = asyncio.Event()
+
+            async def sleep(delay):
+                windows.append(delay)
+                await done.wait()
+
+            monkeypatch.setattr(aio_module, "sleep", sleep)
+
+            live = AsyncScoreTree(tree, 0.05)
+            subscription = live.subscribe()
+
+            await asyncio.gather(
+                produce(live, "Area/Nested/Test", 50),
+                produce(live, "Other", 50)
+            )
+            done.set()
+            await live.close()
+
+            return [score async for score in subscription]
+
+        scores = asyncio.run(main())
+
+        # Concurrent sources are coalesced into a single evaluation:
+        assert windows == [0.05]
+        assert scores == [tree.score] == [0.25 * 0.98 + 0.5 * 0.98]
+
+    def test_errors(self, build_tree, monkeypatch):
+        tree = build_tree((0, 0, 0))
+        failures = [RuntimeError("window failure")]
+
+        async def sleep(delay):
+            if failures:
+                raise failures.pop()
+
+        monkeypatch.setattr(aio_module, "sleep", sleep)
+
+        async def main():
+            live = AsyncScoreTree(tree, 1)
+            subscription = live.subscribe()
+
+            await live.update("Other", 1)
+            await asyncio.sleep(0)
+
+            # The failure is raised once, by the next call:
+            with pytest.raises(RuntimeError, match="window failure"):
+                await live.update("Other", 0.5)
+
+            assert live.score == 0
+
+            # ...and the task is started again by the next update:
+            await live.update("Other", 0.5)
+            assert await subscription.__anext__() == 0.25
+
+            failures.append(ValueError("close failure"))
+            await live.update("Other", 0)
+            await asyncio.sleep(0)
+            with pytest.raises(ValueError, match="close failure"):
+                await live.close()
+
+            # Updates submitted before the failure are applied on close:
+            assert [score async for score in subscription] == [0]
+
+        asyncio.run(main())
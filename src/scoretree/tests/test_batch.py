@@ -0,0 +1,41 @@
+import pytest
+
+from ..core.batch import evaluate_rows, evaluate_trees
+from ..core.schema import ScoreSchema
+
+
+ROWS = [[index % 11, (index % 5) / 4, (index % 3) / 2] for index in range(25)]
+
+
+class TestBatch:
+
+    def test_evaluate_trees(self, build_tree):
+        trees = [build_tree(row, True) for row in ROWS]
+
+        assert evaluate_trees(trees, max_workers=2) == [
+            tree.score for tree in trees
+        ]
+        assert evaluate_trees(trees[:3], render=True, max_workers=2) == [
+            (tree.score, str(tree)) for tree in trees[:3]
+        ]
+        assert evaluate_trees([], max_workers=2) == []
+
+    def test_evaluate_rows(self, build_tree):
+        trees = [build_tree(row, True) for row in ROWS]
+        schema = ScoreSchema(trees[0])
+
+        assert evaluate_rows(schema, ROWS, max_workers=2, chunksize=4) == [
+            tree.score for tree in trees
+        ]
+        assert evaluate_rows(
+            trees[0], ROWS[:3], render=True, max_workers=2
+        ) == [(tree.score, str(tree)) for tree in trees[:3]]
+        assert evaluate_rows(schema, [
+            {"Area/Test": 10, "Area/Nested/Test": 0, "Other": 1}
+        ], max_workers=1) == [1]
+
+        with pytest.raises(ValueError):
+            evaluate_rows(schema, [[1, 2]], max_workers=1)
+
+        with pytest.raises(TypeError):
+            evaluate_rows(schema, [[1, 2, "3"]], max_workers=1)
@@ -0,0 +1,140 @@
+import pytest
+
+from ..core import cache as cache_module
+from ..core.cache import CachedResult, ResultCache
+from ..core.schema import ScoreSchema
+
+
+class TestResultCache:
+
+    def test_init(self):
+        cache = ResultCache()
+        assert cache.maxsize == 128
+        assert cache.ttl is None
+        assert cache.render is False
+        assert repr(cache) == "<ResultCache with 0 results (0 hits, 0 misses)>"
+
+        for maxsize in (None, 1.5, True):
+            with pytest.raises(TypeError):
+                ResultCache(maxsize)
+
+        with pytest.raises(ValueError):
+            ResultCache(0)
+
+        with pytest.raises(TypeError):
+            ResultCache(ttl="1")
+
+        with pytest.raises(ValueError):
+            ResultCache(ttl=0)
+
+        with pytest.raises(TypeError):
+            ResultCache(render=1)
+
+        with pytest.raises(TypeError):
+            cache.evaluate(None)
+
+    def test_keys(self, build_tree):
+        cache = ResultCache()
+        result = cache.evaluate(build_tree(inverse=True))
+
+        # Trees with the same structure and values share their result,
+        # whatever their colorization when renders are not stored:
+        plain = build_tree(inverse=True, colorized=False)
+        assert cache.evaluate(plain) is result
+        assert cache.evaluate(build_tree((6, 1, 0.5), True)) is not result
+
+        # Results can be looked up without building any tree:
+        schema = ScoreSchema(build_tree(inverse=True))
+        assert cache.bind(schema, [5, 1, 0.5]) is result
+        assert cache.bind(schema, {
+            "Area/Test": 5, "Area/Nested/Test": 1, "Other": 0.5
+        }, False) is result
+        assert (cache.hits, cache.misses) == (3, 2)
+
+        cache = ResultCache(render=True)
+        result = cache.bind(schema, [5, 1, 0.5])
+        assert result.text == str(build_tree(inverse=True))
+        assert cache.evaluate(build_tree(inverse=True)) is result
+        assert cache.evaluate(plain) is not result
+        assert cache.evaluate(plain).text == str(plain)
+
+        # Trees keep their schema until their structure changes, so hits do
+        # not rebuild it:
+        tree = build_tree(inverse=True)
+        result = cache.evaluate(tree)
+        compiled = tree._schema
+        tree.items[1].value = 0
+        cache.evaluate(tree)
+        tree.items[1].value = 0.5
+        assert cache.evaluate(tree) is result
+        assert tree._schema is compiled
+
+        tree.items[1].score_range = (0, 2)
+        assert cache.evaluate(tree) is not result
+        assert tree._schema is not compiled
+
+        with pytest.raises(TypeError):
+            cache.bind(build_tree(inverse=True), [5, 1, 0.5])
+
+        with pytest.raises(TypeError):
+            cache.bind(schema, [5, 1, 0.5], 1)
+
+        with pytest.raises(ValueError):
+            cache.bind(schema, [5, 1])
+
+    def test_evaluate(self, build_tree):
+        cache = ResultCache(render=True)
+        tree = build_tree(inverse=True)
+
+        result = cache.evaluate(tree)
+        assert isinstance(result, CachedResult)
+        assert result.score == tree.score
+        assert result.subtotals == {
+            "Area": tree.items[0].score,
+            "Area/Nested": tree.items[0].items[1].score
+        }
+        assert result.text == str(tree)
+        assert repr(result) == (
+            f"<CachedResult with score {tree.score * 100:.2f}% (2 areas)>"
+        )
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        # Identical trees are served from the cache:
+        assert cache.evaluate(build_tree(inverse=True)) is result
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Modified trees are not:
+        tree.items[1].value = 0
+        assert cache.evaluate(tree).score == tree.score
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+        cache.clear()
+        assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+        assert ResultCache().evaluate(tree).text is None
+
+    def test_eviction(self, build_tree, monkeypatch):
+        cache = ResultCache(2)
+        cache.evaluate(build_tree((0, 1, 0.5), True))
+        cache.evaluate(build_tree((1, 1, 0.5), True))
+        cache.evaluate(build_tree((0, 1, 0.5), True))
+        cache.evaluate(build_tree((2, 1, 0.5), True))
+
+        # The least recently used result is evicted:
+        assert len(cache) == 2
+        cache.evaluate(build_tree((0, 1, 0.5), True))
+        assert cache.hits == 2
+        cache.evaluate(build_tree((1, 1, 0.5), True))
+        assert cache.misses == 4
+
+        now = [0.0]
+        monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+        cache = ResultCache(ttl=10)
+        cache.evaluate(build_tree(inverse=True))
+        now[0] = 9.0
+        cache.evaluate(build_tree(inverse=True))
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Expired results are evaluated again:
+        now[0] = 10.0
+        cache.evaluate(build_tree(inverse=True))
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 1)
@@ -1,7 +1,11 @@
+import os
+import subprocess
+import sys
+
 import pytest
-from colorama import Fore
+from colorama import Fore, Style
 
-from ..core.formatter import Formatter
+from ..core.formatter import Ansi, Formatter, RenderOptions
 
 
 class TestFormatter:
@@ -37,3 +41,88 @@ class TestFormatter:
         assert Formatter.colorize("yellow", 0.75) == f"{Fore.YELLOW}yellow"
         assert Formatter.colorize("green", 0.76) == f"{Fore.GREEN}green"
         assert Formatter.colorize("green", 1) == f"{Fore.GREEN}green"
+
+
+class TestRenderOptions:
+
+    def test_init(self):
+        options = RenderOptions()
+
+        assert options.colorized
+        assert options.start_char == Formatter.START_CHAR
+        assert options.middle_char == Formatter.MIDDLE_CHAR
+        assert repr(options) == (
+            "RenderOptions(colorized=True, start_char='└', middle_char='─')"
+        )
+
+        with pytest.raises(TypeError):
+            RenderOptions(1)
+
+        with pytest.raises(TypeError):
+            RenderOptions(True, 1)
+
+        with pytest.raises(TypeError):
+            RenderOptions(True, "+", None)
+
+        with pytest.raises(AttributeError):
+            options.colorized = False
+
+    def test_indent(self):
+        options = RenderOptions(start_char="+", middle_char="-")
+
+        assert options.indent(0) == ""
+        assert options.indent(1) == "+-- "
+        assert options.indent(2) == f"{' ' * 4}+-- "
+
+        with pytest.raises(TypeError):
+            options.indent("1")
+
+    def test_color(self):
+        assert RenderOptions().color(-1) == Fore.RED
+        assert RenderOptions().color(0.5) == Fore.YELLOW
+        assert RenderOptions().color(0.75) == Fore.YELLOW
+        assert RenderOptions().color(2) == Fore.GREEN
+        assert RenderOptions(False).color(1) == ""
+
+    def test_colorize(self):
+        assert RenderOptions().colorize("red", 0) == f"{Fore.RED}red"
+        assert RenderOptions(False).colorize("red", 0) == "red"
+
+        with pytest.raises(TypeError):
+            RenderOptions().colorize(1, 0)
+
+        with pytest.raises(TypeError):
+            RenderOptions().colorize("", "1")
+
+
+class TestAnsi:
+
+    def test_codes(self):
+        assert Ansi.RED == Fore.RED
+        assert Ansi.YELLOW == Fore.YELLOW
+        assert Ansi.GREEN == Fore.GREEN
+        assert Ansi.NORMAL == Style.NORMAL
+        assert Ansi.DIM == Style.DIM
+        assert Ansi.RESET_ALL == Style.RESET_ALL
+
+    def test_lazy_colorama(self):
+        # Colorama is only imported by the first colorized render:
+        script = "; ".join((
+            "import sys",
+            "import scoretree",
+            "tree = scoretree.ScoreTree([scoretree.Score('Test', 1, (0, 1))])",
+            "tree.score",
+            "tree.render(scoretree.RenderOptions(colorized=False))",
+            "print('colorama' in sys.modules)",
+            "str(tree)",
+            "print('colorama' in sys.modules)"
+        ))
+        source = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True,
+            text=True, env={**os.environ, "PYTHONPATH": source}
+        )
+
+        assert process.stdout.split() == ["False", "True"]
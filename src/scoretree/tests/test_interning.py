@@ -0,0 +1,79 @@
+import pytest
+
+from ..core.interning import InternedTree, ShapeRegistry, structural_key
+from ..core.schema import ScoreSchema
+from ..core.scores import Score, ScoreArea
+from ..core.tree import ScoreTree
+
+
+def build_track(name, weight, values):
+    return ScoreArea(name, weight, [
+        ScoreArea("Dynamics", 0.5, [
+            Score("Speed", 0.5, (0, 100), values[0]),
+            Score("Time", 0.5, (20, 60), values[1], True)
+        ]),
+        Score("Fuel", 0.5, (0, 10), values[2], True)
+    ])
+
+
+class TestInterning:
+
+    def test_structural_key(self):
+        first = build_track("Track", 1, [0, 0, 0])
+        second = build_track("Track", 1, [1, 2, 3])
+
+        assert structural_key(first) == structural_key(second)
+        assert hash(structural_key(first)) == hash(structural_key(second))
+
+        second.items[1].inverse = False
+        assert structural_key(first) != structural_key(second)
+
+        # Schemas are compared and hashed by structure:
+        assert ScoreSchema(first) == ScoreSchema(build_track("T", 1, [1] * 3))
+        assert len({ScoreSchema(first), ScoreSchema(first)}) == 1
+        assert ScoreSchema(first) != ScoreSchema(second)
+        assert ScoreSchema(first) != "schema"
+
+    def test_interned_tree(self):
+        tree = ScoreTree([
+            build_track("Track 0", 0.25, [50, 30, 5]),
+            build_track("Track 1", 0.25, [100, 20, 0]),
+            build_track("Track 2", 0.25, [0, 60, 10]),
+            Score("Bonus", 0.25, (0, 1), 0.5)
+        ])
+        interned = InternedTree(tree)
+
+        assert len(interned) == 4
+        assert len(interned.registry) == 2
+        assert interned.registry.shapes[0].leaves == (
+            "Dynamics/Speed", "Dynamics/Time", "Fuel"
+        )
+        assert repr(interned) == "<InternedTree with 4 items and 2 shapes>"
+        assert interned.score == tree.score
+        assert interned.result(1).score == tree.items[1].score
+        assert interned.result(1)["Dynamics"] == tree.items[1].items[0].score
+
+        rebuilt = interned.to_tree()
+        assert str(rebuilt) == str(tree)
+        rebuilt.validate()
+
+        # Value vectors are stored by the interned tree:
+        interned.values(0)[0] = 100
+        tree.items[0].items[0].items[0].value = 100
+        assert interned.score == tree.score
+
+        # Registries can be shared among trees:
+        other = InternedTree(rebuilt, interned.registry)
+        assert len(interned.registry) == 2
+        assert other.registry.shapes == interned.registry.shapes
+
+        with pytest.raises(TypeError):
+            InternedTree(None)
+
+        with pytest.raises(TypeError):
+            InternedTree(tree, {})
+
+        with pytest.raises(IndexError):
+            interned.values(4)
+
+        assert isinstance(ShapeRegistry().shapes, tuple)
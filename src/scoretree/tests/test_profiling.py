@@ -0,0 +1,108 @@
+import pytest
+
+from ..core.formatter import RenderOptions
+from ..core.profiling import HOOKS, profile
+from ..core.scores import Score, ScoreArea
+from ..core.tree import ScoreTree
+
+
+class TestProfiling:
+
+    def test_profile(self, build_tree):
+        tree = build_tree()
+        other = build_tree()
+
+        with profile() as stats:
+            for _ in range(3):
+                str(tree)
+            tree.validate()
+            assert other.render(RenderOptions(False)) != ""
+
+        counts = stats.counts
+        assert stats.renders == {tree: 3, other: 1}
+        assert counts["ScoreTree.render"] == 4
+        assert counts["ScoreTree.validate"] == 1
+        assert counts["ScoreArea.validate"] == 2
+        assert counts["Score.validate"] == 3
+        assert counts["ScoreTree.check_weights"] == 1
+        # Every line and every top-level block of colorized renders is
+        # colorized:
+        assert counts["colorize"] == 3 * (5 + 2)
+
+        # Every render evaluates each of the 3 leaves once, even when area
+        # caches are invalid:
+        assert counts["Score.score"] == 4 * 3
+        assert set(stats.times) == set(counts)
+        assert all(time >= 0 for time in stats.times.values())
+        assert stats.report().count("\n") == len(counts) - 1
+        assert repr(stats) == (
+            f"<ProfileStats with {sum(counts.values())} calls of"
+            + f" {len(counts)} events>"
+        )
+
+    def test_tree_counts(self, build_tree):
+        tree = build_tree()
+        other = build_tree()
+
+        with profile() as stats:
+            tree.score
+            tree.score
+            other.score
+            other.validate()
+            ScoreTree.check_weights(tree.items[0])
+
+        assert stats.tree_counts == {
+            tree: {"ScoreTree.score": 2},
+            other: {
+                "ScoreTree.score": 1, "ScoreTree.validate": 1,
+                "ScoreTree.check_weights": 1
+            }
+        }
+        assert stats.counts["ScoreTree.check_weights"] == 2
+        assert stats.renders == {}
+
+    def test_nested_validation(self):
+        tree = ScoreTree([
+            ScoreArea("Area", 1, [
+                ScoreArea("Nested", 0.5, [Score("Test", 1, (0, 1))]),
+                ScoreArea("Nested2", 0.5, [Score("Test", 1, (0, 1))])
+            ])
+        ])
+
+        with profile() as stats:
+            tree.validate()
+            tree.items[0].items[0].validate()
+
+        # Nested areas are validated (and recorded) too:
+        assert stats.counts["ScoreArea.validate"] == 3 + 1
+        assert stats.counts["Score.validate"] == 2 + 1
+
+    def test_disabled(self, build_tree):
+        originals = {
+            (cls, attribute): cls.__dict__[attribute]
+            for cls, attribute, _ in HOOKS
+        }
+
+        with profile() as outer:
+            with profile() as inner:
+                build_tree().score
+            build_tree().score
+
+        # Original methods are restored once every context is exited:
+        assert all(
+            cls.__dict__[attribute] is original
+            for (cls, attribute), original in originals.items()
+        )
+        assert inner.counts["ScoreTree.score"] == 1
+        assert outer.counts["ScoreTree.score"] == 2
+
+        build_tree().score
+        assert outer.counts["ScoreTree.score"] == 2
+
+        with pytest.raises(ValueError):
+            with profile():
+                raise ValueError
+        assert all(
+            cls.__dict__[attribute] is original
+            for (cls, attribute), original in originals.items()
+        )
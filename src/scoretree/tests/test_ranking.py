@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from ..core.ranking import top_k
+from ..core.schema import ScoreSchema
+from ..core.scores import Score, ScoreArea
+from ..core.tree import ScoreTree
+
+TREE = ScoreTree([
+    ScoreArea("Area", 0.75, [
+        Score("Test", 0.5, (0, 10)),
+        ScoreArea("Nested", 0.5, [
+            Score("Test", 0.25, (0, 1), inverse=True),
+            Score("Test2", 0.75, (-5, 5))
+        ])
+    ]),
+    Score("Test", 0.25, (0, 100))
+])
+
+
+class TestRanking:
+
+    def test_top_k(self):
+        schema = ScoreSchema(TREE)
+        generator = random.Random(0)
+        rows = [
+            [
+                generator.uniform(-1, 11), generator.random(),
+                generator.uniform(-6, 6), generator.uniform(0, 100)
+            ] for _ in range(2000)
+        ]
+        expected = sorted(
+            range(len(rows)),
+            key=lambda index: (-schema.bind(rows[index]).score, index)
+        )
+
+        for k in (0, 1, 10, 2000, 3000):
+            ranking = top_k(schema, rows, k)
+            assert [index for index, _ in ranking] == expected[:k]
+            assert [result.score for _, result in ranking] == [
+                schema.bind(rows[index]).score for index in expected[:k]
+            ]
+
+        assert [
+            index for index, _ in schema.top_k(iter(rows), 5)
+        ] == expected[:5]
+
+    def test_ties(self):
+        rows = [[10, 0, 5, 100]] * 3 + [[0, 1, -5, 0]] + [[10, 0, 5, 100]]
+        ranking = top_k(TREE, rows, 3)
+
+        assert [index for index, _ in ranking] == [0, 1, 2]
+        assert all(result.score == 1 for _, result in ranking)
+
+        assert [index for index, _ in top_k(TREE, [
+            {"Area/Test": 0, "Area/Nested/Test": 1, "Area/Nested/Test2": -5,
+             "Test": 0},
+            {"Area/Test": 5, "Area/Nested/Test": 1, "Area/Nested/Test2": -5,
+             "Test": 0}
+        ], 1)] == [1]
+
+    def test_negative_weights(self):
+        tree = ScoreTree([
+            Score("Test", 1.5, (0, 1)),
+            Score("Test2", -0.5, (0, 1))
+        ])
+        rows = [[0.5, 1], [0.4, 0]]
+
+        assert [index for index, _ in top_k(tree, rows, 1)] == [1]
+
+        generator = random.Random(0)
+        rows = [[generator.random(), generator.random()] for _ in range(500)]
+        schema = ScoreSchema(tree)
+        expected = sorted(
+            range(len(rows)),
+            key=lambda index: (-schema.bind(rows[index]).score, index)
+        )
+        assert [index for index, _ in top_k(schema, rows, 10)] == expected[:10]
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            top_k(TREE, [], 1.0)
+
+        with pytest.raises(TypeError):
+            top_k(TREE, [], True)
+
+        with pytest.raises(ValueError):
+            top_k(TREE, [], -1)
+
+        with pytest.raises(ValueError):
+            top_k(TREE, [[1, 2]], 1)
+
+        with pytest.raises(TypeError):
+            top_k(TREE, [[1, 2, 3, "4"]], 1)
@@ -0,0 +1,62 @@
+import pytest
+
+from ..core.scenarios import evaluate_scenarios
+
+
+class TestScenarios:
+
+    def test_evaluate_scenarios(self, build_tree):
+        tree = build_tree()
+        base, value, inverse, weight = tree.evaluate_scenarios([
+            {},
+            {"Area/Test": {"value": 10}},
+            {"Area/Nested/Test": {"inverse": True, "score_range": (0, 2)}},
+            {"Area/Test": {"weight": 0.25}, "Other": {"weight": 1}}
+        ])
+
+        assert base.score == tree.score == 0.625
+        assert base.changes == {}
+        assert base.scores == base.base.scores
+
+        assert value.score == 0.75
+        assert value.changes == {"Area/Test": 1, "Area": 1}
+        assert value["Area/Nested"] == 1
+        assert value["Other"] == 0.5
+        assert repr(value) == (
+            "<ScenarioResult with score 75.00% (2 recomputed nodes)>"
+        )
+
+        assert inverse.score == 0.5
+        assert inverse["Area/Nested/Test"] == 0.5
+        assert inverse["Area"] == 0.5
+
+        assert weight.scores["Area"] == 0.625
+        assert weight.score == 0.5 * 0.625 + 0.5
+
+        # Scenarios are evaluated against an unmodified base tree:
+        reference = build_tree()
+        reference.items[0].items[0].value = 10
+        assert value.score == reference.score
+        assert tree.items[0].items[0].value == 5
+        assert tree.score == 0.625
+
+    def test_invalid(self, build_tree):
+        tree = build_tree()
+
+        with pytest.raises(KeyError):
+            evaluate_scenarios(tree, [{"Missing": {"value": 1}}])
+
+        with pytest.raises(ValueError):
+            evaluate_scenarios(tree, [{"Area": {"value": 1}}])
+
+        with pytest.raises(ValueError):
+            evaluate_scenarios(tree, [{"Other": {"name": "Other"}}])
+
+        with pytest.raises(TypeError):
+            evaluate_scenarios(tree, [{"Other": {"value": "1"}}])
+
+        with pytest.raises(TypeError):
+            evaluate_scenarios(tree, [{"Other": {"weight": None}}])
+
+        with pytest.raises(ValueError):
+            evaluate_scenarios(tree, [{"Other": {"score_range": (1, 0)}}])
@@ -0,0 +1,110 @@
+import pytest
+
+from ..core.schema import ScoreSchema
+from ..core.scores import Score, ScoreArea
+from ..core.tree import ScoreTree
+
+
+class TestScoreSchema:
+
+    def test_structure(self):
+        schema = ScoreSchema(ScoreTree([
+            ScoreArea("Area", 0.5, [
+                Score("Test", 0.5, (0, 10)),
+                ScoreArea("Nested", 0.5, [Score("Test", 1, (0, 1))])
+            ]),
+            Score("Test", 0.5, (0, 1))
+        ]))
+
+        assert len(schema) == 5
+        assert schema.paths == (
+            "Area", "Area/Test", "Area/Nested", "Area/Nested/Test", "Test"
+        )
+        assert schema.leaves == ("Area/Test", "Area/Nested/Test", "Test")
+        assert schema.leaf_weights == (0.25, 0.25, 0.5)
+        assert repr(schema) == "<ScoreSchema with 5 nodes and 3 leaves>"
+
+        with pytest.raises(AttributeError):
+            schema.paths = ()
+
+        with pytest.raises(ValueError):
+            tree = ScoreTree([Score("Test", 1, (0, 1))])
+            tree.items.append(Score("Test2", 1, (0, 1)))
+            ScoreSchema(tree)
+
+        # Every path must address a single node:
+        with pytest.raises(ValueError):
+            ScoreSchema(ScoreTree([ScoreArea("A", 1, [
+                Score("x", 0.5, (0, 1)), Score("x", 0.5, (0, 1))
+            ])]))
+
+        with pytest.raises(ValueError):
+            ScoreSchema(ScoreTree([
+                ScoreArea("A", 0.5, [Score("x", 1, (0, 1))]),
+                Score("A/x", 0.5, (0, 1))
+            ]))
+
+    def test_bind(self):
+        tree = ScoreTree([
+            ScoreArea("Area", 0.5, [
+                Score("Test", 0.5, (0, 10), 5),
+                ScoreArea("Nested", 0.5, [Score("Test", 1, (0, 1), 1, True)])
+            ]),
+            Score("Test", 0.5, (0, 1), 0.25)
+        ])
+        schema = ScoreSchema(tree)
+
+        result = schema.bind([5, 1, 0.25])
+        assert result.schema is schema
+        assert result.score == tree.score
+        assert result["Area"] == tree.items[0].score
+        assert result["Area/Nested/Test"] == 0
+        assert result.scores == {
+            "Area": 0.25,
+            "Area/Test": 0.5,
+            "Area/Nested": 0,
+            "Area/Nested/Test": 0,
+            "Test": 0.25
+        }
+        assert repr(result) == "<ScoreResult with score 25.00%>"
+
+        result = schema.bind({
+            "Area/Test": 10, "Area/Nested/Test": 0, "Test": 1
+        })
+        assert result.score == 1
+
+        with pytest.raises(KeyError):
+            schema.bind({"Area/Test": 10, "Area/Nested/Test": 0})
+
+        with pytest.raises(KeyError):
+            schema.bind({
+                "Area/Test": 10, "Area/Nested/Test": 0, "Test": 1, "Area": 1
+            })
+
+        with pytest.raises(ValueError):
+            schema.bind([1, 2])
+
+        with pytest.raises(TypeError):
+            schema.bind([1, 2, "3"])
+
+    def test_build(self):
+        tree = ScoreTree([
+            ScoreArea("Area", 0.5, [
+                Score("Test", 0.5, (0, 10), 5),
+                ScoreArea("Nested", 0.5, [Score("Test", 1, (0, 1), 1, True)])
+            ]),
+            Score("Test", 0.5, (0, 1), 0.25)
+        ])
+        schema = ScoreSchema(tree)
+
+        built = schema.build([5, 1, 0.25])
+        built.validate()
+        assert str(built) == str(tree)
+        assert built.items[0].items[1].items[0]._parent is (
+            built.items[0].items[1]
+        )
+
+        built = schema.build({
+            "Area/Test": 10, "Area/Nested/Test": 0, "Test": 1
+        })
+        assert built.score == schema.bind([10, 0, 1]).score == 1
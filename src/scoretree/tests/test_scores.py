@@ -78,6 +78,13 @@ class TestScore:
         score.value = 0.5
         assert score.score == 0.5
 
+    def test_slots(self):
+        score = Score("Test", 0, (0, 1))
+
+        assert not hasattr(score, "__dict__")
+        with pytest.raises(AttributeError):
+            score.attribute = None
+
     def test_representation(self):
         score = Score("Test", 0, (0, 1))
 
@@ -150,6 +157,39 @@ class TestScoreArea:
 
         assert score_area.score == 1
 
+    def test_score_cache(self):
+        score = Score("Test", 0.5, (0, 10), 10)
+        nested = ScoreArea("Nested", 0.5, [Score("Test2", 1, (0, 1), 1)])
+        score_area = ScoreArea("Test", 1, [score, nested])
+
+        assert score_area.score == 1
+        assert nested._cached_score == 1
+
+        score.value = 5
+        assert score_area._cached_score is None
+        assert nested._cached_score == 1
+        assert score_area.score == 0.75
+
+        score.score_range = (0, 20)
+        assert score_area.score == 0.625
+
+        score.inverse = True
+        assert score_area.score == 0.875
+
+        nested.weight = 0
+        assert score_area.score == 0.375
+
+        nested.items = [Score("Test2", 1, (0, 1), 0)]
+        nested.weight = 0.5
+        assert score_area.score == 0.375
+
+    def test_slots(self):
+        score_area = ScoreArea("Test", 0, [])
+
+        assert not hasattr(score_area, "__dict__")
+        with pytest.raises(AttributeError):
+            score_area.attribute = None
+
     def test_representation(self):
         score_area = ScoreArea("Test", 1, [Score("Test1", 1, (0, 1), 1)])
 
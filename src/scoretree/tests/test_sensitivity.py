@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+from ..core.scores import Score, ScoreArea, compute_score
+from ..core.sensitivity import score_derivative
+from ..core.tree import ScoreTree
+
+
+class TestSensitivity:
+
+    def test_sensitivity(self):
+        tree = ScoreTree([
+            ScoreArea("Area", 0.75, [
+                Score("Test", 0.5, (0, 10), 5),
+                ScoreArea("Nested", 0.5, [
+                    Score("Test", 0.25, (0, 1), 0.5, True),
+                    Score("Test2", 0.75, (-5, 5), 10)
+                ])
+            ]),
+            Score("Test", 0.25, (0, 100), 50)
+        ])
+        leaves = tree.sensitivity()
+
+        assert [leaf.path for leaf in leaves] == [
+            "Area/Test", "Area/Nested/Test", "Area/Nested/Test2", "Test"
+        ]
+        assert [leaf.weight for leaf in leaves] == [
+            0.375, 0.09375, 0.28125, 0.25
+        ]
+        assert [leaf.score for leaf in leaves] == [0.5, 0.5, 1, 0.5]
+        assert math.isclose(
+            sum(leaf.contribution for leaf in leaves), tree.score
+        )
+        assert [leaf.derivative for leaf in leaves] == pytest.approx([
+            0.375 / 10, -0.09375, 0, 0.25 / 100
+        ])
+        assert repr(leaves[-1]) == (
+            "LeafSensitivity(Test, weight=0.25, contribution=0.125,"
+            + " derivative=0.0025)"
+        )
+
+    def test_score_derivative(self):
+        # Right-hand finite differences match at and between breakpoints:
+        step = 2 ** -20
+        for inverse in (False, True):
+            for value in (-25, -20, -15, -10, -5, 0, 5, 10, 15):
+                expected = (
+                    compute_score(value + step, -10, 10, inverse)
+                    - compute_score(value, -10, 10, inverse)
+                ) / step
+
+                assert math.isclose(
+                    score_derivative(value, -10, 10, inverse), expected,
+                    abs_tol=1e-9
+                )
@@ -0,0 +1,206 @@
+import io
+import json
+import struct
+
+import pytest
+
+from ..core.scores import Score, ScoreArea
+from ..core.serialization import MAGIC, dumps, load_json, loads
+from ..core.tree import ScoreTree
+
+
+class TestSerialization:
+
+    def test_round_trip(self, build_tree):
+        score_tree = build_tree((5, 0.25, 0.75), True, False)
+        score_tree.items[0].name = "Área"
+        data = dumps(score_tree)
+
+        assert data.startswith(MAGIC)
+        assert len(data) % 8 == 0
+
+        loaded = loads(data)
+        loaded.validate()
+
+        assert str(loaded) == str(score_tree)
+        assert loaded.score == score_tree.score
+        assert not loaded.colorized
+        assert loaded.items[0].items[1].items[0].score_range == (0, 1)
+        assert loaded.items[0].items[1].items[0].inverse
+
+        loaded.items[1].value = 0
+        assert loaded.score == pytest.approx(score_tree.score - 0.375)
+
+    def test_files(self, build_tree, tmp_path):
+        score_tree = build_tree((5, 0.25, 0.75), True, False)
+        path = tmp_path / "tree.sctr"
+        score_tree.dump(path)
+
+        loaded = ScoreTree.load(path)
+        assert str(loaded) == str(score_tree)
+
+    def test_invalid(self, build_tree):
+        data = dumps(build_tree((5, 0.25, 0.75), True, False))
+
+        with pytest.raises(ValueError):
+            loads(b"")
+
+        with pytest.raises(ValueError):
+            loads(b"XXXX" + data[4:])
+
+        with pytest.raises(ValueError):
+            loads(data[:4] + b"\xff" + data[5:])
+
+        with pytest.raises(ValueError):
+            loads(data[:-8])
+
+    def test_corrupt(self, build_tree):
+        data = dumps(build_tree((5, 0.25, 0.75), True, False))
+        counts = 32  # Header size, where node item counts start.
+
+        # First area (2 items) claiming more items than nodes follow it:
+        with pytest.raises(ValueError):
+            loads(data[:counts] + (5).to_bytes(8, "little") + data[40:])
+
+        # ...or fewer, which breaks weights:
+        with pytest.raises(ValueError):
+            loads(data[:counts] + (1).to_bytes(8, "little") + data[40:])
+
+        # Leaf turned into an empty area:
+        with pytest.raises(ValueError):
+            loads(data[:counts + 8] + (0).to_bytes(8, "little") + data[48:])
+
+        # Score ranges start after 5 node counts, weights and name lengths:
+        lower = counts + 3 * 5 * 8
+        for minimum in (10.0, float("nan")):
+            with pytest.raises(ValueError):
+                loads(
+                    data[:lower] + struct.pack("<d", minimum)
+                    + data[lower + 8:]
+                )
+
+        # ...and values after 3 range minimums and maximums:
+        values = lower + 2 * 3 * 8
+        with pytest.raises(ValueError):
+            loads(
+                data[:values] + struct.pack("<d", float("inf"))
+                + data[values + 8:]
+            )
+
+        loaded = loads(
+            data[:values] + struct.pack("<d", 2.0) + data[values + 8:]
+        )
+        assert loaded.items[0].items[0].value == 2
+
+    def test_dict(self, build_tree):
+        score_tree = build_tree((5, 0.25, 0.75), True, False)
+        data = score_tree.to_dict()
+
+        assert data == {
+            "colorized": False,
+            "items": [
+                {"name": "Area", "weight": 0.5, "items": [
+                    {
+                        "name": "Test", "weight": 0.5, "score_range": [0, 10],
+                        "value": 5, "inverse": False
+                    },
+                    {"name": "Nested", "weight": 0.5, "items": [
+                        {
+                            "name": "Test", "weight": 1,
+                            "score_range": [0, 1], "value": 0.25,
+                            "inverse": True
+                        }
+                    ]}
+                ]},
+                {
+                    "name": "Other", "weight": 0.5, "score_range": [0, 1],
+                    "value": 0.75, "inverse": False
+                }
+            ]
+        }
+        assert str(ScoreTree.from_dict(data)) == str(score_tree)
+        assert json.loads(json.dumps(data)) == data
+
+        assert ScoreTree.from_dict({"items": [
+            {"name": "Test", "weight": 1, "score_range": [0, 1]}
+        ]}).colorized
+
+        with pytest.raises(ValueError):
+            ScoreTree.from_dict({"items": [{"name": "Test", "weight": 1}]})
+
+        with pytest.raises(TypeError):
+            ScoreTree.from_dict({"items": [
+                {"name": "Test", "weight": "1", "score_range": [0, 1]}
+            ]})
+
+    def test_malformed(self):
+        for data, path in (
+            ([], None),
+            ({"items": {}}, "items"),
+            ({"items": [1]}, "items[0]"),
+            ({"items": [{"name": "A", "weight": 1, "items": 1}]},
+             "items[0].items"),
+            ({"items": [{"name": "A", "weight": 1, "items": [
+                {"name": "B", "weight": 1, "score_range": [0, 1]}, "C"
+            ]}]}, "items[0].items[1]")
+        ):
+            with pytest.raises(ValueError) as info:
+                ScoreTree.from_dict(data)
+
+            if path is not None:
+                assert f"at {path}:" in str(info.value)
+
+            if isinstance(data, dict):
+                for chunk_size in (1, 65536):
+                    with pytest.raises(ValueError) as info:
+                        load_json(io.StringIO(json.dumps(data)), chunk_size)
+
+                    assert f"at {path}:" in str(info.value)
+
+    def test_json(self, build_tree):
+        score_tree = build_tree((5, 0.25, 0.75), True, False)
+
+        stream = io.StringIO()
+        score_tree.to_json(stream)
+        assert json.loads(stream.getvalue()) == score_tree.to_dict()
+
+        for chunk_size in (1, 7, 65536):
+            stream.seek(0)
+            loaded = load_json(stream, chunk_size)
+            assert str(loaded) == str(score_tree)
+            assert not loaded.colorized
+
+        # Key order and whitespace do not matter:
+        loaded = ScoreTree.from_json(io.StringIO(
+            '\n{ "items" : [ {"items": [{"inverse": true, "value": 1,'
+            + ' "score_range": [0, 1], "weight": 1, "name": "B"}],'
+            + ' "weight": 1, "name": "A"} ], "colorized": false }\n'
+        ))
+        assert loaded.score == 0
+        assert not loaded.colorized
+
+        for document in (
+            "",
+            "[]",
+            '{"items": [}',
+            '{"items": [], }',
+            '{"items": [{"name": "A", "weight": 1, "items": []},]}',
+            '{"items": []} {}',
+            '{"items": [{"name": "A", "weight": 1}]}'
+        ):
+            with pytest.raises(ValueError):
+                ScoreTree.from_json(io.StringIO(document))
+
+    def test_json_deep(self):
+        depth = 3000
+        items = [Score("leaf", 1, (0, 1), 1)]
+        for _ in range(depth):
+            items = [ScoreArea("area", 1, items)]
+
+        tree = ScoreTree(items)
+        stream = io.StringIO()
+        tree.to_json(stream)
+        stream.seek(0)
+
+        assert ScoreTree.from_json(stream).score == 1
+        assert ScoreTree.from_dict(tree.to_dict()).score == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from ..core.scores import Score
+from ..core.tree import ScoreTree
+
+np = pytest.importorskip("numpy")
+
+
+class TestScoreTemplate:
+
+    def test_structure(self, build_tree):
+        template = build_tree((0, 0, 0), True).compile()
+
+        assert template.leaves == ("Area/Test", "Area/Nested/Test", "Other")
+        assert template.areas == ("Area", "Area/Nested")
+        assert template.weights.sum() == pytest.approx(1)
+        assert template.weights[1] == pytest.approx(0.5 * 0.5 * 1)
+        assert list(template.inverse) == [False, True, False]
+        assert repr(template) == (
+            "<ScoreTemplate with 3 leaves and 2 areas>"
+        )
+
+    def test_evaluate(self, build_tree):
+        rows = [
+            [8.82, 0.312, 1],
+            [7.232, 0.262, 0.5],
+            [-5, 2, -1]
+        ]
+        trees = [build_tree(row, True) for row in rows]
+        template = trees[0].compile()
+
+        totals, areas = template.evaluate(np.array(rows), subtotals=True)
+        for tree, row, total, area in zip(trees, rows, totals, areas):
+            assert total == pytest.approx(tree.score)
+            assert template.evaluate(template.values(tree)) == (
+                pytest.approx(tree.score)
+            )
+            assert list(area) == pytest.approx([
+                tree.items[0].score,
+                tree.items[0].items[1].score
+            ])
+
+        with pytest.raises(ValueError):
+            template.evaluate(np.zeros((2, 2)))
+
+        with pytest.raises(ValueError):
+            template.values(ScoreTree([Score("test", 1, (0, 1))]))
@@ -0,0 +1,55 @@
+from ..core.scores import Score, ScoreArea
+from ..core.traversal import iter_postorder, iter_preorder
+
+
+ITEMS = [
+    ScoreArea("a", 0.5, [
+        Score("a1", 0.5, (0, 1)),
+        ScoreArea("a2", 0.5, [Score("a21", 1, (0, 1))]),
+        ScoreArea("a3", 0, [])
+    ]),
+    Score("b", 0.5, (0, 1))
+]
+
+
+class TestTraversal:
+
+    def test_preorder(self):
+        assert [
+            (node.name, depth) for node, depth in iter_preorder(ITEMS)
+        ] == [
+            ("a", 0), ("a1", 1), ("a2", 1), ("a21", 2), ("a3", 1), ("b", 0)
+        ]
+
+        assert [
+            (node.name, depth)
+            for node, depth in iter_preorder(ITEMS[:1], 2)
+        ][:2] == [("a", 2), ("a1", 3)]
+
+    def test_postorder(self):
+        assert [
+            (node.name, depth)
+            for node, depth in iter_postorder(ITEMS)
+        ] == [
+            ("a1", 1), ("a21", 2), ("a2", 1), ("a3", 1), ("a", 0), ("b", 0)
+        ]
+
+        assert [
+            node.name
+            for node, _ in iter_postorder(ITEMS, leaves=False)
+        ] == ["a2", "a3", "a"]
+
+        assert [
+            node.name for node, _ in iter_postorder(
+                ITEMS, prune=lambda area: area.name == "a2"
+            )
+        ] == ["a1", "a3", "a", "b"]
+
+    def test_deep(self):
+        depth = 10_000
+        items = [Score("leaf", 1, (0, 1))]
+        for _ in range(depth):
+            items = [ScoreArea("area", 1, items)]
+
+        assert sum(1 for _ in iter_preorder(items)) == depth + 1
+        assert sum(1 for _ in iter_postorder(items)) == depth + 1
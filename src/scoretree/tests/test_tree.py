@@ -1,6 +1,10 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from colorama import Fore, Style
 
+from ..core.formatter import Formatter, RenderOptions
 from ..core.scores import Score, ScoreArea
 from ..core.tree import ScoreTree
 
@@ -63,6 +67,179 @@ class TestScoreTree:
         score_tree.items = [Score("test", 1, (0, 1), 0.5)]
         assert score_tree.score == 0.5
 
+    def test_score_cache(self):
+        score = Score("test", 0.5, (0, 1), 1)
+        sibling = ScoreArea("sibling", 0.5, [Score("test", 1, (0, 1), 1)])
+        score_tree = ScoreTree([
+            ScoreArea("area", 0.5, [score, Score("test2", 0.5, (0, 1), 1)]),
+            sibling
+        ])
+
+        assert score_tree.score == 1
+
+        score.value = 0
+        assert score_tree._cached_score is None
+        assert sibling._cached_score == 1
+        assert score_tree.score == 0.75
+
+        score_tree.items = [Score("test", 1, (0, 1), 0.5)]
+        assert score_tree.score == 0.5
+
+    def test_from_trusted(self):
+        score_tree = ScoreTree.from_trusted([
+            ScoreArea.from_trusted("area", 0.5, [
+                Score.from_trusted("test", 1.0, (0.0, 10.0), 5.0)
+            ]),
+            Score.from_trusted("test", 0.5, (0.0, 1.0), 1.0, True)
+        ], colorized=False)
+        score_tree.validate()
+
+        assert score_tree.score == 0.25
+        assert score_tree.items[0]._parent is score_tree
+        assert score_tree.items[0].items[0]._parent is score_tree.items[0]
+
+        score_tree.items[0].items[0].value = 10
+        assert score_tree.score == 0.5
+
+        with pytest.raises(ValueError):
+            ScoreTree.from_trusted([
+                Score.from_trusted("test", 1.0, (1.0, 0.0))
+            ]).validate()
+
+        with pytest.raises(ValueError):
+            ScoreTree.from_trusted([
+                ScoreArea.from_trusted("area", 1.0, [
+                    Score.from_trusted("test", 0.5, (0.0, 1.0))
+                ])
+            ]).validate()
+
+        with pytest.raises(TypeError):
+            ScoreTree.from_trusted([
+                ScoreArea.from_trusted("area", 1.0, [
+                    Score.from_trusted("test", "1", (0.0, 1.0))
+                ])
+            ]).validate()
+
+    def test_deep_tree(self):
+        depth = 5000
+        score = Score("leaf", 1, (0, 1), 1)
+        items = [score]
+        for _ in range(depth):
+            items = [ScoreArea("area", 1, items)]
+
+        score_tree = ScoreTree(items, colorized=False)
+        score_tree.validate()
+
+        assert score_tree.score == 1
+        assert str(score_tree).count("\n") == depth
+        assert str(score_tree.items[0]).count("\n") == depth
+
+        score.value = 0.5
+        assert score_tree.score == 0.5
+
+    def test_paths(self):
+        leaf = Score("Test", 1, (0, 10), 5)
+        nested = ScoreArea("Nested", 0.5, [leaf])
+        score_tree = ScoreTree([
+            ScoreArea("Area", 0.5, [nested, Score("Test", 0.5, (0, 1))]),
+            Score("Test", 0.5, (0, 1))
+        ])
+
+        assert score_tree["Area/Nested/Test"] is leaf
+        assert score_tree["Area/Nested"] is nested
+        assert score_tree["Test"] is score_tree.items[1]
+        assert "Area/Test" in score_tree
+        assert "Area/Missing" not in score_tree
+
+        with pytest.raises(KeyError):
+            score_tree["Nested"]
+
+        # Indexes are rebuilt after structural changes:
+        nested.name = "Renamed"
+        assert score_tree["Area/Renamed/Test"] is leaf
+        assert "Area/Nested/Test" not in score_tree
+
+        replacement = Score("Other", 1, (0, 1))
+        nested.items = [replacement]
+        assert score_tree["Area/Renamed/Other"] is replacement
+
+        # ...of the tree itself, and only of actual changes:
+        index = score_tree._lookup()
+        other = ScoreTree([ScoreArea("Area", 1, [Score("Test", 1, (0, 1))])])
+        other.items[0].name = "Renamed"
+        other.validate()
+        score_tree.validate()
+        nested.weight = 0.5
+        assert score_tree._lookup() is index
+
+        nested.weight = 0.25
+        assert score_tree._lookup() is not index
+
+        # Paths must address a single node:
+        for score_tree in (
+            ScoreTree([
+                Score("Test", 0.5, (0, 1)), Score("Test", 0.5, (0, 1))
+            ]),
+            ScoreTree([
+                ScoreArea("A", 0.5, [Score("x", 1, (0, 1))]),
+                Score("A/x", 0.5, (0, 1))
+            ])
+        ):
+            with pytest.raises(ValueError):
+                score_tree["Test"]
+
+            with pytest.raises(ValueError):
+                score_tree.set_values({"A/x": 1})
+
+    def test_set_values(self):
+        score_tree = ScoreTree([
+            ScoreArea("Area", 0.5, [Score("Test", 1, (0, 10))]),
+            Score("Test", 0.5, (0, 1))
+        ])
+        assert score_tree.score == 0
+
+        score_tree.set_values({"Area/Test": 10, "Test": 0.5})
+        assert score_tree["Area/Test"].value == 10
+        assert score_tree.score == 0.75
+
+        # Nothing is modified unless every path and value is valid:
+        for values, exception in (
+            ({"Test": 0, "Missing": 0}, KeyError),
+            ({"Test": 0, "Area": 0}, TypeError),
+            ({"Test": 0, "Area/Test": "0"}, TypeError)
+        ):
+            with pytest.raises(exception):
+                score_tree.set_values(values)
+
+        assert score_tree.score == 0.75
+
+    def test_flat_score(self):
+        leaf = Score("Test", 0.5, (0, 10), 5)
+        nested = ScoreArea("Nested", 0.5, [leaf, Score("Test", 0.5, (0, 1))])
+        score_tree = ScoreTree([
+            ScoreArea("Area", 0.5, [nested, Score("Test", 0.5, (0, 1), 1)]),
+            Score("Test", 0.5, (0, 1), 0.5)
+        ])
+
+        assert score_tree.leaf_weights == (0.125, 0.125, 0.25, 0.5)
+        assert score_tree.flat_score == pytest.approx(score_tree.score)
+
+        # Value changes do not rebuild the flattened weights:
+        weights = score_tree._flat_weights
+        leaf.value = 10
+        assert score_tree.flat_score == pytest.approx(score_tree.score)
+        assert score_tree._flat_weights is weights
+
+        # Weight and structure changes do:
+        nested.weight = 0.25
+        score_tree.items[0].items[1].weight = 0.75
+        assert score_tree.leaf_weights == (0.0625, 0.0625, 0.375, 0.5)
+        assert score_tree.flat_score == pytest.approx(score_tree.score)
+
+        nested.items = [Score("Test", 1, (0, 1), 1)]
+        assert score_tree.leaf_weights == (0.125, 0.375, 0.5)
+        assert score_tree.flat_score == pytest.approx(score_tree.score)
+
     def test_check_score(self):
         with pytest.raises(ValueError):
             ScoreTree([])
@@ -79,6 +256,133 @@ class TestScoreTree:
             ScoreTree([ScoreArea("test", 1.01, [])])
             ScoreTree([ScoreArea("test", -1, [])])
 
+    def test_check_weights(self):
+        # Sums are exact and compared with a tolerance:
+        ScoreTree([
+            Score("Test", 0.6, (0, 1)),
+            Score("Test", 0.3, (0, 1)),
+            Score("Test", 0.1, (0, 1))
+        ])
+        ScoreTree.check_weights(ScoreTree([
+            Score("Test", 0.5, (0, 1)), Score("Test", 0.5, (0, 1))
+        ]), 0)
+
+        with pytest.raises(ValueError):
+            ScoreTree([Score("Test", 1 - 1e-6, (0, 1))])
+
+        with pytest.raises(ValueError):
+            ScoreTree([Score("x", float("nan"), (0, 1), 1)])
+
+        with pytest.raises(ValueError):
+            ScoreTree([ScoreArea("Area", 1, [
+                Score("x", float("nan"), (0, 1), 1)
+            ])])
+
+        ScoreTree.check_weights(ScoreArea("Test", 1, [
+            Score("Test", 1 - 1e-6, (0, 1))
+        ]), 1e-3)
+
+        with pytest.raises(TypeError):
+            ScoreTree.check_weights(ScoreArea("Test", 1, []), "0")
+
+        for tolerance in (-1, float("nan")):
+            with pytest.raises(ValueError) as error:
+                ScoreTree.check_weights(ScoreArea("Test", 1, []), tolerance)
+
+            assert str(error.value) == (
+                "expected a non-negative tolerance for ScoreTree"
+                + f".check_weights but got {tolerance}"
+            )
+
+        # Every offending area is reported at once:
+        score_tree = ScoreTree.from_trusted([
+            ScoreArea("Area", 0.5, [
+                ScoreArea("Nested", 1, [Score("Test", 0.5, (0, 1))]),
+                ScoreArea("Valid", 0, [Score("Test", 1, (0, 1))])
+            ]),
+            ScoreArea("Other", 0.25, [Score("Test", 2, (0, 1))])
+        ])
+        with pytest.raises(ValueError) as error:
+            ScoreTree.check_weights(score_tree)
+
+        assert str(error.value) == (
+            "score tree weights do not add up to 1 (0.75);"
+            + " \"Area/Nested\" score weights do not add up to 1 (0.5);"
+            + " \"Other\" score weights do not add up to 1 (2.0)"
+        )
+
+    def test_set_items(self):
+        score_tree = ScoreTree([Score("Test", 1, (0, 1), 1)])
+        items = [Score("Test", 0.5, (0, 1)), Score("Test", 0.5, (0, 1), 1)]
+
+        score_tree.set_items(items)
+        assert score_tree.items is items
+        assert score_tree.score == 0.5
+
+        # Weight checks can be skipped, but types are always checked:
+        score_tree.set_items([Score("Test", 0.5, (0, 1), 1)], check=False)
+        assert score_tree.score == 0.5
+
+        with pytest.raises(ValueError):
+            score_tree.validate()
+
+        with pytest.raises(TypeError):
+            score_tree.set_items([None], check=False)
+
+    def test_parents(self):
+        shared = Score("Test", 1, (0, 1), 0.5)
+        area = ScoreArea("Area", 1, [shared])
+        score_tree = ScoreTree([area])
+
+        # Nodes cannot belong to several areas or trees:
+        with pytest.raises(ValueError):
+            ScoreTree([shared])
+
+        with pytest.raises(ValueError):
+            ScoreArea("Other", 1, [shared])
+
+        with pytest.raises(ValueError):
+            ScoreTree([Score("Test", 0.5, (0, 1)), area])
+
+        # Reassigning the same items is allowed:
+        area.items = area.items
+        score_tree.validate()
+        assert shared._parent is area
+
+        # Replaced items are detached, so they can be reused elsewhere and
+        # do not invalidate their former parent anymore:
+        area.items = [Score("Test", 1, (0, 1), 1)]
+        assert shared._parent is None
+        assert score_tree.score == 1
+
+        other = ScoreTree([shared])
+        shared.value = 1
+        assert other.score == 1
+        assert score_tree.score == 1
+        assert score_tree._cached_score == 1
+
+        score_tree.items = [Score("Test", 1, (0, 1), 1)]
+        assert area._parent is None
+        ScoreTree([area])
+
+        # Items rejected because of their weights are not adopted:
+        first = Score("Test", 0.5, (0, 1))
+        second = Score("Test2", 0.25, (0, 1))
+        with pytest.raises(ValueError):
+            ScoreTree([first, second])
+
+        assert first._parent is None and second._parent is None
+        second.weight = 0.5
+        score_tree = ScoreTree([first, second])
+
+        items = score_tree.items
+        with pytest.raises(ValueError):
+            score_tree.items = [first, Score("Test3", 0.25, (0, 1))]
+
+        assert score_tree.items is items
+        assert score_tree["Test2"] is second
+        assert first._parent is score_tree
+
     def test_representation(self):
         score_tree = ScoreTree([
             Score("Test", 0.5, (0, 1)),
@@ -91,3 +395,146 @@ class TestScoreTree:
             + f"{Style.RESET_ALL}\n{Fore.YELLOW}{Fore.YELLOW}{Style.DIM}"
             + f"Test2 (50.00%): 50.00%{Style.RESET_ALL}"
         )
+
+    def test_single_pass_rendering(self):
+        evaluations = []
+
+        class CountingScore(Score):
+
+            @property
+            def score(self):
+                evaluations.append(self.name)
+                return super().score
+
+        score_tree = ScoreTree([
+            ScoreArea("Area", 1, [
+                ScoreArea("Nested", 0.5, [
+                    CountingScore("Deep", 1, (0, 1), 1)
+                ]),
+                CountingScore("Shallow", 0.5, (0, 1), 0.5)
+            ])
+        ], colorized=False)
+
+        assert str(score_tree) == (
+            "Area (100.00%): 75.00%\n"
+            + "└── Nested (50.00%): 100.00%\n"
+            + "    └── Deep (100.00%): 100.00%\n"
+            + f"└── Shallow (50.00%): 50.00%{Style.RESET_ALL}"
+        )
+        assert sorted(evaluations) == ["Deep", "Shallow"]
+
+    def test_streaming_rendering(self):
+        # Empty areas do not pass weight checks, hence the trusted path:
+        score_tree = ScoreTree.from_trusted([
+            ScoreArea("Area", 0.5, [Score("Test", 1, (0, 1), 1)]),
+            ScoreArea("Empty", 0, []),
+            Score("Test", 0.5, (0, 1))
+        ], colorized=False)
+
+        assert list(score_tree.iter_lines()) == [
+            "Area (50.00%): 100.00%",
+            f"└── Test (100.00%): 100.00%{Style.RESET_ALL}",
+            "Empty (0.00%): 0.00%",
+            f"{Style.RESET_ALL}",
+            f"Test (50.00%): 0.00%{Style.RESET_ALL}"
+        ]
+
+        stream = io.StringIO()
+        score_tree.render_to(stream)
+        assert stream.getvalue() == f"{score_tree}\n"
+
+    def test_render_options(self):
+        score_tree = ScoreTree([
+            ScoreArea("Area", 1, [Score("Test", 1, (0, 1), 1)])
+        ])
+        options = RenderOptions(False, "+", "-")
+
+        assert score_tree.render(options) == (
+            "Area (100.00%): 100.00%\n+-- Test (100.00%): 100.00%"
+            + f"{Style.RESET_ALL}"
+        )
+        assert score_tree.render() == str(score_tree)
+        assert str(score_tree).startswith(f"{Fore.GREEN}{Fore.GREEN}")
+
+        stream = io.StringIO()
+        score_tree.render_to(stream, options)
+        assert stream.getvalue() == f"{score_tree.render(options)}\n"
+
+        with pytest.raises(TypeError):
+            score_tree.render(False)
+
+        # Trees do not share colorization settings:
+        ScoreTree([Score("Test", 1, (0, 1))], colorized=False)
+        assert score_tree.colorized and Formatter.COLOR_ENABLED
+        assert str(score_tree).startswith(Fore.GREEN)
+
+        # Default options follow the class characters:
+        start_char = Formatter.START_CHAR
+        Formatter.START_CHAR = "+"
+        try:
+            assert "+── Test" in str(score_tree)
+            score_tree.compile_layout()
+            assert "+── Test" in str(score_tree)
+        finally:
+            Formatter.START_CHAR = start_char
+            score_tree.discard_layout()
+
+        assert "└── Test" in str(score_tree)
+
+    def test_render_template(self):
+        score_tree = ScoreTree([
+            ScoreArea("Area", 0.5, [Score("Test", 1, (0, 1), 1)]),
+            Score("Other", 0.5, (0, 1))
+        ], colorized=False)
+        rendered = str(score_tree)
+
+        # Templates are only kept when explicitly compiled:
+        assert score_tree._layout is None
+        score_tree.compile_layout()
+        layout = score_tree._layout
+        assert str(score_tree) == rendered
+
+        # Templates are reused while only values change:
+        score_tree.items[1].value = 1
+        assert str(score_tree) == rendered.replace(
+            "Other (50.00%): 0.00%", "Other (50.00%): 100.00%"
+        )
+        assert score_tree._layout is layout
+
+        # ...and rebuilt when names, weights or settings change:
+        score_tree.items[0].items[0].name = "Renamed"
+        assert "└── Renamed (100.00%): 100.00%" in str(score_tree)
+        score_tree.items[0].items[0].weight = 0.5
+        assert "└── Renamed (50.00%): 100.00%" in str(score_tree)
+        assert score_tree.render(RenderOptions(False, "+", "-")) == (
+            "Area (50.00%): 50.00%\n+-- Renamed (50.00%): 100.00%"
+            + f"{Style.RESET_ALL}\nOther (50.00%): 100.00%{Style.RESET_ALL}"
+        )
+        assert str(score_tree).startswith(
+            "Area (50.00%): 50.00%\n└── Renamed"
+        )
+        assert score_tree._layout is not layout
+
+        score_tree.discard_layout()
+        assert score_tree._layout is None
+        assert str(score_tree).startswith(
+            "Area (50.00%): 50.00%\n└── Renamed"
+        )
+
+        with pytest.raises(TypeError):
+            score_tree.compile_layout(False)
+
+    def test_concurrent_rendering(self):
+        trees = [
+            ScoreTree([
+                ScoreArea("Area", 1, [
+                    Score(f"Test{index}", 1 / 64, (0, 64), index)
+                    for index in range(64)
+                ])
+            ], colorized=bool(count % 2))
+            for count in range(8)
+        ]
+        expected = [str(tree) for tree in trees] * 4
+
+        with ThreadPoolExecutor(8) as executor:
+            assert list(executor.map(str, trees * 4)) == expected